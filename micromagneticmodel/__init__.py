@@ -7,8 +7,17 @@ import pytest
 from . import abstract as abstract
 from . import consts as consts
 from . import examples as examples
+from . import util as util
+from .cache import KernelCache as KernelCache
 from .driver import Driver as Driver
+from .driver import EigenmodeDriver as EigenmodeDriver
 from .driver import ExternalDriver as ExternalDriver
+from .driver import HysteresisDriver as HysteresisDriver
+from .driver import MacrospinDriver as MacrospinDriver
+from .driver import MinDriver as MinDriver
+from .driver import MultigridDriver as MultigridDriver
+from .driver import NEBDriver as NEBDriver
+from .driver import TimeDriver as TimeDriver
 from .dynamics import Damping as Damping
 from .dynamics import Dynamics as Dynamics
 from .dynamics import DynamicsTerm as DynamicsTerm
@@ -25,7 +34,10 @@ from .energy import Exchange as Exchange
 from .energy import MagnetoElastic as MagnetoElastic
 from .energy import UniaxialAnisotropy as UniaxialAnisotropy
 from .energy import Zeeman as Zeeman
+from .evolver import BDFEvolver as BDFEvolver
 from .evolver import Evolver as Evolver
+from .evolver import RungeKuttaEvolver as RungeKuttaEvolver
+from .evolver import StochasticHeunEvolver as StochasticHeunEvolver
 from .runner import ExternalRunner as ExternalRunner
 from .system import System as System
 
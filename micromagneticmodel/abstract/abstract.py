@@ -7,7 +7,9 @@ class Abstract(metaclass=abc.ABCMeta):
     """Abstract class for deriving all terms, drivers, and evolvers.
 
     It can be initialised with keyword arguments defined in
-    ``_allowed_attributes``, which is a list of strings.
+    ``_allowed_attributes``, which is a list of strings. Default values of
+    attributes which are not set can be defined in the ``_defaults``
+    dictionary.
 
     Raises
     ------
@@ -34,6 +36,15 @@ class Abstract(metaclass=abc.ABCMeta):
         """
         pass  # pragma: no cover
 
+    _defaults = {}
+
+    def _setting(self, attr):
+        """Value of attribute ``attr`` or its default if it is not set."""
+        value = getattr(self, attr, None)
+        if value is None or isinstance(value, ts.Descriptor):
+            return self._defaults.get(attr)
+        return value
+
     def __iter__(self):
         """Iterator.
 
@@ -1,5 +1,7 @@
 import abc
 
+import numpy as np
+
 import micromagneticmodel as mm
 from .abstract import Abstract
 
@@ -114,6 +116,52 @@ class Term(Abstract):
         result += other
         return result
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self._allowed_attributes:
+            # Precomputed quantities depend on the parameters of the term.
+            self.__dict__.pop("_cache", None)
+
+    def _cached(self, key, func):
+        """Return ``func()``, computed only once for each ``key``.
+
+        Cached values are discarded whenever a parameter listed in
+        ``_allowed_attributes`` is reassigned. Parameters which are modified
+        in place (e.g. the array of a ``discretisedfield.Field`` parameter) are
+        not detected.
+
+        """
+        cache = self.__dict__.setdefault("_cache", {})
+        if key not in cache:
+            cache[key] = func()
+        return cache[key]
+
+    def _cached_for(self, key, array, func):
+        """Return ``func()``, computed once for each ``key`` and ``array``.
+
+        Like ``_cached``, but the value is recomputed whenever ``array`` (e.g.
+        saturation magnetisation) changes. A tuple of several arrays can be
+        passed as ``array``. Arrays are compared by identity first and by
+        value otherwise, so that arrays recreated with the same values (e.g.
+        by ``micromagneticmodel.util.magnetisation_arrays`` on every call)
+        reuse the cached value. Only the value for the arrays it was computed
+        from is kept, and they must not be modified in place.
+
+        """
+        arrays = array if isinstance(array, tuple) else (array,)
+        cached = self._cached(key, dict)
+        previous = cached.get("arrays", ())
+        if len(previous) != len(arrays) or not all(
+            _same_values(a, b) for a, b in zip(previous, arrays)
+        ):
+            cached["value"] = func()
+            cached["arrays"] = arrays
+        return cached["value"]
+
+    def _buffer(self, name, shape):
+        """Work array ``name`` of ``shape``, allocated only once."""
+        return self._cached(("buffer", name, shape), lambda: np.empty(shape))
+
     @property
     @abc.abstractmethod
     def _reprlatex(self):
@@ -146,3 +194,12 @@ class Term(Abstract):
 
         """
         return f"${self._reprlatex}$"
+
+
+def _same_values(a, b):
+    """Check if ``a`` and ``b`` are identical or arrays with equal values."""
+    if a is b:
+        return True
+    if not (isinstance(a, np.ndarray) and isinstance(b, np.ndarray)):
+        return False
+    return a.shape == b.shape and a.dtype == b.dtype and np.array_equal(a, b)
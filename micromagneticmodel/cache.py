@@ -0,0 +1,137 @@
+import contextlib
+import hashlib
+import os
+import pathlib
+import tempfile
+
+import numpy as np
+
+
+class KernelCache:
+    """Persistent on-disk cache of precomputed kernels.
+
+    Kernels (e.g. the Fourier transform of the demagnetisation tensor) depend
+    only on the mesh geometry and are expensive to compute for large meshes.
+    ``KernelCache`` stores them as ``.npy`` files in ``dirname`` and loads them
+    as read-only ``numpy.memmap`` arrays, so that several processes using the
+    same cache directory share one copy in the operating system page cache.
+
+    When the total size of the cache exceeds ``max_size``, the least recently
+    used kernels are removed.
+
+    Parameters
+    ----------
+    dirname : str, pathlib.Path
+
+        Cache directory. It is created if it does not exist.
+
+    max_size : int, optional
+
+        Size budget of the cache in bytes. Defaults to 1 GiB.
+
+    Examples
+    --------
+    1. Using a kernel cache for all demagnetisation terms.
+
+    >>> import tempfile
+    >>> import micromagneticmodel as mm
+    ...
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     mm.Demag.kernel_cache = mm.KernelCache(tmpdir, max_size=2**28)
+    ...     # drive or evaluate systems with Demag
+    ...     mm.Demag.kernel_cache = None
+
+    """
+
+    def __init__(self, dirname, max_size=2**30):
+        self.dirname = pathlib.Path(dirname)
+        self.max_size = max_size
+        self.dirname.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return self.dirname / f"{digest}.npy"
+
+    def get(self, key):
+        """Load a kernel from the cache.
+
+        Parameters
+        ----------
+        key : tuple
+
+            Key describing the kernel. Its ``repr`` must uniquely describe
+            the kernel.
+
+        Returns
+        -------
+        numpy.memmap, None
+
+            Read-only kernel or ``None`` if it is not in the cache.
+
+        """
+        path = self._path(key)
+        try:
+            kernel = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)  # mark as recently used
+        return kernel
+
+    def put(self, key, kernel):
+        """Store a kernel in the cache.
+
+        The kernel is written to a temporary file first, so that other
+        processes never see partially written kernels. Kernels larger than
+        ``max_size`` are not stored.
+
+        Parameters
+        ----------
+        key : tuple
+
+            Key describing the kernel.
+
+        kernel : numpy.ndarray
+
+            Kernel to be stored.
+
+        """
+        if kernel.nbytes > self.max_size:
+            return
+        fd, tmpname = tempfile.mkstemp(dir=self.dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, kernel)
+            os.replace(tmpname, self._path(key))
+        except BaseException:
+            pathlib.Path(tmpname).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used kernels until the size budget is met."""
+        entries = []
+        for path in self.dirname.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except OSError:  # removed by another process or still in use
+                continue
+            size -= entry_size
+
+    def clear(self):
+        """Remove all kernels from the cache."""
+        for path in self.dirname.glob("*.npy"):
+            path.unlink(missing_ok=True)
+
+    def __repr__(self):
+        return f"KernelCache(dirname='{self.dirname}', max_size={self.max_size})"
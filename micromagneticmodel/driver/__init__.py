@@ -0,0 +1,9 @@
+from .driver import Driver as Driver
+from .driver import ExternalDriver as ExternalDriver
+from .eigenmodedriver import EigenmodeDriver as EigenmodeDriver
+from .hysteresisdriver import HysteresisDriver as HysteresisDriver
+from .macrospindriver import MacrospinDriver as MacrospinDriver
+from .mindriver import MinDriver as MinDriver
+from .multigriddriver import MultigridDriver as MultigridDriver
+from .nebdriver import NEBDriver as NEBDriver
+from .timedriver import TimeDriver as TimeDriver
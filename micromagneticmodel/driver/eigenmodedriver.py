@@ -0,0 +1,262 @@
+import discretisedfield as df
+import numpy as np
+import scipy.sparse.linalg
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+import micromagneticmodel as mm
+from . import reducers as _reducers
+from .driver import Driver
+
+
+@uu.inherit_docs
+@ts.typesystem(tolerance=ts.Scalar(positive=True))
+class EigenmodeDriver(Driver):
+    r"""Linearised eigenmode driver.
+
+    The dynamics equation is linearised around the magnetisation
+    ``system.m``, which must be an equilibrium (e.g. relaxed with
+    ``micromagneticmodel.MinDriver``). Small deviations
+    :math:`\delta\mathbf{m}` perpendicular to :math:`\mathbf{m}` in every
+    cell, written in a local basis :math:`(\mathbf{e}_{1}, \mathbf{e}_{2})`
+    of the tangent plane, obey the Landau-Lifshitz-Gilbert equation
+
+    .. math::
+
+        \frac{\text{d}\,\delta\mathbf{m}}{\text{d}t} = \frac{\gamma_{0}}{1 +
+        \alpha^{2}} \left(\mathbf{m} \times K\delta\mathbf{m} - \alpha
+        K\delta\mathbf{m}\right), \quad K\delta\mathbf{m} = P\left[
+        (\mathbf{m} \cdot \mathbf{H}_\text{eff})\delta\mathbf{m} -
+        \delta\mathbf{H}_\text{eff}\right],
+
+    where :math:`\delta\mathbf{H}_\text{eff}` is the change of the effective
+    field, computed with finite differences of the effective fields of all
+    energy terms, and :math:`P` the projection onto the tangent plane. The
+    eigenvalues :math:`\lambda = -\Gamma \pm 2\pi i f` of this matrix-free
+    linear operator closest to zero, i.e. the modes with the lowest
+    frequencies :math:`f`, are computed with ``scipy.sparse.linalg.eigs`` in
+    shift-invert mode, where :math:`K` is inverted with conjugate gradients.
+    This requires a stable equilibrium, in which :math:`K` is positive
+    definite, and ``RuntimeError`` is raised if the inversion fails or a
+    growing mode is found. The starting vector of ``eigs`` is fixed, so that
+    the results are reproducible.
+
+    Parameters
+    ----------
+    tolerance : numbers.Real, optional
+
+        Relative accuracy of the eigenvalues. Defaults to ``1e-8``.
+
+    Examples
+    --------
+    1. Ferromagnetic resonance of a macrospin.
+
+    >>> import numpy as np
+    >>> import micromagneticmodel as mm
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> mm.MinDriver().drive(system)
+    >>> ed = mm.EigenmodeDriver()
+    >>> ed.drive(system, n=1)
+    >>> f = mm.consts.gamma0 / (1 + 0.1**2) * 1e6 / (2 * np.pi)
+    >>> bool(np.isclose(system.records['f'][0], f))
+    True
+    >>> system.modes[0].mesh == system.m.mesh
+    True
+
+    """
+
+    _allowed_attributes = ["tolerance"]
+    _defaults = {"tolerance": 1e-8}
+
+    @property
+    def _x(self):
+        return "f"
+
+    def drive(self, system, /, n=10):
+        """Compute the eigenmodes with the lowest frequencies.
+
+        After the drive, ``system.records`` contains the frequencies (column
+        ``f`` in Hz) and decay rates (column ``decay_rate`` in 1/s) of the
+        modes in increasing order of frequency, and ``system.modes`` the
+        complex mode profiles :math:`\\delta\\mathbf{m}` (with maximum norm 1)
+        as ``discretisedfield.Field`` objects. ``system.m`` is not changed.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System in an equilibrium state.
+
+        n : int, optional
+
+            Number of eigenmodes. Defaults to 10.
+
+        Raises
+        ------
+        ValueError
+
+            If the system has no magnetisation or precession term, or ``n`` is
+            not positive or larger than the number of degrees of freedom.
+
+        RuntimeError
+
+            If ``system.m`` is not a stable equilibrium.
+
+        """
+        self._check_system(system)
+        m, Ms = mm.util.magnetisation_arrays(system.m)
+        active = Ms[..., 0] > 0
+        size = 2 * np.count_nonzero(active)
+        if not 0 < n <= size // 2:
+            msg = f"Cannot compute {n=} eigenmodes of {size} degrees of freedom."
+            raise ValueError(msg)
+
+        basis = mm.util.tangent_basis(m[active])
+        operator, inverse = self._operators(system, m, Ms, active, basis)
+        # Eigenvalues come in complex conjugate pairs, but eigs can miss one
+        # of them or of degenerate eigenvalues, in which case more eigenvalues
+        # are computed.
+        tolerance = self._setting("tolerance")
+        v0 = np.random.default_rng(0).normal(size=size)
+        k = 2 * n
+        while True:
+            if k < size - 1:
+                values, vectors = scipy.sparse.linalg.eigs(
+                    operator,
+                    k=k,
+                    sigma=0,
+                    OPinv=inverse,
+                    tol=tolerance,
+                    v0=v0,
+                )
+            else:
+                values, vectors = np.linalg.eig(operator @ np.eye(size))
+            positive = np.flatnonzero(values.imag >= 0)
+            if len(positive) >= n:
+                break
+            k += 2
+
+        # Growing modes (within the accuracy of the eigenvalues).
+        if np.any(values.real > np.sqrt(tolerance) * np.abs(values)):
+            msg = f"Cannot compute eigenmodes, {system=} is not a stable equilibrium."
+            raise RuntimeError(msg)
+
+        # Only the modes with the lowest positive frequencies are kept.
+        keep = positive[np.argsort(values.imag[positive])[:n]]
+        values, vectors = values[keep], vectors[:, keep]
+
+        modes = []
+        for vector in vectors.T:
+            coordinates = vector.reshape(-1, 2)
+            mode = np.zeros(m.shape, dtype=complex)
+            mode[active] = coordinates[:, :1] * basis[0] + coordinates[:, 1:] * basis[1]
+            mode /= np.max(np.linalg.norm(mode, axis=-1))
+            index = np.unravel_index(np.argmax(np.abs(mode)), mode.shape)
+            mode *= np.abs(mode[index]) / mode[index]
+            modes.append(df.Field(system.m.mesh, nvdim=3, value=mode))
+
+        rows = [
+            {"f": value.imag / (2 * np.pi), "decay_rate": -value.real}
+            for value in values
+        ]
+        system.modes = modes
+        system.records = _reducers.records(rows)
+        system.drive_number += 1
+
+    def _check_system(self, system):
+        """Check if the system contains all required information."""
+        if system.m is None:
+            msg = f"Cannot drive {system=} without magnetisation."
+            raise ValueError(msg)
+        if not system.dynamics.get(type=mm.Precession):
+            msg = f"Cannot drive {system=} without precession."
+            raise ValueError(msg)
+
+    def _operators(self, system, m, Ms, active, basis):
+        """Linearised dynamics operator and its inverse.
+
+        Both operators act on the tangent plane coordinates of all cells with
+        non-zero saturation magnetisation.
+
+        """
+        mesh = system.m.mesh
+        energy = system.energy
+        e1, e2 = basis
+        size = 2 * np.count_nonzero(active)
+
+        H0 = energy._effective_field(m, Ms, mesh)
+        parallel = np.einsum("...i,...i->...", m, H0)[active][:, None]
+        dynamics = system.dynamics
+        precession = dynamics.get(type=mm.Precession)[0]
+        damping = next(iter(dynamics.get(type=mm.Damping)), None)
+        alpha = 0 if damping is None else damping._alpha(mesh)
+        alpha = np.broadcast_to(alpha, Ms.shape)[active]
+        gamma = np.broadcast_to(precession._gamma0(mesh), Ms.shape)[active]
+        gamma = gamma / (1 + alpha**2)
+        weight = np.repeat(Ms[active][:, 0], 2)
+
+        shifted = np.empty_like(m)
+        H = np.empty_like(m)
+
+        def stiffness(x):
+            """K in tangent plane coordinates (in A/m)."""
+            coordinates = x.reshape(-1, 2)
+            dm = coordinates[:, :1] * e1 + coordinates[:, 1:] * e2
+            scale = np.max(np.abs(dm), initial=0)
+            if scale == 0:
+                return np.zeros(size)
+            epsilon = 1e-6 / scale
+            shifted[...] = m
+            shifted[active] += epsilon * dm
+            energy._effective_field(shifted, Ms, mesh, out=H)
+            dH = (H[active] - H0[active]) / epsilon
+            Kdm = parallel * dm - dH
+            result = np.empty((len(dm), 2))
+            result[:, 0] = np.einsum("...i,...i->...", Kdm, e1)
+            result[:, 1] = np.einsum("...i,...i->...", Kdm, e2)
+            return result.ravel()
+
+        def rotate(y):
+            """gamma (m x - alpha) in tangent plane coordinates."""
+            y = y.reshape(-1, 2)
+            result = np.empty_like(y)
+            result[:, 0] = -y[:, 1] - alpha[:, 0] * y[:, 0]
+            result[:, 1] = y[:, 0] - alpha[:, 0] * y[:, 1]
+            return (gamma * result).ravel()
+
+        def unrotate(y):
+            """Inverse of ``rotate``."""
+            y = (y.reshape(-1, 2) / gamma) / (1 + alpha**2)
+            result = np.empty_like(y)
+            result[:, 0] = -alpha[:, 0] * y[:, 0] + y[:, 1]
+            result[:, 1] = -y[:, 0] - alpha[:, 0] * y[:, 1]
+            return result.ravel()
+
+        # The stiffness weighted with Ms is symmetric (it is the Hessian of
+        # the energy divided by mu0 V).
+        symmetric = scipy.sparse.linalg.LinearOperator(
+            (size, size), matvec=lambda x: weight * stiffness(x), dtype=float
+        )
+        tolerance = self._setting("tolerance") * 1e-2
+
+        def solve(y):
+            """Inverse of the linearised dynamics operator."""
+            b = weight * unrotate(y)
+            x, info = scipy.sparse.linalg.cg(symmetric, b, rtol=tolerance)
+            # The stiffness is not positive definite if b . K^-1 b < 0.
+            if info != 0 or x @ b < 0:
+                msg = (
+                    f"Cannot invert the linearised dynamics, {system=} is not a "
+                    "stable equilibrium."
+                )
+                raise RuntimeError(msg)
+            return x
+
+        operator = scipy.sparse.linalg.LinearOperator(
+            (size, size), matvec=lambda x: rotate(stiffness(x)), dtype=float
+        )
+        inverse = scipy.sparse.linalg.LinearOperator(
+            (size, size), matvec=solve, dtype=float
+        )
+        return operator, inverse
@@ -0,0 +1,166 @@
+import discretisedfield as df
+import numpy as np
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+import micromagneticmodel as mm
+from . import reducers as _reducers
+from .mindriver import MinDriver
+
+
+@uu.inherit_docs
+class HysteresisDriver(MinDriver):
+    """In-process hysteresis driver.
+
+    The uniform external field ``H`` of the Zeeman energy term of the system
+    is stepped along a path, and the energy is minimised at every step as in
+    ``micromagneticmodel.MinDriver``. Every minimisation starts from the
+    equilibrium of the previous step. The field of the Zeeman energy term is
+    restored after the drive.
+
+    Reducers (see ``micromagneticmodel.TimeDriver``) are evaluated at the
+    equilibrium of every step and collected in ``system.records`` together with
+    the applied field (columns ``Hx``, ``Hy`` and ``Hz`` in A/m).
+
+    Parameters
+    ----------
+    stopping_mxHxm : numbers.Real, optional
+
+        Stopping criterion of every minimisation in A/m. Defaults to 0.1.
+
+    max_iterations : int, optional
+
+        Maximum number of iterations of every minimisation. Defaults to 100000.
+
+    Examples
+    --------
+    1. Hysteresis loop of a macrospin with uniaxial anisotropy.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> system.energy += mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1))
+    >>> hd = mm.HysteresisDriver()
+    >>> hd.drive(system, Hmin=(0, 1e4, -4e5), Hmax=(0, 1e4, 4e5), n=9)
+    >>> system.records['Hz']
+    array([ 400000.,  300000.,  200000.,  100000.,       0., -100000.,
+           -200000., -300000., -400000., -300000., -200000., -100000.,
+                 0.,  100000.,  200000.,  300000.,  400000.])
+    >>> system.records['mz'].round(2)
+    array([ 1.  ,  1.  ,  1.  ,  1.  ,  1.  ,  0.98, -1.  , -1.  , -1.  ,
+           -1.  , -1.  , -1.  , -1.  , -0.98,  1.  ,  1.  ,  1.  ])
+
+    """
+
+    @property
+    def _x(self):
+        return "H"
+
+    def drive(
+        self, system, /, Hmin=None, Hmax=None, n=None, Hsteps=None, reducers=("m", "E")
+    ):
+        """Drive the system along a hysteresis path.
+
+        The path is either defined by ``Hmin``, ``Hmax`` and ``n``, in which
+        case the field is stepped from ``Hmax`` to ``Hmin`` and back to
+        ``Hmax`` with ``n`` equally spaced fields in each direction, or by
+        ``Hsteps``, a list of segments ``(Hstart, Hend, n)`` with ``n`` equally
+        spaced fields (including ``Hstart`` and ``Hend``) each. ``system.m`` is
+        updated with the final equilibrium and ``system.records`` with the
+        reduced data at all steps.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System object to be driven. Its energy equation must contain a
+            Zeeman energy term.
+
+        Hmin, Hmax : array_like, optional
+
+            Minimum and maximum field vectors in A/m.
+
+        n : int, optional
+
+            Number of fields from ``Hmax`` to ``Hmin``, including both.
+
+        Hsteps : list, optional
+
+            Segments ``(Hstart, Hend, n)`` of the path. Consecutive segments
+            sharing the end and the start field are joined.
+
+        reducers : list, optional
+
+            Names of built-in reducers and callables evaluated at every step.
+            Defaults to ``('m', 'E')``.
+
+        Raises
+        ------
+        ValueError
+
+            If the system has no magnetisation or Zeeman energy term, the field
+            of the Zeeman energy term is not a uniform vector, or the path is not
+            defined.
+
+        """
+        self._check_system(system)
+        fields = self._fields(Hmin=Hmin, Hmax=Hmax, n=n, Hsteps=Hsteps)
+        _reducers.check(reducers)
+        zeeman = self._zeeman(system)
+
+        m, Ms = mm.util.magnetisation_arrays(system.m)
+        rows = []
+        H = zeeman.H
+        try:
+            for field in fields:
+                zeeman.H = tuple(field)
+                self._minimise(system, m, Ms, stacklevel=2)
+                row = dict(zip(("Hx", "Hy", "Hz"), map(float, field)))
+                row.update(_reducers.evaluate(reducers, system, 0, m, Ms))
+                rows.append(row)
+        finally:
+            zeeman.H = H
+
+        system.m = mm.util.magnetisation_field(system.m, m, Ms)
+        system.records = _reducers.records(rows)
+        system.drive_number += 1
+
+    @staticmethod
+    def _zeeman(system):
+        """Zeeman energy term of the system with a vector field."""
+        terms = system.energy.get(type=mm.Zeeman)
+        if not terms:
+            msg = f"Cannot drive {system=} without a Zeeman energy term."
+            raise ValueError(msg)
+        zeeman = terms[0]
+        if isinstance(zeeman.H, ts.Descriptor):
+            msg = f"Cannot step undefined field of {zeeman=}."
+            raise ValueError(msg)
+        if isinstance(zeeman.H, (dict, df.Field)):
+            # Stepping would replace the spatially varying field by a uniform
+            # field.
+            msg = f"Cannot step spatially varying field of {zeeman=}."
+            raise ValueError(msg)
+        return zeeman
+
+    @staticmethod
+    def _fields(Hmin=None, Hmax=None, n=None, Hsteps=None):
+        """Array of all fields along the hysteresis path."""
+        if Hsteps is None:
+            if Hmin is None or Hmax is None or n is None:
+                msg = "Cannot drive without Hsteps or Hmin, Hmax, and n."
+                raise ValueError(msg)
+            Hsteps = [(Hmax, Hmin, n), (Hmin, Hmax, n)]
+
+        fields = []
+        for Hstart, Hend, steps in Hsteps:
+            if steps < 1:
+                msg = f"Cannot step field with {steps=}."
+                raise ValueError(msg)
+            segment = np.linspace(
+                np.asarray(Hstart, dtype=float), np.asarray(Hend, dtype=float), steps
+            )
+            if fields and np.array_equal(fields[-1][-1], segment[0]):
+                segment = segment[1:]
+            fields.append(segment)
+        return np.concatenate(fields)
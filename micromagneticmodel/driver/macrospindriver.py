@@ -0,0 +1,251 @@
+import discretisedfield as df
+import numpy as np
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+import micromagneticmodel as mm
+from ..dynamics import ZhangLi
+from ..energy import DMI, RKKY, Demag, Exchange
+from ..evolver import Evolver
+from .driver import Driver
+from .timedriver import _evolver
+
+
+@uu.inherit_docs
+@ts.typesystem(evolver=ts.Typed(expected_type=Evolver))
+class MacrospinDriver(Driver):
+    """In-process time driver for batches of macrospin systems.
+
+    Macrospin systems (systems with a single discretisation cell) which share
+    the same energy and dynamics terms, but differ in parameter values and
+    initial magnetisation, are packed into a single system with one cell per
+    macrospin. Parameters which differ between the systems are packed into
+    ``discretisedfield.Field`` parameters with one value per macrospin, so that
+    the dynamics of all macrospins is integrated as one problem by
+    ``evolver``.
+
+    Energy and dynamics terms which vanish for a single cell (exchange, DMI,
+    RKKY and Zhang-Li) are left out, and the demagnetisation energy is
+    evaluated with the demagnetisation tensor of a single cell. Attributes of
+    terms which cannot be packed (e.g. time dependence) must be the same for
+    all systems, and so must the temperature ``system.T``. At non-zero
+    temperature, every macrospin is subject to an independent thermal field,
+    which requires an evolver including the thermal field (e.g. the default
+    ``micromagneticmodel.StochasticHeunEvolver``).
+
+    After the drive, ``system.m`` of every system is updated and
+    ``system.records`` contains the average normalised magnetisation (columns
+    ``mx``, ``my`` and ``mz``) at all sampling times (column ``t``).
+
+    Parameters
+    ----------
+    evolver : micromagneticmodel.Evolver, optional
+
+        Evolver integrating the dynamics equation in process. Defaults to
+        ``micromagneticmodel.RungeKuttaEvolver()`` at zero temperature and
+        ``micromagneticmodel.StochasticHeunEvolver()`` at non-zero temperature.
+
+    Examples
+    --------
+    1. Macrospins with different damping constants.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> systems = [mm.examples.macrospin() for _ in range(3)]
+    >>> for system, alpha in zip(systems, [0.01, 0.1, 1]):
+    ...     system.dynamics.damping.alpha = alpha
+    >>> md = mm.MacrospinDriver()
+    >>> md.drive(systems, t=5e-11, n=10)
+    >>> [round(float(system.records['mz'][-1]), 2) for system in systems]
+    [0.76, 0.96, 1.0]
+
+    """
+
+    _allowed_attributes = ["evolver"]
+
+    # Terms which do not contribute for a single discretisation cell.
+    _vanishing_terms = (Exchange, DMI, RKKY, ZhangLi)
+
+    @property
+    def _x(self):
+        return "t"
+
+    def drive(self, systems, /, t, n=1):
+        """Drive all macrospin systems in time.
+
+        Parameters
+        ----------
+        systems : list
+
+            Macrospin systems (``micromagneticmodel.System``) with the same
+            energy and dynamics terms and the same cell.
+
+        t : numbers.Real
+
+            Simulation time in seconds.
+
+        n : int, optional
+
+            Number of equally spaced sampling times in ``(0, t]``. Defaults to
+            1.
+
+        Raises
+        ------
+        ValueError
+
+            If the systems cannot be packed into a single system (e.g. because
+            their temperatures differ), ``t`` or ``n`` are not positive, or the
+            evolver does not include the thermal field at non-zero
+            temperature.
+
+        """
+        if t <= 0 or n < 1:
+            msg = f"Cannot drive with {t=} and {n=}, both must be positive."
+            raise ValueError(msg)
+        system = self._pack(systems)
+
+        times = np.empty(n)
+        trajectory = np.empty((n, len(systems), 3))
+
+        def callback(i, time, m, Ms):
+            times[i] = time
+            trajectory[i] = m[:, 0, 0, :]
+
+        evolver = _evolver(self._setting("evolver"), system)
+        evolver.evolve(system, t, n=n, callback=callback)
+
+        for i, macrospin in enumerate(systems):
+            value = system.m.array[i : i + 1]
+            macrospin.m = df.Field(
+                macrospin.m.mesh,
+                nvdim=3,
+                value=value,
+                vdims=macrospin.m.vdims,
+                unit=macrospin.m.unit,
+            )
+            records = np.empty(n, dtype=[(c, float) for c in ("t", "mx", "my", "mz")])
+            records["t"] = times
+            for j, column in enumerate(("mx", "my", "mz")):
+                records[column] = trajectory[:, i, j]
+            macrospin.records = records
+            macrospin.drive_number += 1
+
+    def _pack(self, systems):
+        """Single system with one cell for every macrospin system."""
+        if not systems:
+            msg = "Cannot drive an empty list of systems."
+            raise ValueError(msg)
+        meshes = [self._mesh(system) for system in systems]
+        mesh = meshes[0]
+        cell = tuple(mesh.cell)
+        if any(tuple(other.cell) != cell or other.bc != mesh.bc for other in meshes):
+            msg = "Cannot pack macrospin systems with different cells."
+            raise ValueError(msg)
+        if any(other.T != systems[0].T for other in systems):
+            msg = "Cannot pack macrospin systems with different temperatures."
+            raise ValueError(msg)
+
+        batch_mesh = df.Mesh(
+            p1=(0, 0, 0),
+            p2=(len(systems) * cell[0], cell[1], cell[2]),
+            n=(len(systems), 1, 1),
+        )
+        system = mm.System(name="macrospins", T=systems[0].T)
+        system.energy = self._pack_terms(
+            [system.energy for system in systems], meshes, batch_mesh
+        )
+        system.dynamics = self._pack_terms(
+            [system.dynamics for system in systems], meshes, batch_mesh
+        )
+        system.m = df.Field(
+            batch_mesh,
+            nvdim=3,
+            value=np.concatenate([system.m.array for system in systems]),
+        )
+        return system
+
+    @staticmethod
+    def _mesh(system):
+        """Mesh of a macrospin system."""
+        if system.m is None:
+            msg = f"Cannot drive {system=} without magnetisation."
+            raise ValueError(msg)
+        mesh = system.m.mesh
+        if tuple(int(n) for n in mesh.n) != (1, 1, 1):
+            msg = f"Cannot drive {system=} with more than one cell."
+            raise ValueError(msg)
+        return mesh
+
+    def _pack_terms(self, containers, meshes, batch_mesh):
+        """Container with the terms of all ``containers`` packed."""
+        structure = [(type(term), term.name) for term in containers[0]]
+        for container in containers[1:]:
+            if [(type(term), term.name) for term in container] != structure:
+                msg = "Cannot pack systems with different terms."
+                raise ValueError(msg)
+
+        packed = containers[0].__class__()
+        for index, (cls, name) in enumerate(structure):
+            if issubclass(cls, self._vanishing_terms):
+                continue
+            terms = [container[index] for container in containers]
+            kwargs = {}
+            for attr in cls._allowed_attributes:
+                values = [getattr(term, attr, None) for term in terms]
+                value = self._pack_values(cls, attr, values, meshes, batch_mesh)
+                if value is not None:
+                    kwargs[attr] = value
+            if issubclass(cls, Demag):
+                packed += _CellDemag(meshes[0], name=name, **kwargs)
+            else:
+                packed += cls(name=name, **kwargs)
+        return packed
+
+    @staticmethod
+    def _pack_values(cls, attr, values, meshes, batch_mesh):
+        """Attribute value of the packed term."""
+        unset = [value is None or isinstance(value, ts.Descriptor) for value in values]
+        if all(unset):
+            return None
+        if any(unset):
+            msg = f"Cannot pack {cls.__name__}.{attr} set only for some systems."
+            raise ValueError(msg)
+
+        first = values[0]
+        if all(
+            not isinstance(value, (dict, df.Field)) and np.array_equal(value, first)
+            if not callable(value)
+            else value is first
+            for value in values
+        ):
+            return first
+
+        descriptor = cls.__dict__.get(attr)
+        if getattr(descriptor, "otherwise", None) is not df.Field:
+            msg = f"Cannot pack different values of {cls.__name__}.{attr}."
+            raise ValueError(msg)
+        nvdim = getattr(descriptor.descriptor, "size", 1)
+        array = np.stack(
+            [
+                mm.util.parameter_array(value, mesh, nvdim=nvdim).reshape(nvdim)
+                for value, mesh in zip(values, meshes)
+            ]
+        )
+        return df.Field(batch_mesh, nvdim=nvdim, value=array.reshape(-1, 1, 1, nvdim))
+
+
+class _CellDemag(Demag):
+    """Demagnetisation energy of independent cells.
+
+    The demagnetisation field of every cell is computed with the tensor of a
+    single cell of ``cell_mesh``, the mesh of the packed macrospins.
+
+    """
+
+    def __init__(self, cell_mesh, **kwargs):
+        super().__init__(**kwargs)
+        self._cell_mesh = cell_mesh
+
+    def _convolution(self, m, Ms, mesh):
+        N = self._cached("cell_tensor", lambda: self.cell_tensor(self._cell_mesh))
+        return (m * Ms) @ N
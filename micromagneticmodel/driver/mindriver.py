@@ -0,0 +1,248 @@
+import warnings
+
+import numpy as np
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+import micromagneticmodel as mm
+from .driver import Driver
+
+
+@uu.inherit_docs
+@ts.typesystem(
+    stopping_mxHxm=ts.Scalar(positive=True),
+    max_iterations=ts.Scalar(expected_type=int, positive=True),
+)
+class MinDriver(Driver):
+    r"""Energy minimisation driver.
+
+    The energy ``system.energy`` is minimised in process with projected
+    steepest descent. Each iteration rotates the magnetisation in every cell
+    towards the effective field with the Cayley transform
+
+    .. math::
+
+        \mathbf{m}_{k+1} = \frac{(1 - \tau^{2}|\mathbf{g}|^{2}/4)\mathbf{m}_{k}
+        + \tau\mathbf{g}}{1 + \tau^{2}|\mathbf{g}|^{2}/4}, \quad \mathbf{g} =
+        -\mathbf{m}_{k} \times (\mathbf{m}_{k} \times \mathbf{H}_\text{eff}),
+
+    which keeps :math:`|\mathbf{m}| = 1` up to rounding errors. The step size
+    :math:`\tau` alternates between the two Barzilai-Borwein step sizes computed
+    from the changes of :math:`\mathbf{m}` and :math:`\mathbf{g}` in the last
+    iteration, with the contributions of all cells weighted by their saturation
+    magnetisation.
+    The minimisation stops when the maximum of :math:`|\mathbf{m} \times
+    \mathbf{H}_\text{eff} \times \mathbf{m}|` over all cells is smaller than
+    ``stopping_mxHxm``.
+
+    Parameters
+    ----------
+    stopping_mxHxm : numbers.Real, optional
+
+        Stopping criterion in A/m. Defaults to 0.1.
+
+    max_iterations : int, optional
+
+        Maximum number of iterations. If the stopping criterion is not reached,
+        a warning is issued. Defaults to 100000.
+
+    Examples
+    --------
+    1. Relaxing the macrospin example.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> md = mm.MinDriver(stopping_mxHxm=0.01)
+    >>> md.drive(system)
+    >>> system.m.orientation.mean().round(6)
+    array([0., 0., 1.])
+
+    """
+
+    _allowed_attributes = ["stopping_mxHxm", "max_iterations"]
+    _defaults = {"stopping_mxHxm": 0.1, "max_iterations": 100000}
+
+    _description = "Energy minimisation"
+
+    @property
+    def _x(self):
+        return "iteration"
+
+    def drive(self, system, /):
+        """Minimise the energy of the system.
+
+        ``system.m`` is updated with the relaxed magnetisation.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System object to be driven.
+
+        Raises
+        ------
+        ValueError
+
+            If the magnetisation of the system is not defined.
+
+        """
+        self._check_system(system)
+        m, Ms = mm.util.magnetisation_arrays(system.m)
+        self._minimise(system, m, Ms, stacklevel=2)
+        system.m = mm.util.magnetisation_field(system.m, m, Ms)
+        system.drive_number += 1
+
+    def _check_system(self, system):
+        """Check if the system contains all required information."""
+        if system.m is None:
+            msg = f"Cannot drive {system=} without magnetisation."
+            raise ValueError(msg)
+
+    def _minimise(self, system, m, Ms, t=0, stacklevel=1):
+        """Minimise the energy by rotating ``m`` in place.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System defining the energy equation and the mesh.
+
+        m : numpy.ndarray
+
+            Unit magnetisation array, which is relaxed in place.
+
+        Ms : numpy.ndarray
+
+            Saturation magnetisation array.
+
+        t : numbers.Real, optional
+
+            Time at which time-dependent energy terms are evaluated. Defaults
+            to 0.
+
+        stacklevel : int, optional
+
+            Stack level of the warning issued if the minimisation does not
+            converge, relative to the caller of this method. Defaults to 1.
+
+        Returns
+        -------
+        int
+
+            Number of iterations.
+
+        """
+        mesh = system.m.mesh
+        H = np.empty_like(m)
+
+        def descent(m, out, scalar):
+            """Negative energy gradient -m x (m x H) written into out."""
+            system.energy._effective_field(m, Ms, mesh, t=t, out=H)
+            np.einsum("...i,...i->...", m, H, out=scalar[..., 0])
+            np.multiply(scalar, m, out=out)
+            np.subtract(H, out, out=out)
+
+        return self._descend(m, descent, Ms, stacklevel=stacklevel + 1)
+
+    def _descend(self, m, descent, Ms, stacklevel=1):
+        """Rotate ``m`` in place along a descent direction until convergence.
+
+        Parameters
+        ----------
+        m : numpy.ndarray
+
+            Unit magnetisation array, which is rotated in place.
+
+        descent : callable
+
+            Function ``descent(m, out, scalar)`` writing the descent direction
+            at ``m``, perpendicular to ``m`` in every cell, into ``out``.
+            ``scalar`` is a work array of shape ``m.shape[:-1] + (1,)``.
+
+        Ms : numpy.ndarray
+
+            Saturation magnetisation array (broadcastable to
+            ``m.shape[:-1] + (1,)``), which weights the cells in the
+            Barzilai-Borwein step sizes.
+
+        stacklevel : int, optional
+
+            As in ``_minimise``.
+
+        Returns
+        -------
+        int
+
+            Number of iterations.
+
+        """
+        tolerance = self._setting("stopping_mxHxm")
+        max_iterations = self._setting("max_iterations")
+
+        g = np.empty_like(m)
+        difference = np.empty_like(m)  # change of m in the last iteration
+        work = np.empty_like(m)
+        scalar = np.empty(m.shape[:-1] + (1,))
+        factor = np.empty_like(scalar)
+        product = np.empty_like(scalar)
+
+        def evaluate(m, out):
+            """Descent direction written into out and |out|**2 into scalar."""
+            descent(m, out, scalar)
+            np.einsum("...i,...i->...", out, out, out=scalar[..., 0])
+
+        def weighted(a, b):
+            """Inner product of a and b weighted with Ms."""
+            np.einsum("...i,...i->...", a, b, out=product[..., 0])
+            np.multiply(product, Ms, out=product)
+            return np.sum(product)
+
+        evaluate(m, g)
+        torque = np.sqrt(np.max(scalar, initial=0))
+        tau = 0.01 / torque if torque > 0 else 0
+
+        for iteration in range(max_iterations):
+            if torque <= tolerance:
+                return iteration
+
+            # Cayley transform with |g|**2 in scalar.
+            scalar *= tau**2 / 4
+            np.multiply(g, tau, out=work)
+            difference[...] = m
+            np.subtract(1, scalar, out=factor)
+            m *= factor
+            m += work
+            scalar += 1
+            m /= scalar
+            # Remove the rounding error of the norm, which would otherwise grow
+            # because g is then not exactly perpendicular to m.
+            np.einsum("...i,...i->...", m, m, out=scalar[..., 0])
+            np.sqrt(scalar, out=scalar)
+            np.divide(m, scalar, out=m, where=scalar > 0)
+            np.subtract(m, difference, out=difference)
+
+            # Barzilai-Borwein step size from s = difference and y = -(change of
+            # g). The energy gradient in every cell is -mu0 Ms V g, so inner
+            # products are weighted with Ms.
+            work[...] = g
+            evaluate(m, g)
+            torque = np.sqrt(np.max(scalar, initial=0))
+            work -= g
+            sy = weighted(difference, work)
+            if sy > 0:
+                if iteration % 2:
+                    tau = sy / weighted(work, work)
+                else:
+                    tau = weighted(difference, difference) / sy
+            elif torque > 0:
+                # Negative curvature: rotate by at most about 1 rad.
+                tau = 1 / torque
+
+        if torque > tolerance:
+            msg = (
+                f"{self._description} did not converge in {max_iterations} "
+                f"iterations (maximum mxHxm {torque:.3g} A/m)."
+            )
+            warnings.warn(msg, RuntimeWarning, stacklevel=stacklevel + 1)
+        return max_iterations
@@ -0,0 +1,207 @@
+import discretisedfield as df
+import numpy as np
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+import micromagneticmodel as mm
+from . import reducers as _reducers
+from .mindriver import MinDriver
+
+
+@uu.inherit_docs
+@ts.typesystem(levels=ts.Scalar(expected_type=int, positive=True))
+class MultigridDriver(MinDriver):
+    """Coarse-to-fine energy minimisation driver.
+
+    The mesh of ``system.m`` is coarsened up to ``levels`` times by merging
+    pairs of neighbouring cells along every direction with an even number of
+    cells (as long as all subregions consist of whole coarse cells). The
+    magnetisation is restricted to the coarsest mesh, where the energy is
+    minimised as in ``micromagneticmodel.MinDriver``. The equilibrium is then
+    prolongated to the next finer mesh, where it is the initial state of the
+    next minimisation, until the original mesh is reached. Most of the
+    iterations, which remove the large-scale features of the initial state,
+    are therefore computed on small meshes.
+
+    Restriction averages the magnetisation vectors :math:`M_\\text{s}\\mathbf{m}`
+    of the merged cells, whose saturation magnetisation is the average of
+    their saturation magnetisations. Energy term parameters defined as
+    ``discretisedfield.Field`` are averaged in the same way, while scalar and
+    per-subregion (``dict``) parameters are used on all meshes. Prolongation
+    copies the magnetisation direction of every coarse cell into the cells
+    it was merged from.
+
+    After the drive, ``system.records`` contains the coarsening ``level`` (0 for
+    the original mesh), the number of ``cells`` and the number of
+    ``iterations`` of every minimisation, in the order in which they were
+    computed.
+
+    Parameters
+    ----------
+    stopping_mxHxm : numbers.Real, optional
+
+        Stopping criterion of every minimisation in A/m. Defaults to 0.1.
+
+    max_iterations : int, optional
+
+        Maximum number of iterations of every minimisation. Defaults to 100000.
+
+    levels : int, optional
+
+        Maximum number of coarsening steps. Defaults to 3.
+
+    Examples
+    --------
+    1. Relaxing a random state.
+
+    >>> import discretisedfield as df
+    >>> import numpy as np
+    >>> import micromagneticmodel as mm
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(40e-9, 40e-9, 5e-9), n=(8, 8, 1))
+    >>> rng = np.random.default_rng(1)
+    >>> system = mm.System(name='random')
+    >>> system.energy = mm.Exchange(A=1e-11) + mm.Zeeman(H=(0, 0, 1e5))
+    >>> system.m = df.Field(mesh, nvdim=3, value=rng.normal(size=(8, 8, 1, 3)),
+    ...                     norm=8e5)
+    >>> mgd = mm.MultigridDriver(levels=2)
+    >>> mgd.drive(system)
+    >>> system.records['cells']
+    array([ 4., 16., 64.])
+    >>> bool(np.allclose(system.m.orientation.array, (0, 0, 1), atol=1e-6))
+    True
+
+    """
+
+    _allowed_attributes = MinDriver._allowed_attributes + ["levels"]
+    _defaults = {**MinDriver._defaults, "levels": 3}
+
+    @property
+    def _x(self):
+        return "level"
+
+    def drive(self, system, /):
+        """Minimise the energy of the system on successively finer meshes.
+
+        ``system.m`` is updated with the relaxed magnetisation.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System object to be driven.
+
+        Raises
+        ------
+        ValueError
+
+            If the magnetisation of the system is not defined.
+
+        """
+        self._check_system(system)
+        m, Ms = mm.util.magnetisation_arrays(system.m)
+        hierarchy = [(system, m, Ms, (1, 1, 1))]
+        while len(hierarchy) <= self._setting("levels"):
+            coarse = self._coarsen(*hierarchy[-1][:3])
+            if coarse is None:
+                break
+            hierarchy.append(coarse)
+
+        rows = []
+        for level in reversed(range(len(hierarchy))):
+            level_system, m, Ms, factors = hierarchy[level]
+            if level < len(hierarchy) - 1:
+                coarse_m = hierarchy[level + 1][1]
+                for axis, factor in enumerate(hierarchy[level + 1][3]):
+                    coarse_m = np.repeat(coarse_m, factor, axis=axis)
+                np.multiply(coarse_m, Ms > 0, out=m)
+            iterations = self._minimise(level_system, m, Ms, stacklevel=2)
+            rows.append(
+                {"level": level, "cells": Ms[..., 0].size, "iterations": iterations}
+            )
+
+        system.m = mm.util.magnetisation_field(system.m, m, Ms)
+        system.records = _reducers.records(rows)
+        system.drive_number += 1
+
+    def _coarsen(self, system, m, Ms):
+        """Coarse system, magnetisation arrays and coarsening factors.
+
+        Returns ``None`` if the mesh cannot be coarsened.
+
+        """
+        mesh = system.m.mesh
+        factors = tuple(2 if n % 2 == 0 else 1 for n in mesh.n)
+        if factors == (1, 1, 1):
+            return None
+        try:
+            coarse_mesh = df.Mesh(
+                region=mesh.region,
+                n=tuple(int(n) // f for n, f in zip(mesh.n, factors)),
+                bc=mesh.bc,
+                subregions=mesh.subregions,
+            )
+        except ValueError:  # subregions are not aligned with coarse cells
+            return None
+
+        coarse_Ms = self._restrict(Ms, factors)
+        coarse_m = mm.util.normalise(self._restrict(m * Ms, factors))
+        # Merged cells whose magnetisation cancels take the direction of the
+        # cell with the largest saturation magnetisation.
+        cancelled = (np.linalg.norm(coarse_m, axis=-1) == 0) & (coarse_Ms[..., 0] > 0)
+        if np.any(cancelled):
+            blocks = self._blocks(m, factors)
+            largest = np.argmax(self._blocks(Ms, factors)[..., 0], axis=-1)
+            largest = np.take_along_axis(blocks, largest[..., None, None], axis=-2)
+            coarse_m[cancelled] = largest[..., 0, :][cancelled]
+
+        coarse = mm.System(name=system.name)
+        coarse.energy = self._restrict_terms(system.energy, mesh, coarse_mesh, factors)
+        coarse.m = df.Field(
+            coarse_mesh,
+            nvdim=3,
+            value=coarse_m * coarse_Ms,
+            vdims=system.m.vdims,
+            unit=system.m.unit,
+        )
+        return coarse, coarse_m, coarse_Ms, factors
+
+    def _restrict_terms(self, container, mesh, coarse_mesh, factors):
+        """Copy of the terms of ``container`` with ``discretisedfield.Field``
+        parameters averaged over the merged cells."""
+        restricted = container.__class__()
+        for term in container:
+            kwargs = {}
+            for attr in term._allowed_attributes:
+                value = getattr(term, attr, None)
+                if value is None or isinstance(value, ts.Descriptor):
+                    continue
+                if isinstance(value, df.Field):
+                    if value.mesh != mesh:
+                        msg = f"Parameter {term.name}.{attr} is not defined on {mesh=}."
+                        raise ValueError(msg)
+                    value = df.Field(
+                        coarse_mesh,
+                        nvdim=value.nvdim,
+                        value=self._restrict(value.array, factors),
+                        vdims=value.vdims,
+                        unit=value.unit,
+                    )
+                kwargs[attr] = value
+            restricted += term.__class__(name=term.name, **kwargs)
+        return restricted
+
+    @staticmethod
+    def _blocks(a, factors):
+        """Array of shape ``(nx', ny', nz', merged cells, nvdim)`` with the
+        values of the cells merged into every coarse cell."""
+        nx, ny, nz, nvdim = a.shape
+        fx, fy, fz = factors
+        blocks = a.reshape(nx // fx, fx, ny // fy, fy, nz // fz, fz, nvdim)
+        blocks = blocks.transpose(0, 2, 4, 1, 3, 5, 6)
+        return blocks.reshape(nx // fx, ny // fy, nz // fz, fx * fy * fz, nvdim)
+
+    @classmethod
+    def _restrict(cls, a, factors):
+        """Average of ``a`` over the merged cells."""
+        return np.mean(cls._blocks(a, factors), axis=-2)
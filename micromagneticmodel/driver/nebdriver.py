@@ -0,0 +1,291 @@
+import numpy as np
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+import micromagneticmodel as mm
+from . import reducers as _reducers
+from .mindriver import MinDriver
+
+
+@uu.inherit_docs
+@ts.typesystem(
+    spring_constant=ts.Scalar(positive=True),
+    climbing_image=ts.Typed(expected_type=bool),
+)
+class NEBDriver(MinDriver):
+    r"""Geodesic nudged elastic band driver.
+
+    A minimum energy path between two states of a system is computed with the
+    geodesic nudged elastic band method (Bessarab et al., Comput. Phys.
+    Commun. 196, 335 (2015)). The path is discretised with ``n`` images
+    between the two fixed end states, initially placed by rotating the
+    magnetisation in every cell along the great circle between the end
+    states. All images are stacked into a single array of shape ``(images, nx,
+    ny, nz, 3)``, so that the effective fields and energies of all images are
+    computed together and the demagnetisation kernel is computed only once.
+
+    Every image is moved by the component of the effective field torque
+    perpendicular to the path tangent and by a spring force along the tangent,
+    which keeps the geodesic distances between neighbouring images equal.
+    Geodesic distances are :math:`\sqrt{\sum w\theta^{2}}`, where
+    :math:`\theta` are the angles between the magnetisation vectors of the two
+    images in all cells and :math:`w = M_\text{s}V / \sum M_\text{s}V` the
+    fractions of the total magnetic moment of the cells, i.e. the root mean
+    square angle weighted with the magnetic moment. The same weights define
+    the inner products of the tangent and the forces, so that the path does
+    not depend on the discretisation, and empty cells do not contribute.
+    With ``climbing_image=True``, the image with the highest energy is not
+    subject to the spring force and climbs along the tangent to the saddle
+    point. The images are moved with the projected steepest descent of
+    ``micromagneticmodel.MinDriver``.
+
+    Parameters
+    ----------
+    stopping_mxHxm : numbers.Real, optional
+
+        Stopping criterion for the maximum force on the band in A/m. Defaults
+        to 0.1.
+
+    max_iterations : int, optional
+
+        Maximum number of iterations. Defaults to 100000.
+
+    spring_constant : numbers.Real, optional
+
+        Spring constant in A/m per radian of geodesic distance. Defaults to
+        ``1e5``.
+
+    climbing_image : bool, optional
+
+        If ``True``, the image with the highest energy climbs to the saddle
+        point. Defaults to ``False``.
+
+    Examples
+    --------
+    1. Energy barrier of a macrospin with uniaxial anisotropy.
+
+    >>> import discretisedfield as df
+    >>> import micromagneticmodel as mm
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(5e-9, 5e-9, 5e-9), n=(1, 1, 1))
+    >>> system = mm.System(name='macrospin')
+    >>> system.energy = mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1))
+    >>> system.m = df.Field(mesh, nvdim=3, value=(0.1, 0, 1), norm=1e6)
+    >>> final = mm.System(name='final', energy=system.energy)
+    >>> final.m = df.Field(mesh, nvdim=3, value=(0, 0.1, -1), norm=1e6)
+    >>> mm.MinDriver().drive(system)
+    >>> mm.MinDriver().drive(final)
+    >>> nebd = mm.NEBDriver(climbing_image=True)
+    >>> nebd.drive(system, final, n=5)
+    >>> len(system.images)
+    7
+    >>> barrier = system.records['E'].max() - system.records['E'][0]
+    >>> round(float(barrier / (1e5 * 5e-9**3)), 6)
+    1.0
+
+    """
+
+    _allowed_attributes = MinDriver._allowed_attributes + [
+        "spring_constant",
+        "climbing_image",
+    ]
+    _defaults = {
+        **MinDriver._defaults,
+        "spring_constant": 1e5,
+        "climbing_image": False,
+    }
+    _description = "Nudged elastic band"
+
+    @property
+    def _x(self):
+        return "distance"
+
+    def drive(self, system, final, /, n=10):
+        """Compute the minimum energy path from ``system`` to ``final``.
+
+        The energy equation of ``system`` is used for all images and the end
+        states are not changed. After the drive, ``system.images`` is a list of
+        the magnetisation fields of all images (including both end states) and
+        ``system.records`` contains the geodesic distance of every image from
+        ``system`` (column ``distance``), its total energy ``E``, and energies
+        ``E_<term name>`` of all terms in J.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System in the initial state of the path.
+
+        final : micromagneticmodel.System
+
+            System in the final state of the path, with the same mesh.
+
+        n : int, optional
+
+            Number of images between the end states. Defaults to 10.
+
+        Raises
+        ------
+        ValueError
+
+            If a magnetisation is not defined, the meshes differ, or ``n`` is
+            not positive.
+
+        """
+        self._check_system(system)
+        self._check_system(final)
+        mesh = system.m.mesh
+        if final.m.mesh != mesh:
+            msg = "Cannot drive between systems with different meshes."
+            raise ValueError(msg)
+        if n < 1:
+            msg = f"Cannot drive with {n=} images."
+            raise ValueError(msg)
+
+        initial, Ms = mm.util.magnetisation_arrays(system.m)
+        final_array, _ = mm.util.magnetisation_arrays(final.m)
+        band = self._interpolate(initial, final_array, np.linspace(0, 1, n + 2))
+        self._relax(system, band, Ms, stacklevel=2)
+
+        energies = self._image_energies(system.energy, band, Ms, mesh)
+        total = sum(energies.values(), np.zeros(n + 2))
+        weights = self._weights(Ms)
+        distance = np.concatenate(([0], np.cumsum(self._distances(band, weights))))
+        rows = []
+        for i in range(n + 2):
+            row = {"distance": distance[i], "E": total[i]}
+            row.update({f"E_{name}": value[i] for name, value in energies.items()})
+            rows.append(row)
+
+        system.images = [
+            mm.util.magnetisation_field(system.m, image, Ms) for image in band
+        ]
+        system.records = _reducers.records(rows)
+        system.drive_number += 1
+
+    def _relax(self, system, band, Ms, stacklevel=1):
+        """Move the inner images of ``band`` in place to the minimum energy
+        path and return the number of iterations (see ``_minimise`` for
+        ``stacklevel``)."""
+        mesh = system.m.mesh
+        k = self._setting("spring_constant")
+        climbing_image = self._setting("climbing_image")
+        shape = (-1,) + (1,) * (band.ndim - 1)
+        axes = tuple(range(1, band.ndim))
+        weights = self._weights(Ms)
+
+        E = np.empty(len(band))
+        ends = band[[0, -1]]
+        E[[0, -1]] = sum(self._image_energies(system.energy, ends, Ms, mesh).values())
+        H = np.empty_like(band[1:-1])
+
+        def descent(m, out, scalar):
+            """Nudged elastic band force on the inner images ``m``."""
+            energies = self._image_energies(system.energy, m, Ms, mesh, H=H)
+            E[1:-1] = sum(energies.values())
+            np.einsum("...i,...i->...", m, H, out=scalar[..., 0])
+            np.multiply(scalar, m, out=out)
+            np.subtract(H, out, out=out)
+
+            tangent = self._tangents(band, E, weights)
+            parallel = np.sum(weights * out * tangent, axis=axes)
+            distances = self._distances(band, weights)
+            coefficient = k * (distances[1:] - distances[:-1]) - parallel
+            if climbing_image:
+                i = np.argmax(E[1:-1])
+                coefficient[i] = -2 * parallel[i]
+            out += coefficient.reshape(shape) * tangent
+
+        return self._descend(band[1:-1], descent, Ms, stacklevel=stacklevel + 1)
+
+    @staticmethod
+    def _image_energies(energy, m, Ms, mesh, H=None):
+        """Energies of all terms for all images of ``m`` (arrays of shape
+        ``(images,)``). If ``H`` is passed, the total effective field is
+        written into it."""
+        field = np.empty_like(m)
+        w = np.empty(m.shape[:-1] + (1,))
+        if H is not None:
+            H[...] = 0
+        energies = {}
+        for term in energy:
+            term._effective_field(m, Ms, mesh, out=field)
+            term._density(m, Ms, mesh, field, out=w)
+            energies[term.name] = np.sum(w, axis=tuple(range(1, w.ndim))) * mesh.dV
+            if H is not None:
+                H += field
+        return energies
+
+    @staticmethod
+    def _weights(Ms):
+        """Fractions of the total magnetic moment of all cells."""
+        return Ms / np.sum(Ms)
+
+    @staticmethod
+    def _tangents(band, E, weights):
+        """Energy-weighted tangents of the inner images (Henkelman and
+        Jonsson, J. Chem. Phys. 113, 9978 (2000)), perpendicular to the
+        magnetisation in every cell and normalised for every image with the
+        inner product weighted with ``weights``."""
+        m = band[1:-1]
+        forward = band[2:] - m
+        backward = m - band[:-2]
+        up, down = E[2:] - E[1:-1], E[1:-1] - E[:-2]
+        largest = np.maximum(np.abs(up), np.abs(down))
+        smallest = np.minimum(np.abs(up), np.abs(down))
+        rising = E[2:] > E[:-2]
+        weight_forward = np.where(rising, largest, smallest)
+        weight_backward = np.where(rising, smallest, largest)
+        monotonic_up = (up > 0) & (down > 0)
+        monotonic_down = (up < 0) & (down < 0)
+        weight_forward = np.where(monotonic_up, 1.0, weight_forward)
+        weight_forward = np.where(monotonic_down, 0.0, weight_forward)
+        weight_backward = np.where(monotonic_up, 0.0, weight_backward)
+        weight_backward = np.where(monotonic_down, 1.0, weight_backward)
+
+        shape = (-1,) + (1,) * (band.ndim - 1)
+        tangent = weight_forward.reshape(shape) * forward
+        tangent += weight_backward.reshape(shape) * backward
+        tangent -= np.einsum("...i,...i->...", tangent, m)[..., None] * m
+        norm = np.sqrt(np.sum(weights * tangent**2, axis=tuple(range(1, band.ndim))))
+        np.divide(
+            tangent, norm.reshape(shape), out=tangent, where=norm.reshape(shape) > 0
+        )
+        return tangent
+
+    @staticmethod
+    def _distances(band, weights):
+        """Geodesic distances between neighbouring images of ``band`` with
+        cells weighted with ``weights``."""
+        a, b = band[:-1], band[1:]
+        sin = np.linalg.norm(mm.util.cross(a, b, out=np.empty_like(a)), axis=-1)
+        cos = np.einsum("...i,...i->...", a, b)
+        angle = np.arctan2(sin, cos)
+        return np.sqrt(
+            np.sum(weights[..., 0] * angle**2, axis=tuple(range(1, angle.ndim)))
+        )
+
+    @staticmethod
+    def _interpolate(a, b, s):
+        """Images rotating ``a`` towards ``b`` along great circles in every
+        cell, at fractions ``s`` of the angle between them."""
+        axis = mm.util.cross(a, b, out=np.empty_like(a))
+        sin = np.linalg.norm(axis, axis=-1, keepdims=True)
+        cos = np.einsum("...i,...i->...", a, b)[..., None]
+        angle = np.arctan2(sin, cos)
+
+        # Antiparallel vectors are rotated about an axis perpendicular to a,
+        # obtained from the coordinate axis least aligned with a.
+        helper = np.eye(3)[np.argmin(np.abs(a), axis=-1)]
+        perpendicular = mm.util.cross(a, helper, out=np.empty_like(a))
+        perpendicular /= np.maximum(
+            np.linalg.norm(perpendicular, axis=-1, keepdims=True), 1e-300
+        )
+        np.divide(axis, sin, out=axis, where=sin > 1e-12)
+        axis = np.where(sin > 1e-12, axis, perpendicular)
+        direction = mm.util.cross(axis, a, out=np.empty_like(a))
+
+        s = np.reshape(s, (-1,) + (1,) * a.ndim)
+        band = a * np.cos(s * angle) + direction * np.sin(s * angle)
+        band[0], band[-1] = a, b
+        return band
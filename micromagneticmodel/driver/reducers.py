@@ -0,0 +1,130 @@
+"""Reducers of the magnetisation to rows of in-process driver records.
+
+A reducer is called as ``reducer(system, t, m, Ms)``, where ``m`` is the unit
+magnetisation array and ``Ms`` the saturation magnetisation array of
+``system`` at time ``t``, and returns a dictionary of scalar columns.
+Built-in reducers are selected by their names in ``builtin``.
+
+"""
+
+import numpy as np
+
+import micromagneticmodel as mm
+
+
+def average(system, t, m, Ms):
+    """Average normalised magnetisation (columns ``mx``, ``my`` and ``mz``)."""
+    count = max(np.count_nonzero(Ms), 1)
+    mean = np.sum(m, axis=mm.util.spatial_axes) / count
+    return dict(zip(("mx", "my", "mz"), map(float, mean)))
+
+
+def energy(system, t, m, Ms, field=None):
+    """Total energy ``E`` and energies ``E_<term name>`` of all terms in J.
+
+    If ``field`` is passed, the total effective field is written into it.
+
+    """
+    energies = system.energy._energies(m, Ms, system.m.mesh, t=t, field=field)
+    columns = {"E": sum(energies.values(), 0.0)}
+    columns.update({f"E_{name}": value for name, value in energies.items()})
+    return columns
+
+
+def max_torque(system, t, m, Ms, field=None):
+    """Maximum of :math:`|\\mathbf{m} \\times \\mathbf{H}_\\text{eff}|` in A/m.
+
+    The total effective field ``field`` is computed if it is not passed.
+
+    """
+    if field is None:
+        field = system.energy._effective_field(m, Ms, system.m.mesh, t=t)
+    torque = mm.util.cross(m, field, out=np.empty_like(m))
+    return {"max_mxHxm": float(np.max(np.linalg.norm(torque, axis=-1), initial=0))}
+
+
+def region_average(system, t, m, Ms):
+    """Average normalised magnetisation in all subregions.
+
+    The columns are ``mx_<subregion name>``, ``my_<subregion name>`` and
+    ``mz_<subregion name>``.
+
+    """
+    mesh = system.m.mesh
+    counts = mm.util.region_sums((Ms > 0).astype(float), mesh)
+    columns = {}
+    for i, component in enumerate(("mx", "my", "mz")):
+        sums = mm.util.region_sums(m[..., i], mesh)
+        for name, total in sums.items():
+            columns[f"{component}_{name}"] = total / max(counts[name], 1)
+    return columns
+
+
+builtin = {
+    "m": average,
+    "E": energy,
+    "max_mxHxm": max_torque,
+    "m_by_region": region_average,
+}
+"""Built-in reducers with their names as keys."""
+
+
+def check(reducers):
+    """Check that reducers are names of built-in reducers or callables.
+
+    Raises
+    ------
+    ValueError
+
+        If a reducer name is not in ``builtin``.
+
+    TypeError
+
+        If a reducer is neither a name nor a callable.
+
+    """
+    for reducer in reducers:
+        if isinstance(reducer, str) and reducer not in builtin:
+            msg = f"Unknown {reducer=}, expected one of {list(builtin)}."
+            raise ValueError(msg)
+        elif not isinstance(reducer, str) and not callable(reducer):
+            msg = f"Cannot use {reducer=}, expected a name or a callable."
+            raise TypeError(msg)
+
+
+def evaluate(reducers, system, t, m, Ms):
+    """Evaluate all ``reducers`` (names or callables) into one row.
+
+    The effective field is computed only once and shared by the ``E`` and
+    ``max_mxHxm`` reducers.
+
+    """
+    names = [reducer for reducer in reducers if isinstance(reducer, str)]
+    columns = {}
+    if "max_mxHxm" in names:
+        field = np.empty_like(m)
+        if "E" in names:
+            # The total effective field is a by-product of the energies.
+            columns["E"] = energy(system, t, m, Ms, field=field)
+        else:
+            system.energy._effective_field(m, Ms, system.m.mesh, t=t, out=field)
+        columns["max_mxHxm"] = max_torque(system, t, m, Ms, field=field)
+
+    row = {}
+    for reducer in reducers:
+        if isinstance(reducer, str):
+            if reducer not in columns:
+                columns[reducer] = builtin[reducer](system, t, m, Ms)
+            row.update(columns[reducer])
+        else:
+            row.update(reducer(system, t, m, Ms))
+    return row
+
+
+def records(rows):
+    """Structured array with one float field for every column of ``rows``."""
+    columns = list(rows[0]) if rows else []
+    dtype = [(column, float) for column in columns]
+    return np.array(
+        [tuple(row[column] for column in columns) for row in rows], dtype=dtype
+    )
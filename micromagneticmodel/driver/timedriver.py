@@ -0,0 +1,150 @@
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+from ..evolver import Evolver, RungeKuttaEvolver, StochasticHeunEvolver
+from . import reducers as _reducers
+from .driver import Driver
+
+
+@uu.inherit_docs
+@ts.typesystem(evolver=ts.Typed(expected_type=Evolver))
+class TimeDriver(Driver):
+    """In-process time driver.
+
+    The dynamics equation ``system.dynamics`` is integrated in process by
+    ``evolver``. Instead of saving magnetisation snapshots, reducers are
+    evaluated at ``n`` equally spaced sampling times and their results are
+    collected in ``system.records``, a ``numpy`` structured array with the
+    column ``t`` and one column for every value returned by the reducers.
+
+    Built-in reducers are selected by name:
+
+    - ``'m'``: average normalised magnetisation (``mx``, ``my``, ``mz``),
+
+    - ``'E'``: total energy ``E`` and energy ``E_<term name>`` of every
+      term in J,
+
+    - ``'max_mxHxm'``: maximum torque :math:`|\\mathbf{m} \\times
+      \\mathbf{H}_\\text{eff}|` in A/m,
+
+    - ``'m_by_region'``: average normalised magnetisation in every subregion
+      (``mx_<subregion name>``, ...).
+
+    Any callable ``reducer(system, t, m, Ms)`` returning a dictionary of
+    scalar columns can be passed as well. ``m`` is the unit magnetisation
+    array at time ``t`` and ``Ms`` the saturation magnetisation array.
+
+    Parameters
+    ----------
+    evolver : micromagneticmodel.Evolver, optional
+
+        Evolver integrating the dynamics equation in process. Defaults to
+        ``micromagneticmodel.RungeKuttaEvolver()`` at zero temperature and
+        ``micromagneticmodel.StochasticHeunEvolver()`` at non-zero temperature
+        ``system.T``.
+
+    Examples
+    --------
+    1. Time evolution of the macrospin example.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> td = mm.TimeDriver()
+    >>> td.drive(system, t=1e-10, n=100)
+    >>> system.records.shape
+    (100,)
+    >>> system.records.dtype.names
+    ('t', 'mx', 'my', 'mz', 'E', 'E_zeeman', 'max_mxHxm')
+    >>> float(system.records['t'][-1])
+    1e-10
+
+    2. Using a custom reducer.
+
+    >>> def mz_min(system, t, m, Ms):
+    ...     return {'mz_min': float(m[..., 2].min())}
+    >>> td.drive(system, t=1e-11, n=10, reducers=['m', mz_min])
+    >>> system.records.dtype.names
+    ('t', 'mx', 'my', 'mz', 'mz_min')
+
+    """
+
+    _allowed_attributes = ["evolver"]
+
+    @property
+    def _x(self):
+        return "t"
+
+    def drive(self, system, /, t, n, reducers=("m", "E", "max_mxHxm")):
+        """Drive the system in time.
+
+        ``system.m`` is updated with the final magnetisation and
+        ``system.records`` with the reduced data at all sampling times.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System object to be driven.
+
+        t : numbers.Real
+
+            Simulation time in seconds.
+
+        n : int
+
+            Number of equally spaced sampling times in ``(0, t]``.
+
+        reducers : list, optional
+
+            Names of built-in reducers and callables evaluated at every
+            sampling time. Defaults to ``('m', 'E', 'max_mxHxm')``.
+
+        Raises
+        ------
+        ValueError
+
+            If the system has no magnetisation or dynamics equation, ``t`` or
+            ``n`` are not positive, an unknown reducer name is passed, or the
+            evolver does not include the thermal field at non-zero
+            temperature.
+
+        TypeError
+
+            If a reducer is neither a name nor a callable.
+
+        """
+        self._check_system(system)
+        if t <= 0 or n < 1:
+            msg = f"Cannot drive with {t=} and {n=}, both must be positive."
+            raise ValueError(msg)
+        _reducers.check(reducers)
+
+        rows = []
+
+        def callback(i, time, m, Ms):
+            row = {"t": time}
+            row.update(_reducers.evaluate(reducers, system, time, m, Ms))
+            rows.append(row)
+
+        evolver = _evolver(self._setting("evolver"), system)
+        evolver.evolve(system, t, n=n, callback=callback)
+        system.records = _reducers.records(rows)
+        system.drive_number += 1
+
+    def _check_system(self, system):
+        """Check if the system contains all required information."""
+        if system.m is None:
+            msg = f"Cannot drive {system=} without magnetisation."
+            raise ValueError(msg)
+        if not len(system.dynamics):
+            msg = f"Cannot drive {system=} without dynamics equation."
+            raise ValueError(msg)
+
+
+def _evolver(evolver, system):
+    """``evolver`` or, if it is ``None``, the default evolver for the
+    temperature of ``system``."""
+    if evolver is not None:
+        return evolver
+    return StochasticHeunEvolver() if system.T > 0 else RungeKuttaEvolver()
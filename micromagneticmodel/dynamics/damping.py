@@ -1,7 +1,9 @@
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .dynamicsterm import DynamicsTerm
 
 
@@ -28,6 +30,13 @@ class Damping(DynamicsTerm):
         (if the parameter is defined "per region") or
         ``discretisedfield.Field`` is passed.
 
+    Notes
+    -----
+    The gyromagnetic ratio :math:`\gamma_{0}` is taken from the ``Precession``
+    term when both terms are evaluated together in a ``Dynamics`` container
+    (see ``Dynamics.dmdt``). On its own, the damping term is evaluated with
+    ``micromagneticmodel.consts.gamma0``.
+
     Examples
     --------
     1. Defining the damping dynamics term using scalar.
@@ -64,5 +73,31 @@ class Damping(DynamicsTerm):
         r"\times (\mathbf{m} \times \mathbf{H}_\text{eff})"
     )
 
-    def dmdt(self, m, Heff):
-        raise NotImplementedError
+    def _dmdt(self, m, Ms, mesh, Heff, t=0, out=None, alpha=0, gamma0=None):
+        if out is None:
+            out = np.empty_like(m)
+        if gamma0 is None:
+            gamma0 = mm.consts.gamma0
+
+        def compute():
+            alpha = self._alpha(mesh)
+            return -gamma0 * alpha / (1 + alpha**2)
+
+        key = ("coefficient", mm.util.mesh_key(mesh))
+        coefficient = self._cached_for(key, gamma0, compute)
+        mxH = self._buffer("mxH", m.shape)
+        mm.util.cross(m, Heff, out=mxH)
+        mm.util.cross(m, mxH, out=out)
+        out *= coefficient
+        return out
+
+    def _alpha(self, mesh):
+        """Damping constant array."""
+
+        def compute():
+            if isinstance(self.alpha, ts.Descriptor):
+                msg = "Damping constant alpha must be defined."
+                raise ValueError(msg)
+            return mm.util.parameter_array(self.alpha, mesh)
+
+        return self._cached(("alpha", mm.util.mesh_key(mesh)), compute)
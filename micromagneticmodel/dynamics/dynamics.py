@@ -1,7 +1,11 @@
+import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 
 import micromagneticmodel as mm
+from .damping import Damping
 from .dynamicsterm import DynamicsTerm
+from .precession import Precession
 
 
 @uu.inherit_docs
@@ -28,3 +32,93 @@ class Dynamics(mm.abstract.Container):
     """
 
     _term_class = DynamicsTerm
+
+    def dmdt(self, m, Heff, t=0, out=None):
+        r"""Time derivative of the normalised magnetisation of all terms.
+
+        ``Precession`` and ``Damping`` are evaluated together as the
+        Landau-Lifshitz-Gilbert equation
+
+        .. math::
+
+            \frac{\text{d}\mathbf{m}}{\text{d}t} = -\frac{\gamma_{0}}{1 +
+            \alpha^{2}} \left[\mathbf{m} \times \mathbf{H}_\text{eff} + \alpha
+            \mathbf{m} \times (\mathbf{m} \times \mathbf{H}_\text{eff})\right],
+
+        computing :math:`\mathbf{m} \times \mathbf{H}_\text{eff}` only once.
+        Time derivatives of all other terms are added to the result, using the
+        damping constant and gyromagnetic ratio of ``Damping`` and
+        ``Precession``.
+
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        Heff : discretisedfield.Field, numpy.ndarray
+
+            Effective field in A/m.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        out : numpy.ndarray, optional
+
+            Array with the shape of ``m.array`` into which the result is
+            written. Defaults to ``None``.
+
+        Returns
+        -------
+        discretisedfield.Field, numpy.ndarray
+
+            Time derivative of the normalised magnetisation in 1/s. If ``out``
+            is passed, ``out`` is returned.
+
+        Examples
+        --------
+        1. Time derivative in an effective field perpendicular to the
+        magnetisation.
+
+        >>> import discretisedfield as df
+        >>> import micromagneticmodel as mm
+        ...
+        >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(5e-9, 5e-9, 5e-9), n=(5, 5, 5))
+        >>> m = df.Field(mesh, nvdim=3, value=(1, 0, 0), norm=8e5)
+        >>> Heff = df.Field(mesh, nvdim=3, value=(0, 0, 1e5))
+        >>> dynamics = mm.Precession(gamma0=2e5) + mm.Damping(alpha=1)
+        >>> dynamics.dmdt(m, Heff).mean()
+        array([0.e+00, 1.e+10, 1.e+10])
+
+        """
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        H = Heff.array if isinstance(Heff, df.Field) else np.asarray(Heff)
+        dmdt = self._dmdt(m_array, Ms, m.mesh, H, t=t, out=out)
+        if out is not None:
+            return out
+        return df.Field(m.mesh, nvdim=3, value=dmdt, vdims=m.vdims, unit="1/s")
+
+    def _dmdt(self, m, Ms, mesh, Heff, t=0, out=None):
+        """Time derivative array of all terms, see ``DynamicsTerm._dmdt``."""
+        if out is None:
+            out = np.empty_like(m)
+        precession = next((term for term in self if isinstance(term, Precession)), None)
+        damping = next((term for term in self if isinstance(term, Damping)), None)
+        alpha = 0 if damping is None else damping._alpha(mesh)
+        gamma0 = None if precession is None else precession._gamma0(mesh)
+
+        if precession is not None and damping is not None:
+            precession._llg(m, mesh, Heff, out, alpha)
+        elif precession is not None:
+            precession._dmdt(m, Ms, mesh, Heff, out=out)
+        elif damping is not None:
+            damping._dmdt(m, Ms, mesh, Heff, out=out)
+        else:
+            out[...] = 0
+
+        for term in self:
+            if term is not precession and term is not damping:
+                term._add_dmdt(m, Ms, mesh, Heff, out, t=t, alpha=alpha, gamma0=gamma0)
+        return out
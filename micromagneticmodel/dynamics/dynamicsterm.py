@@ -1,5 +1,5 @@
-import abc
-
+import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 
 import micromagneticmodel as mm
@@ -11,6 +11,108 @@ class DynamicsTerm(mm.abstract.Term):
 
     _container_class = "Dynamics"
 
-    @abc.abstractmethod
-    def dmdt(self, m, Heff):
-        pass  # pragma: no cover
+    def dmdt(self, m, Heff, t=0, out=None):
+        """Time derivative of the normalised magnetisation.
+
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        Heff : discretisedfield.Field, numpy.ndarray
+
+            Effective field in A/m.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        out : numpy.ndarray, optional
+
+            Array with the shape of ``m.array`` into which the result is
+            written. Defaults to ``None``.
+
+        Returns
+        -------
+        discretisedfield.Field, numpy.ndarray
+
+            Time derivative of the normalised magnetisation in 1/s. If ``out``
+            is passed, ``out`` is returned.
+
+        Raises
+        ------
+        NotImplementedError
+
+            If the time derivative of the dynamics term is not implemented.
+
+        """
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        H = Heff.array if isinstance(Heff, df.Field) else np.asarray(Heff)
+        dmdt = self._dmdt(m_array, Ms, m.mesh, H, t=t, out=out)
+        if out is not None:
+            return out
+        return df.Field(m.mesh, nvdim=3, value=dmdt, vdims=m.vdims, unit="1/s")
+
+    def _dmdt(self, m, Ms, mesh, Heff, t=0, out=None, alpha=0, gamma0=None):
+        """Time derivative array of the normalised magnetisation.
+
+        Derived classes implement this method to compute the time derivative
+        from arrays in ``discretisedfield.Field`` layout. Terms which depend on
+        the damping constant or the gyromagnetic ratio take them from
+        ``alpha`` and ``gamma0``, which ``Dynamics`` sets from its ``Damping``
+        and ``Precession`` terms.
+
+        Parameters
+        ----------
+        m : numpy.ndarray
+
+            Unit magnetisation of shape ``(..., nx, ny, nz, 3)``. It is zero in
+            cells with zero saturation magnetisation.
+
+        Ms : numpy.ndarray
+
+            Saturation magnetisation of shape ``(nx, ny, nz, 1)``.
+
+        mesh : discretisedfield.Mesh
+
+            Mesh on which ``m`` is defined.
+
+        Heff : numpy.ndarray
+
+            Effective field with the same shape as ``m``.
+
+        t : numbers.Real, optional
+
+            Time in seconds. Defaults to 0.
+
+        out : numpy.ndarray, optional
+
+            Array with the same shape as ``m`` into which the result is
+            written. Defaults to ``None``.
+
+        alpha : numbers.Real, numpy.ndarray, optional
+
+            Gilbert damping constant. Defaults to 0.
+
+        gamma0 : numbers.Real, numpy.ndarray, optional
+
+            Gyromagnetic ratio in m/As. Defaults to
+            ``micromagneticmodel.consts.gamma0``.
+
+        Returns
+        -------
+        numpy.ndarray
+
+            Time derivative with the same shape as ``m`` (``out`` if passed).
+
+        """
+        raise NotImplementedError
+
+    def _add_dmdt(self, m, Ms, mesh, Heff, out, t=0, alpha=0, gamma0=None):
+        """Add the time derivative array to ``out`` and return ``out``."""
+        dmdt = self._buffer("dmdt", out.shape)
+        self._dmdt(m, Ms, mesh, Heff, t=t, out=dmdt, alpha=alpha, gamma0=gamma0)
+        out += dmdt
+        return out
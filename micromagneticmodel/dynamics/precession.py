@@ -1,7 +1,9 @@
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .dynamicsterm import DynamicsTerm
 
 
@@ -27,6 +29,13 @@ class Precession(DynamicsTerm):
         (if the parameter is defined "per region") or
         ``discretisedfield.Field`` is passed.
 
+    Notes
+    -----
+    The damping constant :math:`\alpha` is taken from the ``Damping`` term when
+    both terms are evaluated together in a ``Dynamics`` container (see
+    ``Dynamics.dmdt``). On its own, the precession term is evaluated with
+    :math:`\alpha = 0`.
+
     Examples
     --------
     1. Defining the precession dynamics term using scalar.
@@ -63,5 +72,53 @@ class Precession(DynamicsTerm):
         r"\times \mathbf{H}_\text{eff}"
     )
 
-    def dmdt(self, m, Heff):
-        raise NotImplementedError
+    def _dmdt(self, m, Ms, mesh, Heff, t=0, out=None, alpha=0, gamma0=None):
+        if out is None:
+            out = np.empty_like(m)
+        precession, _ = self._coefficients(mesh, alpha)
+        mm.util.cross(m, Heff, out=out)
+        out *= precession
+        return out
+
+    def _llg(self, m, mesh, Heff, out, alpha):
+        """Precession and damping written into ``out``.
+
+        :math:`\\mathbf{m} \\times \\mathbf{H}_\\text{eff}` is computed only
+        once and reused for the double cross product of the damping term.
+
+        """
+        precession, damping = self._coefficients(mesh, alpha)
+        mxH = self._buffer("mxH", m.shape)
+        mm.util.cross(m, Heff, out=mxH)
+        mm.util.cross(m, mxH, out=out)
+        out *= damping
+        mxH *= precession
+        out += mxH
+        return out
+
+    def _coefficients(self, mesh, alpha=0):
+        """Coefficients of the precession and damping cross products.
+
+        Returns :math:`-\\gamma_{0}/(1 + \\alpha^{2})` and
+        :math:`-\\gamma_{0}\\alpha/(1 + \\alpha^{2})`.
+
+        """
+        gamma0 = self._gamma0(mesh)
+
+        def compute():
+            precession = -gamma0 / (1 + np.square(alpha))
+            return precession, precession * alpha
+
+        key = ("coefficients", mm.util.mesh_key(mesh))
+        return self._cached_for(key, alpha, compute)
+
+    def _gamma0(self, mesh):
+        """Gyromagnetic ratio array."""
+
+        def compute():
+            if isinstance(self.gamma0, ts.Descriptor):
+                msg = "Gyromagnetic ratio gamma0 must be defined."
+                raise ValueError(msg)
+            return mm.util.parameter_array(self.gamma0, mesh)
+
+        return self._cached(("gamma0", mm.util.mesh_key(mesh)), compute)
@@ -1,9 +1,11 @@
 import collections
 
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .dynamicsterm import DynamicsTerm
 
 
@@ -109,6 +111,18 @@ class Slonczewski(DynamicsTerm):
         to the OOMMF documentation for more details (
         https://math.nist.gov/oommf/doc/userguide20a3/userguide/Standard_Oxs_Ext_Child_Clas.html#SX).
 
+    Notes
+    -----
+    The free layer thickness :math:`t` is the thickness in the :math:`z`
+    direction of the magnetic cells in which both ``J`` and ``P`` are non-zero,
+    determined separately for every column of cells. For a uniform current
+    through the whole sample, it is the thickness of the mesh region. The
+    gyromagnetic ratio :math:`\gamma` and the damping constant :math:`\alpha`
+    are taken from the ``Precession`` and ``Damping`` terms of the
+    ``Dynamics`` container the term is evaluated in (see ``Dynamics.dmdt``).
+    On its own, the term is evaluated with ``micromagneticmodel.consts.gamma0``
+    and :math:`\alpha = 0`.
+
     Examples
     --------
     1. Defining spatially constant Slonczewski dynamics term.
@@ -178,5 +192,89 @@ class Slonczewski(DynamicsTerm):
 
         return reprlatex
 
-    def dmdt(self, m, Heff):
-        raise NotImplementedError
+    def _dmdt(self, m, Ms, mesh, Heff, t=0, out=None, alpha=0, gamma0=None):
+        if out is None:
+            out = np.empty_like(m)
+        if gamma0 is None:
+            gamma0 = mm.consts.gamma0
+        mp, b, A, alphaC, C = self._prefactors(mesh, Ms, alpha, gamma0)
+
+        # A epsilon / epsilon_0 = A / (1 + b m . mp)
+        epsilon = self._buffer("epsilon", m.shape[:-1] + (1,))
+        coefficient = self._buffer("coefficient", epsilon.shape)
+        np.einsum("...i,...i->...", m, mp, out=epsilon[..., 0])
+        epsilon *= b
+        epsilon += 1
+        np.divide(A, epsilon, out=epsilon)
+
+        # m x (mp x m) = -m x (m x mp)
+        mxmp = self._buffer("mxmp", m.shape)
+        mm.util.cross(m, mp, out=mxmp)
+        mm.util.cross(m, mxmp, out=out)
+        np.add(epsilon, alphaC, out=coefficient)
+        np.negative(coefficient, out=coefficient)
+        out *= coefficient
+
+        epsilon *= alpha
+        epsilon -= C
+        mxmp *= epsilon
+        out += mxmp
+
+        factor = self._time_factor(t)
+        if factor != 1:
+            out *= factor
+        return out
+
+    def _prefactors(self, mesh, Ms, alpha, gamma0):
+        """Magnetisation-independent arrays of the spin-transfer torque.
+
+        Returns the normalised polarisation :math:`\\mathbf{m}_\\text{p}`,
+        :math:`b = (\\Lambda^{2} - 1)/(\\Lambda^{2} + 1)`, :math:`A =
+        \\gamma\\beta\\epsilon_{0}/(1 + \\alpha^{2})`, :math:`\\alpha C` and
+        :math:`C = \\gamma\\beta\\epsilon'/(1 + \\alpha^{2})`, where
+        :math:`\\epsilon_{0} = P\\Lambda^{2}/(\\Lambda^{2} + 1)`, so that
+        :math:`\\epsilon = \\epsilon_{0}/(1 + b\\,\\mathbf{m}\\cdot
+        \\mathbf{m}_\\text{p})`.
+
+        """
+        for name in ["J", "mp", "P", "Lambda"]:
+            if isinstance(getattr(self, name), ts.Descriptor):
+                msg = f"Slonczewski parameter {name} must be defined."
+                raise ValueError(msg)
+
+        def compute():
+            J = mm.util.parameter_array(self.J, mesh)
+            P = mm.util.parameter_array(self.P, mesh)
+            Lambda2 = np.square(mm.util.parameter_array(self.Lambda, mesh))
+            eps_prime = (
+                0
+                if isinstance(self.eps_prime, ts.Descriptor)
+                else mm.util.parameter_array(self.eps_prime, mesh)
+            )
+            mp = mm.util.normalise(mm.util.parameter_array(self.mp, mesh, nvdim=3))
+            # The free layer consists of the magnetic cells the current flows
+            # through, counted along z separately in every column of cells.
+            free = (J != 0) & (P != 0) & (Ms != 0)
+            thickness = np.sum(free, axis=-2, keepdims=True) * mesh.cell[2]
+            beta = (
+                abs(mm.consts.hbar / (mm.consts.mu0 * mm.consts.e))
+                * J
+                * mm.util.inverse(thickness)
+                * mm.util.inverse(Ms)
+            )
+            gamma_beta = gamma0 * beta / (1 + np.square(alpha))
+            A = gamma_beta * P * Lambda2 / (Lambda2 + 1)
+            C = gamma_beta * eps_prime
+            return mp, (Lambda2 - 1) / (Lambda2 + 1), A, alpha * C, C
+
+        key = ("prefactors", mm.util.mesh_key(mesh))
+        return self._cached_for(key, (Ms, alpha, gamma0), compute)
+
+    def _time_factor(self, t):
+        """Time-dependent pre-factor of ``J``."""
+        if not isinstance(self.func, ts.Descriptor):
+            return self.func(t)
+        if not isinstance(self.tcl_strings, ts.Descriptor):
+            msg = "Time dependence defined by tcl_strings cannot be evaluated."
+            raise NotImplementedError(msg)
+        return 1
@@ -6,6 +6,7 @@ import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .dynamicsterm import DynamicsTerm
 
 
@@ -106,6 +107,16 @@ class ZhangLi(DynamicsTerm):
         Slonczewski current/Oxs_SpinXferEvolve:
         https://math.nist.gov/oommf/doc/userguide20a3/userguide/Standard_Oxs_Ext_Child_Clas.html#SX).
 
+    Notes
+    -----
+    The directional derivative :math:`(\mathbf{u} \cdot \boldsymbol\nabla)
+    \mathbf{m}` is computed using central differences. At sample boundaries
+    and next to cells with zero saturation magnetisation, one-sided
+    differences are used. The damping constant :math:`\alpha` is taken from
+    the ``Damping`` term of the ``Dynamics`` container the term is evaluated
+    in (see ``Dynamics.dmdt``). On its own, the term is evaluated with
+    :math:`\alpha = 0`.
+
     Examples
     --------
     1. Defining the Zhang-Li dynamics term using scalar.
@@ -149,5 +160,108 @@ class ZhangLi(DynamicsTerm):
         r"(\mathbf{u} \cdot \boldsymbol\nabla)\mathbf{m}"
     )
 
-    def dmdt(self, m, Heff):
-        raise NotImplementedError
+    def _dmdt(self, m, Ms, mesh, Heff, t=0, out=None, alpha=0, gamma0=None):
+        if out is None:
+            out = np.empty_like(m)
+
+        # (u . grad) m
+        derivative = self._buffer("derivative", m.shape)
+        difference = self._buffer("difference", m.shape)
+        work = self._buffer("work", m.shape)
+        derivative[...] = 0
+        for axis, forward, backward in self._stencil(mesh, Ms):
+            mm.util.roll(m, -1, axis, out=difference)
+            difference -= m
+            np.multiply(forward, difference, out=work)
+            derivative += work
+            mm.util.roll(difference, 1, axis, out=work)
+            work *= backward
+            derivative += work
+        factor = self._time_factor(t)
+        if factor != 1:
+            derivative *= factor
+
+        precession, damping = self._coefficients(alpha)
+        mm.util.cross(m, derivative, out=work)
+        mm.util.cross(m, work, out=out)
+        out *= damping
+        work *= precession
+        out += work
+        return out
+
+    def _stencil(self, mesh, Ms):
+        """Weights of the directional derivative.
+
+        Returns a list with an entry ``(axis, forward, backward)`` for each
+        direction with non-zero :math:`u_{k}`, where ``forward`` and
+        ``backward`` multiply the differences to the next and to the previous
+        cell. They are :math:`u_{k}/(2\\Delta k)` for central differences and
+        :math:`u_{k}/\\Delta k` or zero for one-sided differences.
+
+        """
+
+        def compute():
+            u = self._velocity(mesh)
+            magnetic = np.broadcast_to(Ms > 0, Ms.shape)
+            stencil = []
+            for k, (axis, dx, n, periodic) in enumerate(
+                zip(mm.util.spatial_axes, mesh.cell, mesh.n, mm.util.periodic(mesh))
+            ):
+                uk = u[..., k : k + 1]
+                if n == 1 or not uk.any():
+                    continue
+                index = [slice(None)] * magnetic.ndim
+                index[axis] = -1
+                has_next = magnetic & np.roll(magnetic, -1, axis=axis)
+                if not periodic:
+                    has_next[tuple(index)] = False
+                has_previous = np.roll(has_next, 1, axis=axis)
+                count = has_next.astype(float) + has_previous
+                weight = np.divide(
+                    uk / dx, count, out=np.zeros(count.shape), where=count > 0
+                )
+                stencil.append((axis, weight * has_next, weight * has_previous))
+            return stencil
+
+        return self._cached_for(("stencil", mm.util.mesh_key(mesh)), Ms, compute)
+
+    def _velocity(self, mesh):
+        """Spin-drift velocity array with three components."""
+        if isinstance(self.u, ts.Descriptor):
+            msg = "Spin-drift velocity u must be defined."
+            raise ValueError(msg)
+        if (
+            isinstance(self.u, numbers.Real)
+            or (isinstance(self.u, df.Field) and self.u.nvdim == 1)
+            or (
+                isinstance(self.u, dict)
+                and all(isinstance(value, numbers.Real) for value in self.u.values())
+            )
+        ):
+            # Scalar u is the velocity along x.
+            return mm.util.parameter_array(self.u, mesh) * np.array([1.0, 0, 0])
+        return mm.util.parameter_array(self.u, mesh, nvdim=3)
+
+    def _coefficients(self, alpha):
+        """Coefficients of the two cross products.
+
+        Returns :math:`-(\\beta - \\alpha)/(1 + \\alpha^{2})` and
+        :math:`-(1 + \\alpha\\beta)/(1 + \\alpha^{2})`.
+
+        """
+
+        def compute():
+            beta = 0 if isinstance(self.beta, ts.Descriptor) else self.beta
+            denominator = 1 + np.square(alpha)
+            return -(beta - alpha) / denominator, -(1 + alpha * beta) / denominator
+
+        return self._cached_for("coefficients", alpha, compute)
+
+    def _time_factor(self, t):
+        """Time-dependent pre-factor of ``u``."""
+        if not isinstance(self.func, ts.Descriptor):
+            return self.func(t)
+        if not isinstance(self.tcl_strings, ts.Descriptor):
+            msg = "Time dependence defined by tcl_strings cannot be evaluated."
+            raise NotImplementedError(msg)
+        return 1
@@ -1,7 +1,9 @@
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .energyterm import EnergyTerm
 
 
@@ -89,5 +91,46 @@ class CubicAnisotropy(EnergyTerm):
         a3 = r"(\mathbf{m} \cdot \mathbf{u}_{3})^{2}"
         return rf"-K [{a1}{a2}+{a2}{a3}+{a3}{a1}]"
 
-    def effective_field(self, m):
-        raise NotImplementedError
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        c, u = self._parameters(mesh)
+        if out is None:
+            out = np.empty_like(m)
+
+        # Projections a_i = m.u_i and coefficients a_i (a_j**2 + a_k**2).
+        a = self._buffer("a", m.shape)
+        coefficient = self._buffer("coefficient", m.shape)
+        total = self._buffer("total", m.shape[:-1] + (1,))
+        np.einsum("...j,...ij->...i", m, u, out=a)
+        np.multiply(a, a, out=coefficient)
+        np.sum(coefficient, axis=-1, keepdims=True, out=total)
+        np.subtract(total, coefficient, out=coefficient)
+        coefficient *= a
+        coefficient *= c
+        coefficient *= self._inverse_Ms(Ms)
+        return np.einsum("...i,...ij->...j", coefficient, u, out=out)
+
+    def _density(self, m, Ms, mesh, H, t=0, out=None):
+        # The energy density is quartic in m.
+        return self._projection(m, Ms, H, -mm.consts.mu0 / 4, out=out)
+
+    def _parameters(self, mesh):
+        """Coefficient ``2K/mu0`` and the matrix of normalised axes.
+
+        The rows of the matrix are ``u1``, ``u2`` and ``u3 = u1 x u2``.
+
+        """
+
+        def compute():
+            if any(
+                isinstance(value, ts.Descriptor) for value in (self.K, self.u1, self.u2)
+            ):
+                msg = "Anisotropy constant K and axes u1 and u2 must be defined."
+                raise ValueError(msg)
+            c = 2 / mm.consts.mu0 * mm.util.parameter_array(self.K, mesh)
+            u1 = mm.util.normalise(mm.util.parameter_array(self.u1, mesh, nvdim=3))
+            u2 = mm.util.normalise(mm.util.parameter_array(self.u2, mesh, nvdim=3))
+            u1, u2 = np.broadcast_arrays(u1, u2)
+            u3 = mm.util.normalise(np.cross(u1, u2))
+            return c, np.stack([u1, u2, u3], axis=-2)
+
+        return self._cached(("parameters", mm.util.mesh_key(mesh)), compute)
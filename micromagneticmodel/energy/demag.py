@@ -1,5 +1,10 @@
+import functools
+import itertools
+
+import numpy as np
 import ubermagutil as uu
 
+import micromagneticmodel as mm
 from .energyterm import EnergyTerm
 
 
@@ -16,7 +21,24 @@ class Demag(EnergyTerm):
     ----------
     asymptotic_radius : numbers.Real, optional
 
-        Asymptotic radius parameter.
+        Asymptotic radius parameter. The demagnetisation tensor between two
+        cells which are further apart than ``asymptotic_radius`` (measured in
+        units of the cell size) is approximated by the tensor of two point
+        dipoles, except for neighbouring cells. A negative value disables the
+        approximation. Defaults to 32.
+
+    Notes
+    -----
+    The effective field is computed as a zero-padded FFT convolution of
+    magnetisation with the Newell demagnetisation tensor. The Fourier transform
+    of the tensor depends only on the mesh geometry and is reused between
+    calls. In periodic directions, no padding is used and the tensor is summed
+    over ``_pbc_images`` images on each side of the sample.
+
+    Computing the tensor for large meshes is expensive. Setting the class
+    attribute ``Demag.kernel_cache`` to a ``micromagneticmodel.KernelCache``
+    stores the transformed tensor on disk, so that it is shared between
+    processes and reused in later sessions.
 
     Examples
     --------
@@ -33,5 +55,262 @@ class Demag(EnergyTerm):
         r"-\frac{1}{2}\mu_{0}M_\text{s}" r"\mathbf{m} \cdot \mathbf{H}_\text{d}"
     )
 
-    def effective_field(self, m):
-        raise NotImplementedError
+    _pbc_images = 8
+    kernel_cache = None
+
+    def cell_tensor(self, mesh):
+        """Demagnetisation tensor of a single cell of ``mesh``.
+
+        In periodic directions of ``mesh``, the tensor includes the
+        contributions of the periodic images of the cell.
+
+        Parameters
+        ----------
+        mesh : discretisedfield.Mesh
+
+            Mesh whose cell (and periodic boundary conditions) is used.
+
+        Returns
+        -------
+        numpy.ndarray
+
+            Symmetric demagnetisation tensor of shape ``(3, 3)``.
+
+        Examples
+        --------
+        1. Demagnetisation tensor of a cubic cell.
+
+        >>> import discretisedfield as df
+        >>> import numpy as np
+        >>> import micromagneticmodel as mm
+        ...
+        >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9), n=(1, 1, 1))
+        >>> N = mm.Demag().cell_tensor(mesh)
+        >>> np.allclose(N, np.eye(3) / 3)
+        True
+
+        """
+        kernel = _kernel(
+            tuple(mesh.cell),
+            (1, 1, 1),
+            mm.util.periodic(mesh),
+            getattr(self, "asymptotic_radius", 32),
+            self._pbc_images,
+            self.kernel_cache,
+        )
+        # The transform of a single (unpadded) cell is the tensor itself.
+        Nxx, Nyy, Nzz, Nxy, Nxz, Nyz = (float(N.flat[0]) for N in kernel)
+        return np.array([[Nxx, Nxy, Nxz], [Nxy, Nyy, Nyz], [Nxz, Nyz, Nzz]])
+
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        if out is None:
+            out = np.empty_like(m)
+        return np.negative(self._convolution(m, Ms, mesh), out=out)
+
+    def _add_effective_field(self, m, Ms, mesh, out, t=0):
+        out -= self._convolution(m, Ms, mesh)
+        return out
+
+    def _convolution(self, m, Ms, mesh):
+        """Convolution of the magnetisation with the demagnetisation tensor.
+
+        The result is minus the demagnetisation field, as a view with the
+        layout of ``m``.
+
+        """
+        kernel = _kernel(
+            tuple(mesh.cell),
+            tuple(int(n) for n in mesh.n),
+            mm.util.periodic(mesh),
+            getattr(self, "asymptotic_radius", 32),
+            self._pbc_images,
+            self.kernel_cache,
+        )
+        Nxx, Nyy, Nzz, Nxy, Nxz, Nyz = kernel
+        s = _padded_shape(mesh.n, mm.util.periodic(mesh))
+
+        # Components are moved in front of the spatial axes so that all
+        # transforms and products operate on contiguous arrays.
+        M = np.ascontiguousarray(np.moveaxis(m * Ms, -1, -4))
+        Mk = np.fft.rfftn(M, s=s, axes=(-3, -2, -1))
+        Mx, My, Mz = Mk[..., 0, :, :, :], Mk[..., 1, :, :, :], Mk[..., 2, :, :, :]
+        Hk = np.empty_like(Mk)
+        for i, (Ni0, Ni1, Ni2) in enumerate(
+            [(Nxx, Nxy, Nxz), (Nxy, Nyy, Nyz), (Nxz, Nyz, Nzz)]
+        ):
+            Hi = Hk[..., i, :, :, :]
+            np.multiply(Ni0, Mx, out=Hi)
+            Hi += Ni1 * My
+            Hi += Ni2 * Mz
+
+        # Inverse transform one direction at a time, discarding the padding as
+        # early as possible.
+        nx, ny, nz = mesh.n
+        H = np.fft.ifft(Hk, axis=-3)[..., :nx, :, :]
+        H = np.fft.ifft(H, axis=-2)[..., :ny, :]
+        H = np.fft.irfft(H, n=s[2], axis=-1)[..., :nz]
+        return np.moveaxis(H, -4, -1)
+
+
+def _padded_shape(n, periodic):
+    """Shape of the FFT grid; non-periodic directions are zero-padded."""
+    return tuple(
+        int(ni) if pbc or ni == 1 else 2 * int(ni) for ni, pbc in zip(n, periodic)
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _kernel(cell, n, periodic, asymptotic_radius, pbc_images, kernel_cache=None):
+    """Transformed demagnetisation tensor, loaded from ``kernel_cache`` if possible."""
+    key = ("demag", cell, n, periodic, asymptotic_radius, pbc_images)
+    if kernel_cache is not None:
+        kernel = kernel_cache.get(key)
+        if kernel is not None:
+            return kernel
+
+    kernel = _compute_kernel(cell, n, periodic, asymptotic_radius, pbc_images)
+    if kernel_cache is not None:
+        kernel_cache.put(key, kernel)
+    return kernel
+
+
+def _compute_kernel(cell, n, periodic, asymptotic_radius, pbc_images):
+    """Fourier transform of the six independent demagnetisation tensor components.
+
+    The tensor is even under inversion of the displacement, so its Fourier
+    transform is real. Only the real part is stored, with shape ``(6, sx, sy,
+    sz // 2 + 1)``, where ``(sx, sy, sz)`` is the padded shape. The array must
+    not be modified because it is shared between calls.
+
+    """
+    s = _padded_shape(n, periodic)
+
+    # The tensor is computed for non-negative displacements only and then
+    # mirrored, using the parity of each component.
+    displacements = [
+        np.arange(ni // 2 + 1 if pbc else ni) for ni, pbc in zip(n, periodic)
+    ]
+
+    tensor = np.zeros((6, *(len(d) for d in displacements)))
+    images = [range(-pbc_images, pbc_images + 1) if pbc else [0] for pbc in periodic]
+    for image in itertools.product(*images):
+        X, Y, Z = np.meshgrid(
+            *[(d + i * ni) * ci for d, i, ni, ci in zip(displacements, image, n, cell)],
+            indexing="ij",
+        )
+        tensor += _demag_tensor(X, Y, Z, cell, asymptotic_radius)
+
+    indices, signs, valid = [], [], []
+    for d, ni, si, pbc in zip(displacements, n, s, periodic):
+        j = np.arange(si)
+        indices.append(np.minimum(np.minimum(j, si - j), len(d) - 1))
+        signs.append(np.where(j <= si // 2, 1, -1))
+        valid.append(np.where(pbc | (j != ni), 1, 0))
+    ix, iy, iz = np.ix_(*indices)
+    sx, sy, sz = np.ix_(*signs)
+    vx, vy, vz = np.ix_(*valid)
+
+    full = tensor[:, ix, iy, iz]
+    full[3] *= sx * sy  # Nxy is odd in x and y
+    full[4] *= sx * sz  # Nxz is odd in x and z
+    full[5] *= sy * sz  # Nyz is odd in y and z
+    full *= vx * vy * vz
+
+    kernel = np.fft.rfftn(full, axes=(1, 2, 3)).real
+    kernel.flags.writeable = False
+    return kernel
+
+
+def _demag_tensor(X, Y, Z, cell, asymptotic_radius):
+    """Demagnetisation tensor components ``(Nxx, Nyy, Nzz, Nxy, Nxz, Nyz)``."""
+    dx, dy, dz = cell
+    tensor = np.empty((6, *X.shape))
+    if asymptotic_radius < 0:
+        near = np.ones(X.shape, dtype=bool)
+    else:
+        near = (X / dx) ** 2 + (Y / dy) ** 2 + (Z / dz) ** 2 < asymptotic_radius**2
+        # The point dipole tensor is singular for the cell itself and
+        # inaccurate for its neighbours.
+        near |= (np.abs(X / dx) < 1.5) & (np.abs(Y / dy) < 1.5) & (np.abs(Z / dz) < 1.5)
+    if near.any():
+        tensor[:, near] = _newell_tensor(X[near], Y[near], Z[near], cell)
+    far = ~near
+    if far.any():
+        tensor[:, far] = _dipole_tensor(X[far], Y[far], Z[far], cell)
+    return tensor
+
+
+def _newell_tensor(X, Y, Z, cell):
+    """Newell demagnetisation tensor between two cuboid cells."""
+    dx, dy, dz = cell
+    return np.array(
+        [
+            _newell_sum(_newell_f, X, Y, Z, dx, dy, dz),
+            _newell_sum(_newell_f, Y, Z, X, dy, dz, dx),
+            _newell_sum(_newell_f, Z, X, Y, dz, dx, dy),
+            _newell_sum(_newell_g, X, Y, Z, dx, dy, dz),
+            _newell_sum(_newell_g, X, Z, Y, dx, dz, dy),
+            _newell_sum(_newell_g, Y, Z, X, dy, dz, dx),
+        ]
+    )
+
+
+def _dipole_tensor(X, Y, Z, cell):
+    """Demagnetisation tensor of two point dipoles with the cell volume."""
+    r2 = X**2 + Y**2 + Z**2
+    prefactor = np.prod(cell) / (4 * np.pi * r2**2.5)
+    return prefactor * np.array(
+        [
+            r2 - 3 * X * X,
+            r2 - 3 * Y * Y,
+            r2 - 3 * Z * Z,
+            -3 * X * Y,
+            -3 * X * Z,
+            -3 * Y * Z,
+        ]
+    )
+
+
+def _newell_sum(func, X, Y, Z, dx, dy, dz):
+    """Second finite differences of ``func`` in all three directions."""
+    weights = {-1: -1, 0: 2, 1: -1}
+    result = np.zeros_like(X)
+    for a, b, c in itertools.product((-1, 0, 1), repeat=3):
+        weight = weights[a] * weights[b] * weights[c]
+        result += weight * func(X + a * dx, Y + b * dy, Z + c * dz)
+    return result / (4 * np.pi * dx * dy * dz)
+
+
+def _newell_f(x, y, z):
+    x, y, z = np.abs(x), np.abs(y), np.abs(z)
+    x2, y2, z2 = x**2, y**2, z**2
+    R = np.sqrt(x2 + y2 + z2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = (2 * x2 - y2 - z2) * R / 6
+        result += np.where(
+            x2 + z2 > 0, y / 2 * (z2 - x2) * np.arcsinh(y / np.sqrt(x2 + z2)), 0
+        )
+        result += np.where(
+            x2 + y2 > 0, z / 2 * (y2 - x2) * np.arcsinh(z / np.sqrt(x2 + y2)), 0
+        )
+        result -= np.where(x * R > 0, x * y * z * np.arctan(y * z / (x * R)), 0)
+    return result
+
+
+def _newell_g(x, y, z):
+    z = np.abs(z)
+    x2, y2, z2 = x**2, y**2, z**2
+    R = np.sqrt(x2 + y2 + z2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = -x * y * R / 3
+        result += np.where(x2 + y2 > 0, x * y * z * np.arcsinh(z / np.sqrt(x2 + y2)), 0)
+        result += np.where(
+            y2 + z2 > 0, y / 6 * (3 * z2 - y2) * np.arcsinh(x / np.sqrt(y2 + z2)), 0
+        )
+        result += np.where(
+            x2 + z2 > 0, x / 6 * (3 * z2 - x2) * np.arcsinh(y / np.sqrt(x2 + z2)), 0
+        )
+        result -= np.where(z * R > 0, z**3 / 6 * np.arctan(x * y / (z * R)), 0)
+        result -= np.where(y * R != 0, z * y2 / 2 * np.arctan(x * z / (y * R)), 0)
+        result -= np.where(x * R != 0, z * x2 / 2 * np.arctan(y * z / (x * R)), 0)
+    return result
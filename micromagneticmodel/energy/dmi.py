@@ -1,7 +1,9 @@
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .energyterm import EnergyTerm
 
 
@@ -140,5 +142,91 @@ class DMI(EnergyTerm):
                 + r"} \right)"
             )
 
-    def effective_field(self, m):
-        raise NotImplementedError
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        if out is None:
+            out = np.zeros_like(m)
+        else:
+            out[...] = 0
+        return self._add_effective_field(m, Ms, mesh, out, t=t)
+
+    def _add_effective_field(self, m, Ms, mesh, out, t=0):
+        difference = self._buffer("difference", m.shape)
+        work = self._buffer("work", m.shape)
+        for axis, L, forward, backward in self._plan(mesh, Ms):
+            # Central difference weighted with D on the links to both neighbours.
+            mm.util.roll(m, -1, axis, out=work)
+            np.multiply(forward, work, out=difference)
+            mm.util.roll(m, 1, axis, out=work)
+            work *= backward
+            difference -= work
+            np.einsum("ab,...b->...a", L, difference, out=work)
+            out += work
+        return out
+
+    def _plan(self, mesh, Ms):
+        """Derivative-stencil plan of the crystal class.
+
+        The energy density of every crystal class is a sum of Lifshitz
+        invariants :math:`w = D L_{abk} m_{a} \\partial_{k} m_{b}`, where
+        :math:`L` is antisymmetric in :math:`a` and :math:`b`. The energy is
+        discretised on the links between neighbouring cells using the mean of
+        ``D`` in the two cells. Links to missing neighbours (sample boundaries
+        in non-periodic directions) are omitted, which imposes the natural
+        (free-surface) boundary condition of the discrete energy.
+
+        Returns a list with an entry ``(axis, L_k, forward, backward)`` for
+        each direction ``k`` with a non-zero :math:`L_{abk}`. ``forward`` and
+        ``backward`` are the link coefficients
+        :math:`-D/(\\mu_{0}M_\\text{s}\\Delta k)` to the next and the previous
+        neighbour.
+
+        """
+
+        def compute():
+            D = np.broadcast_to(mm.util.parameter_array(self.D, mesh), (*mesh.n, 1))
+            inverse_Ms = self._inverse_Ms(Ms)
+            plan = []
+            L = self._lifshitz_tensor()
+            for k, (axis, dx, periodic) in enumerate(
+                zip(mm.util.spatial_axes, mesh.cell, mm.util.periodic(mesh))
+            ):
+                if not L[..., k].any():
+                    continue
+                forward = -(D + np.roll(D, -1, axis=axis)) / (2 * mm.consts.mu0 * dx)
+                if not periodic:
+                    index = [slice(None)] * forward.ndim
+                    index[axis] = -1
+                    forward[tuple(index)] = 0
+                backward = np.roll(forward, 1, axis=axis) * inverse_Ms
+                plan.append((axis, L[..., k], forward * inverse_Ms, backward))
+            return plan
+
+        return self._cached_for(("plan", mm.util.mesh_key(mesh)), Ms, compute)
+
+    def _lifshitz_tensor(self):
+        """Tensor :math:`L_{abk}` of the crystal class."""
+        L = np.zeros((3, 3, 3))
+        if self.crystalclass in ["T", "O"]:
+            # m . (curl m)
+            for a, k, b in [(0, 1, 2), (1, 2, 0), (2, 0, 1)]:
+                L[a, b, k] = 1
+                L[b, a, k] = -1
+        elif "Cnv" in self.crystalclass:
+            # m . grad(m_d) - m_d div(m)
+            d = "xyz".index(
+                "z" if self.crystalclass == "Cnv" else self.crystalclass[-1]
+            )
+            for k in range(3):
+                L[k, d, k] += 1
+                L[d, k, k] -= 1
+        else:
+            # m . (dm/d(dir1) x dir1 - dm/d(dir2) x dir2)
+            direction = "z" if self.crystalclass == "D2d" else self.crystalclass[-1]
+            dir1, dir2 = {"x": (1, 2), "y": (2, 0), "z": (0, 1)}[direction]
+            epsilon = np.zeros((3, 3, 3))
+            for a, b, c in [(0, 1, 2), (1, 2, 0), (2, 0, 1)]:
+                epsilon[a, b, c] = 1
+                epsilon[b, a, c] = -1
+            L[..., dir1] = epsilon[..., dir1]
+            L[..., dir2] = -epsilon[..., dir2]
+        return L
@@ -1,3 +1,5 @@
+import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 
 import micromagneticmodel as mm
@@ -29,11 +31,411 @@ class Energy(mm.abstract.Container):
 
     _term_class = EnergyTerm
 
-    def energy(self, m):
-        raise NotImplementedError  # can be implemented as (Heff*m).integrate
+    def energy(self, m, t=0, by_term=False, by_region=False):
+        """Total energy of all energy terms.
 
-    def density(self, m):
-        raise NotImplementedError  # can be implemented as Heff*m
+        All terms are evaluated in a single pass, reusing one effective field
+        and one energy density array, so no intermediate
+        ``discretisedfield.Field`` is created.
 
-    def effective_field(self, m):
-        pass  # pragma: no cover
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        by_term : bool, optional
+
+            If ``True``, a dictionary with the energy of each term (with term
+            names as keys) is returned instead of the total energy. Defaults to
+            ``False``.
+
+        by_region : bool, optional
+
+            If ``True``, a dictionary with the energy in each of
+            ``m.mesh.subregions`` (with subregion names as keys) is returned.
+            All subregions are evaluated from the same energy density. If both
+            ``by_term`` and ``by_region`` are ``True``, a dictionary of
+            per-region dictionaries for all terms is returned. Defaults to
+            ``False``.
+
+        Returns
+        -------
+        float, dict
+
+            Energy in J.
+
+        Examples
+        --------
+        1. Energy of a uniformly magnetised sample.
+
+        >>> import discretisedfield as df
+        >>> import micromagneticmodel as mm
+        ...
+        >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(100e-9, 100e-9, 100e-9), n=(5, 5, 5))
+        >>> m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=1e6)
+        >>> energy = mm.Exchange(A=1e-11) + mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1))
+        >>> energy += mm.Zeeman(H=(0, 0, 1e5))
+        >>> energy.energy(m)  # doctest: +ELLIPSIS
+        -2.256...e-16
+        >>> energy.energy(m, by_term=True)  # doctest: +ELLIPSIS
+        {'exchange': 0.0, 'uniaxialanisotropy': -1...e-16, 'zeeman': -1.256...e-16}
+
+        """
+        energies = self._evaluate(m, t=t, by_region=by_region)
+        if by_term:
+            return energies
+        if by_region:
+            return {
+                name: sum((energy[name] for energy in energies.values()), 0.0)
+                for name in sorted(m.mesh.subregions)
+            }
+        return sum(energies.values(), 0.0)
+
+    def density(self, m, t=0):
+        """Total energy density of all energy terms.
+
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        Returns
+        -------
+        discretisedfield.Field
+
+            Energy density in J/m3.
+
+        """
+        w = np.zeros(m.array.shape[:-1] + (1,))
+        self._evaluate(m, t=t, density=w)
+        return df.Field(m.mesh, nvdim=1, value=w, unit="J/m3")
+
+    def _evaluate(self, m, t=0, density=None, by_region=False):
+        """Energies of all terms of magnetisation field ``m``."""
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        return self._energies(
+            m_array, Ms, m.mesh, t=t, density=density, by_region=by_region
+        )
+
+    def _energies(self, m, Ms, mesh, t=0, density=None, by_region=False, field=None):
+        """Energies of all terms, optionally accumulating the density.
+
+        The effective field and the energy density of every term are written
+        into the same work arrays. If ``density`` is passed, the energy
+        densities of all terms are added to it, and if ``field`` is passed, the
+        total effective field is written into it. If ``by_region=True``, the
+        energy of each term is a dictionary of energies in all subregions.
+
+        """
+        H = np.empty_like(m)
+        if field is not None:
+            field[...] = 0
+        w = np.empty(m.shape[:-1] + (1,))
+        energies = {}
+        for term in self:
+            term._effective_field(m, Ms, mesh, t=t, out=H)
+            term._density(m, Ms, mesh, H, t=t, out=w)
+            if by_region:
+                energies[term.name] = {
+                    name: total * mesh.dV
+                    for name, total in mm.util.region_sums(w, mesh).items()
+                }
+            else:
+                energies[term.name] = float(np.sum(w) * mesh.dV)
+            if density is not None:
+                density += w
+            if field is not None:
+                field += H
+        return energies
+
+    def effective_field(self, m, t=0, out=None):
+        """Total effective field of all energy terms.
+
+        The effective fields of all terms are added into a single array. Terms
+        whose kernels support it add to the array directly, and the others use
+        work arrays which are allocated only once, so that repeated evaluations
+        with ``out`` do not allocate per-term arrays.
+
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        out : numpy.ndarray, optional
+
+            Array with the shape of ``m.array`` into which the effective field
+            is written. Defaults to ``None``.
+
+        Returns
+        -------
+        discretisedfield.Field, numpy.ndarray
+
+            Effective field in A/m. If ``out`` is passed, ``out`` is returned.
+
+        Examples
+        --------
+        1. Effective field of exchange and Zeeman energy terms.
+
+        >>> import discretisedfield as df
+        >>> import micromagneticmodel as mm
+        ...
+        >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(10e-9, 10e-9, 10e-9), n=(5, 5, 5))
+        >>> m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+        >>> energy = mm.Exchange(A=1e-11) + mm.Zeeman(H=(0, 0, 1e5))
+        >>> energy.effective_field(m).mean()
+        array([     0.,      0., 100000.])
+
+        """
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        H = self._effective_field(m_array, Ms, m.mesh, t=t, out=out)
+        if out is not None:
+            return out
+        return df.Field(m.mesh, nvdim=3, value=H, vdims=m.vdims, unit="A/m")
+
+    def energy_and_gradient(self, x, m, t=0, scale=1):
+        r"""Energy and its gradient in tangent plane coordinates.
+
+        The magnetisation is parametrised by coordinates :math:`(a, b)` in the
+        tangent plane of the reference magnetisation ``m`` in every cell with
+        non-zero saturation magnetisation. The magnetisation is rotated along
+        the great circle in the direction of :math:`\mathbf{v} =
+        a\mathbf{e}_{1} + b\mathbf{e}_{2}` by the angle :math:`|\mathbf{v}|`,
+
+        .. math::
+
+            \mathbf{m}(a, b) = \mathbf{m}_{0}\cos|\mathbf{v}| +
+            \frac{\mathbf{v}}{|\mathbf{v}|}\sin|\mathbf{v}|,
+
+        so that every magnetisation is reached with :math:`|\mathbf{v}| \le
+        \pi`. Here, ``(e1, e2)`` is the basis returned by
+        ``micromagneticmodel.util.tangent_basis``. The coordinates of all
+        cells are stored in a flat array ``x = [a0, b0, a1, b1, ...]`` of
+        length ``2 * np.count_nonzero(m.norm.array)``, with cells in the order
+        of ``m.array``, and ``x = 0`` is the reference magnetisation. The
+        gradient is computed from the effective field, :math:`\partial
+        E/\partial\mathbf{m} = -\mu_{0}M_\text{s}V\mathbf{H}_\text{eff}`,
+        so no ``discretisedfield.Field`` is created.
+
+        The signature follows ``scipy.optimize``, so that the energy can be
+        minimised with ``scipy.optimize.minimize(energy.energy_and_gradient,
+        x0, args=(m, t, scale), jac=True, hessp=energy.hessp)``. Energies of
+        micromagnetic samples are small in J, and ``scale`` (e.g. the inverse
+        of the initial energy) brings them and their gradients to the order of
+        the default convergence tolerances of ``scipy.optimize``.
+
+        Parameters
+        ----------
+        x : array_like
+
+            Tangent plane coordinates.
+
+        m : discretisedfield.Field
+
+            Reference magnetisation field. Its norm is the saturation
+            magnetisation.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        scale : numbers.Real, optional
+
+            Factor by which the energy and the gradient are multiplied.
+            Defaults to 1.
+
+        Returns
+        -------
+        tuple
+
+            Energy (in J multiplied by ``scale``) and its gradient (an array
+            with the shape of ``x``).
+
+        Raises
+        ------
+        ValueError
+
+            If ``x`` does not have two coordinates for every magnetic cell.
+
+        Examples
+        --------
+        1. Minimising the energy with ``scipy.optimize``.
+
+        >>> import discretisedfield as df
+        >>> import numpy as np
+        >>> import scipy.optimize
+        >>> import micromagneticmodel as mm
+        ...
+        >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(10e-9, 5e-9, 5e-9), n=(2, 1, 1))
+        >>> m = df.Field(mesh, nvdim=3, value=(1, 0, 1), norm=8e5)
+        >>> energy = mm.Exchange(A=1e-11) + mm.Zeeman(H=(0, 0, 1e5))
+        >>> scale = -1 / energy.energy(m)
+        >>> x0 = np.zeros(2 * mesh.n.prod())
+        >>> result = scipy.optimize.minimize(
+        ...     energy.energy_and_gradient, x0, args=(m, 0, scale), jac=True,
+        ...     hessp=energy.hessp, method='Newton-CG')
+        >>> relaxed = energy.tangent_field(result.x, m)
+        >>> np.allclose(relaxed.orientation.array, (0, 0, 1), atol=1e-6)
+        True
+
+        """
+        m_array, Ms, active, tangent = self._tangent_arrays(x, m)
+        reference, e1, e2, angle, direction = tangent
+        H = np.empty_like(m_array)
+        energies = self._energies(m_array, Ms, m.mesh, t=t, field=H)
+        energy = sum(energies.values(), 0.0)
+
+        # Chain rule with the Jacobian of the rotation: the component of the
+        # coordinates along the direction of rotation changes the angle and
+        # the perpendicular component rotates the direction.
+        gradient = -mm.consts.mu0 * m.mesh.dV * Ms[active] * H[active]
+        along = np.einsum("...i,...i->...", gradient, direction)
+        radial = np.cos(angle) * along - np.sin(angle) * np.einsum(
+            "...i,...i->...", gradient, reference
+        )
+        sinc = np.sinc(angle / np.pi)
+        result = np.empty((len(gradient), 2))
+        for i, e in enumerate((e1, e2)):
+            parallel = np.einsum("...i,...i->...", direction, e)
+            component = np.einsum("...i,...i->...", gradient, e)
+            result[:, i] = parallel * radial + sinc * (component - parallel * along)
+        return scale * energy, scale * result.reshape(np.shape(x))
+
+    def gradient(self, x, m, t=0, scale=1):
+        """Gradient of the energy in tangent plane coordinates.
+
+        See ``energy_and_gradient`` for the coordinates and parameters.
+
+        Returns
+        -------
+        numpy.ndarray
+
+            Gradient in J (multiplied by ``scale``) with the shape of ``x``.
+
+        Examples
+        --------
+        1. Gradient at the reference magnetisation.
+
+        >>> import discretisedfield as df
+        >>> import micromagneticmodel as mm
+        ...
+        >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(5e-9, 5e-9, 5e-9), n=(1, 1, 1))
+        >>> m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+        >>> energy = mm.Energy(terms=[mm.Zeeman(H=(1e5, 0, 0))])
+        >>> energy.gradient([0, 0], m, scale=1e20)  # doctest: +ELLIPSIS
+        array([0.        , 1.256...])
+
+        """
+        return self.energy_and_gradient(x, m, t=t, scale=scale)[1]
+
+    def hessp(self, x, p, m, t=0, scale=1):
+        """Product of the energy Hessian in tangent plane coordinates and ``p``.
+
+        The product is approximated with central finite differences of the
+        gradient along ``p``, i.e. two evaluations of the effective field,
+        where the largest coordinate changes by :math:`10^{-6}` rad. The
+        magnetisation is a nonlinear function of the coordinates, so even for
+        energy terms whose effective fields are linear in the magnetisation
+        the relative error is of the order of the square of this step (plus
+        rounding errors), which is sufficient for ``scipy.optimize``. See
+        ``energy_and_gradient`` for the coordinates and the other parameters.
+
+        Parameters
+        ----------
+        p : array_like
+
+            Vector in tangent plane coordinates with the shape of ``x``.
+
+        Returns
+        -------
+        numpy.ndarray
+
+            Hessian-vector product in J (multiplied by ``scale``) with the
+            shape of ``x``.
+
+        """
+        x = np.asarray(x, dtype=float)
+        p = np.asarray(p, dtype=float)
+        size = np.max(np.abs(p), initial=0)
+        if size == 0:
+            return np.zeros_like(x)
+        step = 1e-6 / size
+        forward = self.gradient(x + step * p, m, t=t, scale=scale)
+        backward = self.gradient(x - step * p, m, t=t, scale=scale)
+        return (forward - backward) / (2 * step)
+
+    def tangent_field(self, x, m):
+        """Magnetisation field at tangent plane coordinates ``x``.
+
+        See ``energy_and_gradient`` for the coordinates.
+
+        Parameters
+        ----------
+        x : array_like
+
+            Tangent plane coordinates.
+
+        m : discretisedfield.Field
+
+            Reference magnetisation field.
+
+        Returns
+        -------
+        discretisedfield.Field
+
+            Magnetisation field with the norm of ``m``.
+
+        """
+        m_array, Ms, *_ = self._tangent_arrays(x, m)
+        return mm.util.magnetisation_field(m, m_array, Ms)
+
+    @staticmethod
+    def _tangent_arrays(x, m):
+        """Unit magnetisation and saturation magnetisation arrays at tangent
+        plane coordinates ``x``, magnetic cells, and the reference
+        magnetisation, tangent basis, rotation angles and unit rotation
+        directions (zero for zero angles) of the magnetic cells."""
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        active = Ms[..., 0] > 0
+        size = 2 * np.count_nonzero(active)
+        if np.size(x) != size:
+            msg = f"Cannot use {np.size(x)} coordinates, expected {size}."
+            raise ValueError(msg)
+        reference = m_array[active]
+        e1, e2 = mm.util.tangent_basis(reference)
+        x = np.reshape(np.asarray(x, dtype=float), (-1, 2))
+        direction = x[:, :1] * e1 + x[:, 1:] * e2
+        angle = np.linalg.norm(direction, axis=-1)
+        direction = mm.util.normalise(direction)
+        m_array[active] = (
+            np.cos(angle)[:, None] * reference + np.sin(angle)[:, None] * direction
+        )
+        return m_array, Ms, active, (reference, e1, e2, angle, direction)
+
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        """Total effective field array, see ``EnergyTerm._effective_field``."""
+        if out is None:
+            out = np.zeros_like(m)
+        else:
+            out[...] = 0
+        for term in self:
+            term._add_effective_field(m, Ms, mesh, out, t=t)
+        return out
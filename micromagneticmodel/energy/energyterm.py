@@ -1,5 +1,5 @@
-import abc
-
+import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 
 import micromagneticmodel as mm
@@ -11,12 +11,223 @@ class EnergyTerm(mm.abstract.Term):
 
     _container_class = "Energy"
 
-    def energy(self, m):
-        raise NotImplementedError  # can be implemented as (Heff*m).integrate
+    def energy(self, m, t=0, by_region=False):
+        """Energy of the energy term.
+
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        by_region : bool, optional
+
+            If ``True``, a dictionary with the energy in each of
+            ``m.mesh.subregions`` (with subregion names as keys) is returned.
+            Defaults to ``False``.
+
+        Returns
+        -------
+        float, dict
+
+            Energy in J.
+
+        """
+        w = self._density_array(m, t=t)
+        if by_region:
+            return {
+                name: total * m.mesh.dV
+                for name, total in mm.util.region_sums(w, m.mesh).items()
+            }
+        return float(np.sum(w) * m.mesh.dV)
+
+    def density(self, m, t=0):
+        """Energy density of the energy term.
+
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        Returns
+        -------
+        discretisedfield.Field
+
+            Energy density in J/m3.
+
+        """
+        w = self._density_array(m, t=t)
+        return df.Field(m.mesh, nvdim=1, value=w, unit="J/m3")
+
+    def _density_array(self, m, t=0):
+        """Energy density array of magnetisation field ``m``."""
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        H = self._effective_field(m_array, Ms, m.mesh, t=t)
+        return self._density(m_array, Ms, m.mesh, H, t=t)
+
+    def effective_field(self, m, t=0, out=None, accumulate=False):
+        """Effective field of the energy term.
+
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        t : numbers.Real, optional
+
+            Time in seconds. It is used only by time-dependent terms. Defaults
+            to 0.
+
+        out : numpy.ndarray, optional
+
+            Array with the shape of ``m.array`` into which the effective field
+            is written. Defaults to ``None``.
+
+        accumulate : bool, optional
+
+            If ``True``, the effective field is added to ``out`` instead of
+            overwriting it. Defaults to ``False``.
+
+        Returns
+        -------
+        discretisedfield.Field, numpy.ndarray
+
+            Effective field in A/m. If ``out`` is passed, ``out`` is returned.
+
+        Raises
+        ------
+        NotImplementedError
+
+            If the effective field of the energy term is not implemented.
+
+        ValueError
+
+            If ``accumulate=True`` is passed without ``out``.
+
+        """
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        if accumulate:
+            if out is None:
+                msg = "Cannot accumulate the effective field without out."
+                raise ValueError(msg)
+            return self._add_effective_field(m_array, Ms, m.mesh, out, t=t)
+        H = self._effective_field(m_array, Ms, m.mesh, t=t, out=out)
+        if out is not None:
+            return out
+        return df.Field(m.mesh, nvdim=3, value=H, vdims=m.vdims, unit="A/m")
+
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        """Effective field array.
+
+        Derived classes implement this method to compute the effective field
+        of the term from arrays in ``discretisedfield.Field`` layout.
+
+        Parameters
+        ----------
+        m : numpy.ndarray
+
+            Unit magnetisation of shape ``(..., nx, ny, nz, 3)``. It is zero in
+            cells with zero saturation magnetisation.
+
+        Ms : numpy.ndarray
+
+            Saturation magnetisation of shape ``(nx, ny, nz, 1)``.
+
+        mesh : discretisedfield.Mesh
+
+            Mesh on which ``m`` is defined.
+
+        t : numbers.Real, optional
+
+            Time in seconds. Defaults to 0.
+
+        out : numpy.ndarray, optional
+
+            Array with the same shape as ``m`` into which the effective field
+            is written. Defaults to ``None``.
+
+        Returns
+        -------
+        numpy.ndarray
+
+            Effective field with the same shape as ``m`` (``out`` if passed).
+
+        """
+        raise NotImplementedError
+
+    def _add_effective_field(self, m, Ms, mesh, out, t=0):
+        """Add the effective field array to ``out`` and return ``out``.
+
+        By default, the field is computed into a work array of the term, which
+        is allocated only once. Terms whose kernels naturally accumulate
+        override this method to add to ``out`` directly.
+
+        """
+        H = self._buffer("field", out.shape)
+        self._effective_field(m, Ms, mesh, t=t, out=H)
+        out += H
+        return out
+
+    def _density(self, m, Ms, mesh, H, t=0, out=None):
+        r"""Energy density array computed from the effective field array.
+
+        The default :math:`w = -\frac{1}{2}\mu_{0}M_\text{s}\mathbf{m}
+        \cdot \mathbf{H}` is exact for energy terms quadratic in
+        :math:`\mathbf{m}`. Other terms override this method.
+
+        Parameters
+        ----------
+        m, Ms, mesh, t
+
+            As in ``_effective_field``.
+
+        H : numpy.ndarray
+
+            Effective field of the term computed from ``m``.
+
+        out : numpy.ndarray, optional
+
+            Array of shape ``(..., nx, ny, nz, 1)`` into which the energy
+            density is written. Defaults to ``None``.
+
+        Returns
+        -------
+        numpy.ndarray
+
+            Energy density of shape ``(..., nx, ny, nz, 1)`` (``out`` if
+            passed).
+
+        """
+        return self._projection(m, Ms, H, -mm.consts.mu0 / 2, out=out)
+
+    @staticmethod
+    def _projection(m, Ms, H, factor, out=None):
+        """Array ``factor * Ms * (m . H)`` with the shape of ``Ms``."""
+        if out is None:
+            out = np.empty(m.shape[:-1] + (1,))
+        np.einsum("...i,...i->...", m, H, out=out[..., 0])
+        out *= Ms
+        out *= factor
+        return out
+
+    def _inverse_Ms(self, Ms):
+        """Inverse of the saturation magnetisation, zero where ``Ms`` is zero.
 
-    def density(self, m):
-        raise NotImplementedError  # can be implemented as Heff*m
+        The result for the most recent ``Ms`` array is kept (see
+        ``_cached_for``), so that repeated evaluations with the same values do
+        not recompute it. ``Ms`` must therefore not be modified in place.
 
-    @abc.abstractmethod
-    def effective_field(self, m):
-        pass  # pragma: no cover
+        """
+        return self._cached_for("inverse_Ms", Ms, lambda: mm.util.inverse(Ms))
@@ -1,7 +1,9 @@
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .energyterm import EnergyTerm
 
 
@@ -57,5 +59,73 @@ class Exchange(EnergyTerm):
     _allowed_attributes = ["A"]
     _reprlatex = r"- A \mathbf{m} \cdot \nabla^{2} \mathbf{m}"
 
-    def effective_field(self, m):
-        raise NotImplementedError
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        if out is None:
+            out = np.zeros_like(m)
+        else:
+            out[...] = 0
+        return self._add_effective_field(m, Ms, mesh, out, t=t)
+
+    def _add_effective_field(self, m, Ms, mesh, out, t=0):
+        difference = self._buffer("difference", m.shape)
+        work = self._buffer("work", m.shape)
+        for axis, forward, backward in self._links(mesh, Ms):
+            # Differences to the next cell, weighted with the coupling of each
+            # cell to its next and (after rolling) to its previous neighbour.
+            mm.util.roll(m, -1, axis, out=difference)
+            difference -= m
+            np.multiply(forward, difference, out=work)
+            out += work
+            mm.util.roll(difference, 1, axis, out=work)
+            work *= backward
+            out -= work
+        return out
+
+    def _links(self, mesh, Ms):
+        r"""Coupling coefficients of each cell to its neighbours.
+
+        Returns a list with an entry ``(axis, forward, backward)`` for each
+        direction with more than one cell, where ``forward`` and ``backward``
+        are :math:`2A/(\mu_{0}M_\text{s}\Delta^{2})` for the link to the
+        next and to the previous cell.
+
+        """
+
+        def compute():
+            A = np.broadcast_to(mm.util.parameter_array(self.A, mesh), Ms.shape)
+            inverse_Ms = self._inverse_Ms(Ms)
+            links = []
+            for axis, dx, n, periodic in zip(
+                mm.util.spatial_axes, mesh.cell, mesh.n, mm.util.periodic(mesh)
+            ):
+                if n == 1:
+                    continue
+                coupling = self._coupling(A, Ms, axis, periodic)
+                coupling *= 2 / (mm.consts.mu0 * dx**2)
+                backward = np.roll(coupling, 1, axis=axis) * inverse_Ms
+                links.append((axis, coupling * inverse_Ms, backward))
+            return links
+
+        return self._cached_for(("links", mm.util.mesh_key(mesh)), Ms, compute)
+
+    @staticmethod
+    def _coupling(A, Ms, axis, periodic):
+        """Exchange coupling between each cell and its neighbour along ``axis``.
+
+        The coupling across an interface between two cells is the harmonic mean
+        of their exchange constants. Cells with zero saturation magnetisation
+        and, for non-periodic directions, the missing neighbour of the last cell
+        are not coupled.
+
+        """
+        A = np.where(Ms > 0, A, 0)
+        A_next = np.roll(A, -1, axis=axis)
+        A_sum = A + A_next
+        coupling = np.divide(
+            2 * A * A_next, A_sum, out=np.zeros_like(A_sum), where=A_sum != 0
+        )
+        if not periodic:
+            index = [slice(None)] * coupling.ndim
+            index[axis] = -1
+            coupling[tuple(index)] = 0
+        return coupling
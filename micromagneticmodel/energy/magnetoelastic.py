@@ -1,7 +1,9 @@
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .energyterm import EnergyTerm
 
 
@@ -17,9 +19,16 @@ class MagnetoElastic(EnergyTerm):
 
     .. math::
 
-        w = B_{1}\sum_{i} m_{i}\epsilon_{ii} + B_{2}\sum_{i}\sum_{j\ne i}
+        w = B_{1}\sum_{i} m_{i}^{2}\epsilon_{ii} + B_{2}\sum_{i}\sum_{j\ne i}
         m_{i}m_{j}\epsilon_{ij}
 
+    The effective field is
+
+    .. math::
+
+        H_{i} = -\frac{2}{\mu_{0}M_\text{s}} \left(B_{1}\epsilon_{ii}m_{i} +
+        B_{2}\sum_{j\ne i} \epsilon_{ij}m_{j}\right)
+
     Parameters
     ----------
     B1, B2 : numbers.Real, dict, discretisedfield.Field
@@ -86,9 +95,52 @@ class MagnetoElastic(EnergyTerm):
 
     _allowed_attributes = ["B1", "B2", "e_diag", "e_offdiag"]
     _reprlatex = (
-        r"B_{1}\sum_{i} m_{i}\epsilon_{ii} + "
+        r"B_{1}\sum_{i} m_{i}^{2}\epsilon_{ii} + "
         r"B_{2}\sum_{i}\sum_{j\ne i} m_{i}m_{j}\epsilon_{ij}"
     )
 
-    def effective_field(self, m):
-        raise NotImplementedError
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        diagonal, offdiagonal1, offdiagonal2 = self._coefficients(mesh)
+        if out is None:
+            out = np.empty_like(m)
+
+        # Off-diagonal strain couples each component to the two others.
+        work = self._buffer("work", m.shape)
+        np.multiply(diagonal, m, out=out)
+        mm.util.roll(m, -1, axis=-1, out=work)  # m[..., [1, 2, 0]]
+        work *= offdiagonal1
+        out += work
+        mm.util.roll(m, 1, axis=-1, out=work)  # m[..., [2, 0, 1]]
+        work *= offdiagonal2
+        out += work
+        out *= self._inverse_Ms(Ms)
+        return out
+
+    def _coefficients(self, mesh):
+        """Coupling coefficients of the effective field.
+
+        ``diagonal`` is :math:`-2B_{1}\\epsilon_{ii}/\\mu_{0}` and the two
+        off-diagonal arrays are :math:`-2B_{2}\\epsilon_{ij}/\\mu_{0}` for
+        :math:`j = i + 1` and :math:`j = i + 2` (modulo 3).
+
+        """
+
+        def compute():
+            if any(
+                isinstance(getattr(self, attr), ts.Descriptor)
+                for attr in self._allowed_attributes
+            ):
+                msg = "Parameters B1, B2, e_diag, and e_offdiag must be defined."
+                raise ValueError(msg)
+            c1 = -2 / mm.consts.mu0 * mm.util.parameter_array(self.B1, mesh)
+            c2 = -2 / mm.consts.mu0 * mm.util.parameter_array(self.B2, mesh)
+            e_diag = mm.util.parameter_array(self.e_diag, mesh, nvdim=3)
+            e_offdiag = mm.util.parameter_array(self.e_offdiag, mesh, nvdim=3)
+            # e_offdiag[k] is the strain between the two components other than k.
+            return (
+                c1 * e_diag,
+                c2 * e_offdiag[..., [2, 0, 1]],
+                c2 * e_offdiag[..., [1, 2, 0]],
+            )
+
+        return self._cached(("coefficients", mm.util.mesh_key(mesh)), compute)
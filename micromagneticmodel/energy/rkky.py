@@ -1,6 +1,8 @@
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .energyterm import EnergyTerm
 
 
@@ -11,7 +13,7 @@ from .energyterm import EnergyTerm
     subregions=ts.Typed(expected_type=(list, tuple, set)),
 )
 class RKKY(EnergyTerm):
-    """RKKY energy term.
+    r"""RKKY energy term.
 
     This class defines RKKY interaction between two closest (mutually facing)
     surfaces of subregions defined by passing ``subregions`` list.
@@ -31,6 +33,27 @@ class RKKY(EnergyTerm):
         Length-2 list of strings, which are the names of two interacting
         regions.
 
+    Notes
+    -----
+    The two subregions must be separated along exactly one direction. Each
+    cell of the facing surface layer of one subregion is coupled to the cell
+    of the other surface layer at the same lateral position with the surface
+    energy density
+
+    .. math::
+
+        w = -\sigma \mathbf{m}_{1} \cdot \mathbf{m}_{2} - \sigma_{2}
+        (\mathbf{m}_{1} \cdot \mathbf{m}_{2})^{2},
+
+    so that the effective field in the first cell is
+
+    .. math::
+
+        \mathbf{H}_{1} = \frac{\sigma + 2\sigma_{2} \mathbf{m}_{1} \cdot
+        \mathbf{m}_{2}}{\mu_{0} M_\text{s} \Delta} \mathbf{m}_{2},
+
+    where :math:`\Delta` is the cell size along the separation direction.
+
     Examples
     --------
     1. Defining the RKKY energy term between two subregions.
@@ -54,5 +77,107 @@ class RKKY(EnergyTerm):
     def _reprlatex(self):
         return r"\text{{RKKY}}" r"(\text{{{}}}, \text{{{}}})".format(*self.subregions)
 
-    def effective_field(self, m):
-        raise NotImplementedError
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        if out is None:
+            out = np.zeros_like(m)
+        else:
+            out[...] = 0
+        return self._add_effective_field(m, Ms, mesh, out, t=t)
+
+    def _add_effective_field(self, m, Ms, mesh, out, t=0):
+        index1, index2, thickness = self._pairs(mesh)
+        sigma = 0 if isinstance(self.sigma, ts.Descriptor) else self.sigma
+        sigma2 = 0 if isinstance(self.sigma2, ts.Descriptor) else self.sigma2
+        invMs = self._inverse_Ms(Ms)
+
+        m1 = m[(..., *index1, slice(None))]
+        m2 = m[(..., *index2, slice(None))]
+        coefficient = np.einsum("...i,...i->...", m1, m2)[..., np.newaxis]
+        coefficient *= 2 * sigma2
+        coefficient += sigma
+        coefficient /= mm.consts.mu0 * thickness
+        out[(..., *index1, slice(None))] += coefficient * m2 * invMs[(*index1,)]
+        out[(..., *index2, slice(None))] += coefficient * m1 * invMs[(*index2,)]
+        return out
+
+    def _density(self, m, Ms, mesh, H, t=0, out=None):
+        index1, index2, thickness = self._pairs(mesh)
+        sigma = 0 if isinstance(self.sigma, ts.Descriptor) else self.sigma
+        sigma2 = 0 if isinstance(self.sigma2, ts.Descriptor) else self.sigma2
+        if out is None:
+            out = np.zeros(m.shape[:-1] + (1,))
+        else:
+            out[...] = 0
+
+        # The surface energy of each pair is shared equally by its two cells.
+        dot = np.einsum(
+            "...i,...i->...",
+            m[(..., *index1, slice(None))],
+            m[(..., *index2, slice(None))],
+        )[..., np.newaxis]
+        w = -(sigma + sigma2 * dot) * dot / (2 * thickness)
+        out[(..., *index1, slice(None))] = w
+        out[(..., *index2, slice(None))] = w
+        return out
+
+    def _pairs(self, mesh):
+        """Indices of the mutually facing cells of the two subregions.
+
+        Returns a tuple ``(index1, index2, thickness)``, where ``index1`` and
+        ``index2`` are tuples of three integer arrays with the indices of the
+        paired cells of the first and the second subregion, and ``thickness``
+        is the cell size along the direction separating them.
+
+        Raises
+        ------
+        ValueError
+
+            If the subregions are not defined in the mesh or if they are not
+            separated along exactly one direction.
+
+        """
+
+        def compute():
+            subregions = list(self.subregions)
+            if len(subregions) != 2 or not all(
+                name in mesh.subregions for name in subregions
+            ):
+                msg = f"Cannot find two {subregions=} in {mesh.subregions=}."
+                raise ValueError(msg)
+            slices = [mesh.region2slices(mesh.subregions[name]) for name in subregions]
+
+            separated = [
+                axis
+                for axis, (s1, s2) in enumerate(zip(*slices))
+                if s1.stop <= s2.start or s2.stop <= s1.start
+            ]
+            if len(separated) != 1:
+                msg = f"Subregions {subregions} do not have mutually facing surfaces."
+                raise ValueError(msg)
+            (axis,) = separated
+
+            lateral = []
+            for s1, s2 in zip(*slices):
+                lateral.append(
+                    np.arange(max(s1.start, s2.start), min(s1.stop, s2.stop))
+                )
+            s1, s2 = slices[0][axis], slices[1][axis]
+            layers = (
+                (s1.stop - 1, s2.start)
+                if s1.stop <= s2.start
+                else (s1.start, s2.stop - 1)
+            )
+
+            indices = []
+            for layer in layers:
+                lateral[axis] = np.array([layer])
+                grid = np.meshgrid(*lateral, indexing="ij")
+                indices.append(tuple(i.ravel() for i in grid))
+            if indices[0][0].size == 0:
+                msg = f"Subregions {subregions} do not have mutually facing surfaces."
+                raise ValueError(msg)
+
+            return indices[0], indices[1], mesh.cell[axis]
+
+        key = ("pairs", tuple(self.subregions), mm.util.mesh_key(mesh))
+        return self._cached(key, compute)
@@ -1,7 +1,9 @@
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .energyterm import EnergyTerm
 
 
@@ -90,5 +92,56 @@ class UniaxialAnisotropy(EnergyTerm):
         else:
             return r"-K (\mathbf{m} \cdot \mathbf{u})^{2}"
 
-    def effective_field(self, m):
-        raise NotImplementedError
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        c1, c2, u = self._parameters(mesh)
+        if out is None:
+            out = np.empty_like(m)
+
+        mu = self._buffer("mu", m.shape[:-1] + (1,))
+        np.einsum("...i,...i->...", m, u, out=mu[..., 0])
+        if c2 is None:
+            mu *= c1
+        else:
+            coefficient = self._buffer("coefficient", mu.shape)
+            np.multiply(mu, mu, out=coefficient)
+            coefficient *= c2
+            coefficient += c1
+            mu *= coefficient
+        mu *= self._inverse_Ms(Ms)
+        return np.multiply(mu, u, out=out)
+
+    def _density(self, m, Ms, mesh, H, t=0, out=None):
+        c1, c2, u = self._parameters(mesh)
+        if out is None:
+            out = np.empty(m.shape[:-1] + (1,))
+
+        # w = -mu0/2 (c1 (m.u)**2 + c2/2 (m.u)**4)
+        mu = self._buffer("mu", out.shape)
+        np.einsum("...i,...i->...", m, u, out=mu[..., 0])
+        mu *= mu
+        if c2 is None:
+            np.multiply(c1, mu, out=out)
+        else:
+            np.multiply(c2 / 2, mu, out=out)
+            out += c1
+            out *= mu
+        out *= -mm.consts.mu0 / 2
+        return out
+
+    def _parameters(self, mesh):
+        """Coefficients ``2K1/mu0`` and ``4K2/mu0`` and the normalised axis."""
+
+        def compute():
+            K1 = self.K if isinstance(self.K1, ts.Descriptor) else self.K1
+            if isinstance(K1, ts.Descriptor) or isinstance(self.u, ts.Descriptor):
+                msg = "Anisotropy constant K (or K1) and axis u must be defined."
+                raise ValueError(msg)
+            c1 = 2 / mm.consts.mu0 * mm.util.parameter_array(K1, mesh)
+            if isinstance(self.K2, ts.Descriptor):
+                c2 = None
+            else:
+                c2 = 4 / mm.consts.mu0 * mm.util.parameter_array(self.K2, mesh)
+            u = mm.util.normalise(mm.util.parameter_array(self.u, mesh, nvdim=3))
+            return c1, c2, u
+
+        return self._cached(("parameters", mm.util.mesh_key(mesh)), compute)
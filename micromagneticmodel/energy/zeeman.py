@@ -1,9 +1,11 @@
 import collections
 
 import discretisedfield as df
+import numpy as np
 import ubermagutil as uu
 import ubermagutil.typesystem as ts
 
+import micromagneticmodel as mm
 from .energyterm import EnergyTerm
 
 
@@ -204,5 +206,138 @@ class Zeeman(EnergyTerm):
         else:
             return r"-\mu_{0}M_\text{s} \mathbf{m} \cdot \mathbf{H}"
 
-    def effective_field(self, m):
-        raise NotImplementedError
+    def effective_field(self, m, t=0, out=None, accumulate=False):
+        """Effective field of the energy term.
+
+        Parameters
+        ----------
+        m : discretisedfield.Field
+
+            Magnetisation field. Its norm is the saturation magnetisation.
+
+        t : numbers.Real, array_like, optional
+
+            Time in seconds. If a 1-D array of times is passed, the fields at
+            all times are computed at once. Defaults to 0.
+
+        out : numpy.ndarray, optional
+
+            Array into which the effective field is written. Its shape is
+            ``m.array.shape``, or ``(len(t), *m.array.shape)`` for an array of
+            times. Defaults to ``None``.
+
+        accumulate : bool, optional
+
+            If ``True``, the effective field is added to ``out`` instead of
+            overwriting it. Defaults to ``False``.
+
+        Returns
+        -------
+        discretisedfield.Field, numpy.ndarray
+
+            Effective field in A/m. For an array of times, an array of shape
+            ``(len(t), nx, ny, nz, 3)`` is returned. If ``out`` is passed,
+            ``out`` is returned.
+
+        Raises
+        ------
+        NotImplementedError
+
+            If the time dependence is defined using ``tcl_strings``.
+
+        ValueError
+
+            If ``accumulate=True`` is passed without ``out``.
+
+        Examples
+        --------
+        1. Field of a sine wave at several times.
+
+        >>> import discretisedfield as df
+        >>> import micromagneticmodel as mm
+        ...
+        >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        >>> m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+        >>> zeeman = mm.Zeeman(H=(0, 0, 1e6), func='sin', f=1e9, t0=0)
+        >>> Heff = zeeman.effective_field(m, t=[0, 0.25e-9, 0.75e-9])
+        >>> Heff.shape
+        (3, 2, 1, 1, 3)
+        >>> Heff[:, 0, 0, 0, 2].round()
+        array([       0.,  1000000., -1000000.])
+
+        """
+        if np.ndim(t) == 0:
+            return super().effective_field(m, t=t, out=out, accumulate=accumulate)
+
+        if accumulate and out is None:
+            msg = "Cannot accumulate the effective field without out."
+            raise ValueError(msg)
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        if accumulate:
+            return self._add_effective_field(m_array, Ms, m.mesh, out, t=t)
+        return self._effective_field(m_array, Ms, m.mesh, t=t, out=out)
+
+    def _effective_field(self, m, Ms, mesh, t=0, out=None):
+        # The field can be cached or broadcast along the spatial and time axes,
+        # so it is always copied into a new writable array.
+        if out is None:
+            out = np.empty(np.shape(t) + m.shape)
+        out[...] = self._field(m, mesh, t)
+        return out
+
+    def _add_effective_field(self, m, Ms, mesh, out, t=0):
+        out += self._field(m, mesh, t)
+        return out
+
+    def _field(self, m, mesh, t):
+        """Applied field at times ``t``, broadcastable to ``t.shape + m.shape``."""
+        H = self._cached(
+            ("H", mm.util.mesh_key(mesh)),
+            lambda: mm.util.parameter_array(self.H, mesh, nvdim=3),
+        )
+        t = np.asarray(t, dtype=float)
+        factor = self._time_factor(t)
+        if factor is None:
+            return H
+
+        # Time axes are placed in front of the (batch and) spatial axes of m.
+        expand = (np.newaxis,) * (m.ndim - 1)
+        if factor.ndim == t.ndim:
+            return factor[(..., *expand, np.newaxis)] * H
+        H = np.matmul(factor[(..., *expand, slice(None), slice(None))], H[..., None])
+        return H[..., 0]
+
+    def _density(self, m, Ms, mesh, H, t=0, out=None):
+        return self._projection(m, Ms, H, -mm.consts.mu0, out=out)
+
+    def _time_factor(self, t):
+        """Time-dependent pre-factor of ``H``.
+
+        Returns an array of shape ``t.shape`` for scalar pre-factors or
+        ``t.shape + (3, 3)`` if ``func`` returns a matrix, and ``None`` if the
+        field does not depend on time.
+
+        """
+        func = self.wave if isinstance(self.func, ts.Descriptor) else self.func
+        if isinstance(func, ts.Descriptor):
+            if not isinstance(self.tcl_strings, ts.Descriptor):
+                msg = "Time dependence defined by tcl_strings cannot be evaluated."
+                raise NotImplementedError(msg)
+            return None
+
+        if func in ["sin", "sinc"]:
+            if isinstance(self.f, ts.Descriptor):
+                msg = f"Frequency f is required for {func=}."
+                raise ValueError(msg)
+            t0 = 0 if isinstance(self.t0, ts.Descriptor) else self.t0
+            if func == "sin":
+                return np.sin(2 * np.pi * self.f * (t - t0))
+            else:
+                return np.sinc(2 * self.f * (t - t0))  # sin(pi x) / (pi x)
+
+        # A user-defined function is sampled once for every unique time.
+        times, inverse = np.unique(t, return_inverse=True)
+        values = np.array([func(time) for time in times], dtype=float)
+        if values.ndim > 1:
+            values = values.reshape(-1, 3, 3)
+        return values[inverse.reshape(-1)].reshape(t.shape + values.shape[1:])
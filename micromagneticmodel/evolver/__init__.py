@@ -0,0 +1,4 @@
+from .bdf import BDFEvolver as BDFEvolver
+from .evolver import Evolver as Evolver
+from .rungekutta import RungeKuttaEvolver as RungeKuttaEvolver
+from .stochasticheun import StochasticHeunEvolver as StochasticHeunEvolver
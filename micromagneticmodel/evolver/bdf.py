@@ -0,0 +1,396 @@
+import numpy as np
+import scipy.sparse.linalg
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+import micromagneticmodel as mm
+from .evolver import Evolver
+
+
+@uu.inherit_docs
+@ts.typesystem(
+    tolerance=ts.Scalar(positive=True),
+    initial_timestep=ts.Scalar(positive=True),
+    min_timestep=ts.Scalar(positive=True),
+    max_timestep=ts.Scalar(positive=True),
+    max_order=ts.Scalar(expected_type=int, positive=True),
+)
+class BDFEvolver(Evolver):
+    r"""Implicit variable-order backward differentiation formula evolver.
+
+    The dynamics equation is integrated with the variable-order (1 to 5),
+    variable-step numerical differentiation formulas (a variant of the
+    backward differentiation formulas with better stability) in the
+    quasi-constant step size implementation of ``scipy.integrate.BDF``. The
+    method is implicit and remains stable for time steps far beyond the
+    stability limit of explicit methods, which makes it suitable for stiff
+    problems, e.g. exchange-dominated systems with small cells.
+
+    The nonlinear system of every step is solved with the Jacobian-free
+    Newton-Krylov method: the linear systems of the Newton iterations are
+    solved with GMRES (``scipy.sparse.linalg.gmres``), where products of the
+    Jacobian of the dynamics equation with vectors are approximated by finite
+    differences of the time derivative computed from ``system.energy`` and
+    ``system.dynamics``. GMRES is preconditioned with the inverse of the
+    cell-diagonal blocks of the linearised exchange contribution to the
+    Landau-Lifshitz-Gilbert equation, which captures the stiffest local part
+    of the Jacobian at the cost of one :math:`3 \times 3` inversion per cell.
+
+    The time step and order are chosen so that the local error estimate of
+    the unit magnetisation, i.e. the maximum over all cells of the Euclidean
+    norm :math:`|\Delta\mathbf{m}|`, does not exceed ``tolerance``. The
+    magnetisation is renormalised after every step, and the first difference
+    of the solution history is corrected accordingly. Steps are not shortened
+    to end at the sampling times of ``evolve``, where the magnetisation is
+    interpolated with the polynomial of the current step instead, so that
+    dense sampling does not affect the step size and order.
+
+    Parameters
+    ----------
+    tolerance : numbers.Real, optional
+
+        Maximum local error of the unit magnetisation per step. Defaults to
+        ``1e-5``.
+
+    initial_timestep : numbers.Real, optional
+
+        Initial time step in seconds. If not set, the initial time step is
+        chosen so that the magnetisation rotates by at most 0.01 rad.
+
+    min_timestep : numbers.Real, optional
+
+        Minimum time step in seconds. Steps with this time step are accepted
+        even if the error estimate exceeds ``tolerance``. Defaults to
+        ``1e-18``.
+
+    max_timestep : numbers.Real, optional
+
+        Maximum time step in seconds. Defaults to ``1e-10``.
+
+    max_order : int, optional
+
+        Maximum order of the formulas, at most 5. Defaults to 5.
+
+    Examples
+    --------
+    1. Evolving the magnetisation.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> evolver = mm.BDFEvolver(tolerance=1e-6)
+    >>> evolver
+    BDFEvolver(tolerance=1e-06)
+    >>> system = mm.examples.macrospin()
+    >>> evolver.evolve(system, t=1e-10) > 0
+    True
+    >>> float(system.m.orientation.mean()[2]) > 0.9
+    True
+
+    """
+
+    _allowed_attributes = [
+        "tolerance",
+        "initial_timestep",
+        "min_timestep",
+        "max_timestep",
+        "max_order",
+    ]
+    _defaults = {
+        "tolerance": 1e-5,
+        "min_timestep": 1e-18,
+        "max_timestep": 1e-10,
+        "max_order": 5,
+    }
+
+    # Coefficients of the numerical differentiation formulas of orders 0 to 5
+    # (Shampine and Reichelt, SIAM J. Sci. Comput. 18, 1 (1997)): kappa, the
+    # harmonic numbers gamma, the leading coefficients alpha, and the error
+    # constants.
+    _kappa = np.array([0, -0.1850, -1 / 9, -0.0823, -0.0415, 0])
+    _gamma = np.concatenate(([0], np.cumsum(1 / np.arange(1, 6))))
+    _alpha = (1 - _kappa) * _gamma
+    _error_constants = _kappa * _gamma + 1 / np.arange(1, 7)
+
+    _newton_iterations = 4
+    _krylov_tolerance = 1e-2
+    _krylov_restart = 20
+    _krylov_cycles = 5
+
+    def _evolve(self, system, m, Ms, times, callback=None):
+        tolerance = self._setting("tolerance")
+        min_timestep = self._setting("min_timestep")
+        max_timestep = self._setting("max_timestep")
+        max_order = self._setting("max_order")
+        if max_order > 5:
+            msg = f"Cannot use {max_order=}, the maximum order is 5."
+            raise ValueError(msg)
+
+        rhs = self._rhs(system, Ms, np.empty_like(m))
+        preconditioner = self._preconditioner(system, Ms)
+
+        def limit(h):
+            return min(max(h, min_timestep), max_timestep)
+
+        # Modified divided differences of the solution, D[0] is the solution.
+        D = np.zeros((max_order + 3,) + m.shape)
+        D[0] = m
+        t = 0.0
+        rhs(t, m, out=D[1])
+        h = self._setting("initial_timestep")
+        if h is None:
+            rate = np.max(np.linalg.norm(D[1], axis=-1), initial=0)
+            h = 0.01 / rate if rate > 0 else max_timestep
+        h = limit(h)
+        D[1] *= h
+
+        order = 1
+        equal_steps = 0
+        steps = 0
+        sample = np.empty_like(m)
+        correction = np.empty_like(m)
+        i = 0
+        while t < times[-1]:
+            # Only the last step is shortened to end at the final time, the
+            # magnetisation at earlier sampling times is interpolated.
+            if t + h >= times[-1]:
+                self._rescale(D, order, (times[-1] - t) / h)
+                h = times[-1] - t
+                equal_steps = 0
+
+            while True:
+                predict = np.sum(D[: order + 1], axis=0)
+                psi = np.tensordot(self._gamma[1 : order + 1], D[1 : order + 1], axes=1)
+                psi /= self._alpha[order]
+                c = h / self._alpha[order]
+                converged, iterations, d = self._newton(
+                    rhs, t + h, predict, c, psi, preconditioner, tolerance
+                )
+                if not converged:
+                    if h <= min_timestep:
+                        msg = f"Newton iteration did not converge at {t=}."
+                        raise RuntimeError(msg)
+                    factor = limit(0.5 * h) / h
+                else:
+                    safety = 0.9 * (2 * self._newton_iterations + 1)
+                    safety /= 2 * self._newton_iterations + iterations
+                    error = self._norm(self._error_constants[order] * d)
+                    error /= tolerance
+                    if error <= 1 or h <= min_timestep:
+                        break
+                    factor = max(0.2, safety * error ** (-1 / (order + 1)))
+                    factor = limit(factor * h) / h
+                self._rescale(D, order, factor)
+                h *= factor
+                equal_steps = 0
+
+            t = times[-1] if t + h >= times[-1] else t + h
+            steps += 1
+            equal_steps += 1
+            D[order + 2] = d - D[order + 1]
+            D[order + 1] = d
+            for j in reversed(range(order + 1)):
+                D[j] += D[j + 1]
+            self._renormalise_differences(D, correction)
+
+            while i < len(times) and times[i] <= t:
+                if callback is not None:
+                    if times[i] < t:
+                        self._interpolate(D, order, t, h, times[i], out=sample)
+                        self._renormalise(sample)
+                        callback(i, times[i], sample, Ms)
+                    else:
+                        callback(i, t, D[0], Ms)
+                i += 1
+
+            # Change the order and the step size after order + 1 steps with
+            # the same step size.
+            if equal_steps > order:
+                errors = np.full(3, np.inf)
+                if order > 1:
+                    errors[0] = self._norm(self._error_constants[order - 1] * D[order])
+                errors[1] = error * tolerance
+                if order < max_order:
+                    errors[2] = self._norm(
+                        self._error_constants[order + 1] * D[order + 2]
+                    )
+                with np.errstate(divide="ignore"):
+                    factors = (errors / tolerance) ** (-1 / np.arange(order, order + 3))
+                order += int(np.argmax(factors)) - 1
+                factor = min(10.0, safety * np.max(factors))
+                factor = limit(factor * h) / h
+                self._rescale(D, order, factor)
+                h *= factor
+                equal_steps = 0
+
+        if callback is not None:
+            for j in range(i, len(times)):
+                callback(j, t, D[0], Ms)
+
+        m[...] = D[0]
+        return steps
+
+    def _newton(self, rhs, t, predict, c, psi, preconditioner, tolerance):
+        """Solve the implicit equation of one step with Newton-Krylov.
+
+        Returns whether the iteration converged, the number of iterations, and
+        the difference ``d`` between the solution and ``predict``.
+
+        """
+        y = predict.copy()
+        d = np.zeros_like(y)
+        f = np.empty_like(y)
+        shifted = np.empty_like(y)
+        f_shifted = np.empty_like(y)
+        size = y.size
+        epsilon = np.sqrt(np.finfo(float).eps)
+        newton_tolerance = min(0.03, np.sqrt(tolerance))
+
+        def jacobian_product(v):
+            """(I - c J) v with J v approximated by finite differences."""
+            v = v.reshape(y.shape)
+            norm = np.linalg.norm(v)
+            if norm == 0:
+                return np.zeros(size)
+            step = epsilon * (1 + np.linalg.norm(y)) / norm
+            np.multiply(v, step, out=shifted)
+            np.add(shifted, y, out=shifted)
+            rhs(t, shifted, out=f_shifted)
+            np.subtract(f_shifted, f, out=f_shifted)
+            return (v - (c / step) * f_shifted).ravel()
+
+        operator = scipy.sparse.linalg.LinearOperator(
+            (size, size), matvec=jacobian_product, dtype=float
+        )
+        M = preconditioner(c, y)
+
+        converged = False
+        norm_old = None
+        for iteration in range(self._newton_iterations):
+            rhs(t, y, out=f)
+            if not np.all(np.isfinite(f)):
+                break
+            b = c * f - psi - d
+            dy, _ = scipy.sparse.linalg.gmres(
+                operator,
+                b.ravel(),
+                rtol=self._krylov_tolerance,
+                restart=self._krylov_restart,
+                maxiter=self._krylov_cycles,
+                M=M,
+            )
+            dy = dy.reshape(y.shape)
+            norm = self._norm(dy) / tolerance
+            rate = None if norm_old is None else norm / norm_old
+            remaining = self._newton_iterations - iteration
+            if rate is not None and (
+                rate >= 1 or rate**remaining / (1 - rate) * norm > newton_tolerance
+            ):
+                break
+            y += dy
+            d += dy
+            if norm == 0 or (
+                rate is not None and rate / (1 - rate) * norm < newton_tolerance
+            ):
+                converged = True
+                break
+            norm_old = norm
+        return converged, iteration + 1, d
+
+    @staticmethod
+    def _preconditioner(system, Ms):
+        r"""Exchange-only block-diagonal preconditioner.
+
+        The diagonal block of the Jacobian of the Landau-Lifshitz-Gilbert
+        equation with only the exchange field is :math:`\gamma s
+        ([\mathbf{m}]_{\times} + \alpha(\mathbf{m}\mathbf{m}^{T} - I))`, where
+        :math:`\gamma = \gamma_{0}/(1 + \alpha^{2})`, :math:`s` is the sum of
+        the exchange couplings of the cell to its neighbours, and
+        :math:`[\mathbf{m}]_{\times}` the cross product matrix. Returns a
+        function ``preconditioner(c, m)``, which returns the inverse of
+        :math:`I - c` times the blocks as a linear operator (or ``None``
+        without exchange or precession).
+
+        """
+        mesh = system.m.mesh
+        dynamics = system.dynamics
+        precession = next(iter(dynamics.get(type=mm.Precession)), None)
+        damping = next(iter(dynamics.get(type=mm.Damping)), None)
+        s = np.zeros_like(Ms)
+        for term in system.energy.get(type=mm.Exchange):
+            for _, forward, backward in term._links(mesh, Ms):
+                s += forward
+                s += backward
+        if precession is None or not np.any(s):
+            return lambda c, m: None
+
+        alpha = 0 if damping is None else damping._alpha(mesh)
+        gamma = precession._gamma0(mesh) / (1 + np.square(alpha))
+        rate = (gamma * s)[..., 0]
+        alpha = np.broadcast_to(alpha, Ms.shape)[..., 0]
+        identity = np.eye(3)
+
+        def preconditioner(c, m):
+            k = c * rate
+            blocks = (1 + k * alpha)[..., None, None] * identity
+            blocks -= (k * alpha)[..., None, None] * m[..., :, None] * m[..., None, :]
+            blocks[..., 0, 1] += k * m[..., 2]
+            blocks[..., 0, 2] -= k * m[..., 1]
+            blocks[..., 1, 0] -= k * m[..., 2]
+            blocks[..., 1, 2] += k * m[..., 0]
+            blocks[..., 2, 0] += k * m[..., 1]
+            blocks[..., 2, 1] -= k * m[..., 0]
+            inverse = np.linalg.inv(blocks)
+
+            def apply(v):
+                v = v.reshape(m.shape)
+                return np.einsum("...ij,...j->...i", inverse, v).ravel()
+
+            return scipy.sparse.linalg.LinearOperator(
+                (m.size, m.size), matvec=apply, dtype=float
+            )
+
+        return preconditioner
+
+    @staticmethod
+    def _interpolate(D, order, t, h, t_sample, out):
+        """Solution at ``t_sample`` within the last step from ``t - h`` to
+        ``t``, interpolated with the polynomial defined by the differences
+        ``D``."""
+        x = (t_sample - (t - h * np.arange(order))) / (h * np.arange(1, order + 1))
+        out[...] = D[0]
+        out += np.tensordot(np.cumprod(x), D[1 : order + 1], axes=1)
+        return out
+
+    @staticmethod
+    def _renormalise_differences(D, correction):
+        """Renormalise the solution ``D[0]`` in place and correct the first
+        difference ``D[1]``, so that the previous solution ``D[0] - D[1]`` is
+        not changed. ``correction`` is a work array."""
+        correction[...] = D[0]
+        Evolver._renormalise(correction)
+        correction -= D[0]
+        D[0] += correction
+        D[1] += correction
+
+    @staticmethod
+    def _rescale(D, order, factor):
+        """Change the differences ``D`` in place for the step size changed by
+        ``factor``."""
+        R = BDFEvolver._step_matrix(order, factor)
+        U = BDFEvolver._step_matrix(order, 1)
+        D[: order + 1] = np.tensordot((R @ U).T, D[: order + 1], axes=1)
+
+    @staticmethod
+    def _step_matrix(order, factor):
+        """Matrix transforming the differences for a step size change."""
+        i = np.arange(1, order + 1)[:, None]
+        j = np.arange(1, order + 1)
+        M = np.zeros((order + 1, order + 1))
+        M[1:, 1:] = (i - 1 - factor * j) / i
+        M[0] = 1
+        return np.cumprod(M, axis=0)
+
+    @staticmethod
+    def _norm(a):
+        """Maximum Euclidean norm of the vectors of ``a``."""
+        return np.max(np.linalg.norm(a, axis=-1), initial=0)
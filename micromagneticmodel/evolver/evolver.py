@@ -0,0 +1,150 @@
+import numpy as np
+
+import micromagneticmodel as mm
+
+
+class Evolver(mm.abstract.Abstract):
+    """An abstract class for deriving evolvers.
+
+    Evolvers used by external drivers only store the settings of the external
+    time integrator. Evolvers which integrate the dynamics equation in process
+    implement ``_evolve``, which makes ``evolve`` available. Evolvers which
+    include the thermal field at temperature ``system.T`` set ``_thermal``.
+
+    """
+
+    _thermal = False
+
+    def evolve(self, system, t, n=1, callback=None):
+        """Evolve the magnetisation of the system in time.
+
+        The dynamics equation ``system.dynamics`` is integrated with the
+        effective field of ``system.energy`` for time ``t`` starting from
+        ``system.m``, which is then updated with the final magnetisation.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System to be evolved.
+
+        t : numbers.Real
+
+            Evolution time in seconds.
+
+        n : int, optional
+
+            Number of equally spaced sampling times in ``(0, t]`` at which
+            ``callback`` is called. Defaults to 1.
+
+        callback : callable, optional
+
+            Function called as ``callback(i, time, m, Ms)`` at sampling time
+            ``i``, where ``m`` is the unit magnetisation array (which must not
+            be modified) and ``Ms`` the saturation magnetisation array.
+            Defaults to ``None``.
+
+        Returns
+        -------
+        int
+
+            Number of accepted time steps.
+
+        Raises
+        ------
+        NotImplementedError
+
+            If the evolver does not integrate the dynamics equation in process.
+
+        ValueError
+
+            If the temperature of the system is not zero and the evolver does
+            not include the thermal field.
+
+        RuntimeError
+
+            If the integration fails, e.g. because the magnetisation or its
+            error estimate is not finite.
+
+        Examples
+        --------
+        1. Damped precession of a macrospin.
+
+        >>> import micromagneticmodel as mm
+        ...
+        >>> system = mm.examples.macrospin()
+        >>> evolver = mm.RungeKuttaEvolver()
+        >>> steps = evolver.evolve(system, t=1e-11)
+        >>> system.m.orientation.mean().round(4)
+        array([-0.4876, -0.3481,  0.8007])
+
+        """
+        if system.T > 0 and not self._thermal:
+            msg = (
+                f"Cannot evolve {system=} at T={system.T} with {self!r}, which "
+                "does not include the thermal field."
+            )
+            raise ValueError(msg)
+        m, Ms = mm.util.magnetisation_arrays(system.m)
+        times = np.linspace(0, t, n + 1)[1:]
+        steps = self._evolve(system, m, Ms, times, callback=callback)
+        system.m = mm.util.magnetisation_field(system.m, m, Ms)
+        return steps
+
+    def _evolve(self, system, m, Ms, times, callback=None):
+        """Integrate the dynamics equation in place.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System defining the energy and dynamics equations and the mesh.
+
+        m : numpy.ndarray
+
+            Unit magnetisation array, which is evolved in place.
+
+        Ms : numpy.ndarray
+
+            Saturation magnetisation array.
+
+        times : numpy.ndarray
+
+            Increasing sampling times in seconds. The integration starts at
+            time zero and ends at ``times[-1]``.
+
+        callback : callable, optional
+
+            As in ``evolve``.
+
+        Returns
+        -------
+        int
+
+            Number of accepted time steps.
+
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _rhs(system, Ms, H):
+        """Right-hand side ``f(t, m, out)`` of the dynamics equation.
+
+        The effective field is written into ``H``, so that no arrays are
+        allocated when the function is evaluated.
+
+        """
+        mesh = system.m.mesh
+        energy, dynamics = system.energy, system.dynamics
+
+        def rhs(t, m, out):
+            energy._effective_field(m, Ms, mesh, t=t, out=H)
+            return dynamics._dmdt(m, Ms, mesh, H, t=t, out=out)
+
+        return rhs
+
+    @staticmethod
+    def _renormalise(m):
+        """Normalise non-zero vectors of ``m`` in place."""
+        norm = np.linalg.norm(m, axis=-1, keepdims=True)
+        np.divide(m, norm, out=m, where=norm > 0)
@@ -0,0 +1,177 @@
+import numpy as np
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+from .evolver import Evolver
+
+
+@uu.inherit_docs
+@ts.typesystem(
+    tolerance=ts.Scalar(positive=True),
+    initial_timestep=ts.Scalar(positive=True),
+    min_timestep=ts.Scalar(positive=True),
+    max_timestep=ts.Scalar(positive=True),
+    renormalise_every=ts.Scalar(expected_type=int, positive=True),
+)
+class RungeKuttaEvolver(Evolver):
+    r"""Adaptive Dormand-Prince Runge-Kutta evolver.
+
+    The dynamics equation is integrated with the embedded fifth-order
+    Dormand-Prince method (RK45). The last stage of an accepted step is the
+    first stage of the next one (first same as last), so that only six
+    evaluations of the effective field and the time derivative are required
+    per step.
+
+    The time step is chosen so that the local error estimate of the unit
+    magnetisation, i.e. the maximum over all cells of the Euclidean norm
+    :math:`|\Delta\mathbf{m}|`, does not exceed ``tolerance``. Because
+    :math:`|\mathbf{m}| = 1`, this is approximately the error of the
+    magnetisation direction in radians. The magnetisation is renormalised every
+    ``renormalise_every`` accepted steps.
+
+    Parameters
+    ----------
+    tolerance : numbers.Real, optional
+
+        Maximum local error of the unit magnetisation per step. Defaults to
+        ``1e-5``.
+
+    initial_timestep : numbers.Real, optional
+
+        Initial time step in seconds. If not set, the initial time step is
+        chosen so that the magnetisation rotates by at most 0.01 rad.
+
+    min_timestep : numbers.Real, optional
+
+        Minimum time step in seconds. Steps with this time step are accepted
+        even if the error estimate exceeds ``tolerance``. Defaults to
+        ``1e-18``.
+
+    max_timestep : numbers.Real, optional
+
+        Maximum time step in seconds. Defaults to ``1e-10``.
+
+    renormalise_every : int, optional
+
+        Number of accepted steps after which the magnetisation is renormalised.
+        Defaults to 10.
+
+    Examples
+    --------
+    1. Defining the evolver.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> evolver = mm.RungeKuttaEvolver(tolerance=1e-6)
+    >>> evolver
+    RungeKuttaEvolver(tolerance=1e-06)
+
+    2. Evolving the magnetisation.
+
+    >>> system = mm.examples.macrospin()
+    >>> evolver.evolve(system, t=1e-10) > 0
+    True
+    >>> float(system.m.orientation.mean()[2]) > 0.9
+    True
+
+    """
+
+    _allowed_attributes = [
+        "tolerance",
+        "initial_timestep",
+        "min_timestep",
+        "max_timestep",
+        "renormalise_every",
+    ]
+    _defaults = {
+        "tolerance": 1e-5,
+        "min_timestep": 1e-18,
+        "max_timestep": 1e-10,
+        "renormalise_every": 10,
+    }
+
+    # Dormand-Prince coefficients: nodes, stage matrix (the last row are the
+    # weights of the fifth-order solution) and error weights (difference of
+    # the fifth- and fourth-order weights).
+    _c = (0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1)
+    _a = (
+        (),
+        (1 / 5,),
+        (3 / 40, 9 / 40),
+        (44 / 45, -56 / 15, 32 / 9),
+        (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+        (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+        (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+    )
+    _e = (
+        71 / 57600,
+        0,
+        -71 / 16695,
+        71 / 1920,
+        -17253 / 339200,
+        22 / 525,
+        -1 / 40,
+    )
+
+    def _evolve(self, system, m, Ms, times, callback=None):
+        tolerance = self._setting("tolerance")
+        min_timestep = self._setting("min_timestep")
+        max_timestep = self._setting("max_timestep")
+        renormalise_every = self._setting("renormalise_every")
+
+        rhs = self._rhs(system, Ms, np.empty_like(m))
+        k = [np.empty_like(m) for _ in range(7)]
+        y = np.empty_like(m)
+        difference = np.empty_like(m)
+        work = np.empty_like(m)
+
+        t = 0.0
+        rhs(t, m, out=k[0])
+        h = self._setting("initial_timestep")
+        if h is None:
+            rate = np.max(np.linalg.norm(k[0], axis=-1), initial=0)
+            h = 0.01 / rate if rate > 0 else max_timestep
+        h = min(max(h, min_timestep), max_timestep)
+
+        steps = 0
+        for i, t_sample in enumerate(times):
+            while t < t_sample:
+                step = min(h, t_sample - t)
+                for stage in range(1, 7):
+                    y[...] = m
+                    for j, a in enumerate(self._a[stage]):
+                        if a:
+                            np.multiply(k[j], step * a, out=work)
+                            y += work
+                    rhs(t + self._c[stage] * step, y, out=k[stage])
+
+                difference[...] = 0
+                for j, e in enumerate(self._e):
+                    if e:
+                        np.multiply(k[j], step * e, out=work)
+                        difference += work
+                error = np.max(np.linalg.norm(difference, axis=-1), initial=0)
+                if not np.isfinite(error):
+                    msg = f"Cannot evolve the magnetisation with {error=} at {t=}."
+                    raise RuntimeError(msg)
+
+                if error <= tolerance or step <= min_timestep:
+                    t = t_sample if step == t_sample - t else t + step
+                    m[...] = y
+                    k[0], k[6] = k[6], k[0]
+                    steps += 1
+                    if steps % renormalise_every == 0:
+                        self._renormalise(m)
+
+                if error > 0:
+                    factor = min(5.0, max(0.2, 0.9 * (tolerance / error) ** 0.2))
+                else:
+                    factor = 5.0
+                if step == h or factor < 1:
+                    h = min(max(step * factor, min_timestep), max_timestep)
+
+            if callback is not None:
+                callback(i, t, m, Ms)
+
+        self._renormalise(m)
+        return steps
@@ -0,0 +1,213 @@
+import numpy as np
+import ubermagutil as uu
+import ubermagutil.typesystem as ts
+
+import micromagneticmodel as mm
+from .evolver import Evolver
+
+
+@uu.inherit_docs
+@ts.typesystem(
+    timestep=ts.Scalar(positive=True),
+    seed=ts.Typed(expected_type=(int, np.random.SeedSequence), allow_none=True),
+)
+class StochasticHeunEvolver(Evolver):
+    r"""Stochastic Heun evolver for the Langevin dynamics equation.
+
+    The dynamics equation is integrated at temperature ``system.T`` with a
+    fixed time step by the stochastic Heun method, which converges to the
+    Stratonovich solution. A thermal field is added to the effective field in
+    every cell and kept constant during each time step :math:`\Delta t`. Its
+    components are independent Gaussian random numbers with zero mean and
+    standard deviation
+
+    .. math::
+
+        \sigma = \sqrt{\frac{2\alpha k_\text{B}T}{\mu_{0}\gamma_{0}M_\text{s}V
+        \Delta t}},
+
+    where :math:`\alpha` is the Gilbert damping, :math:`\gamma_{0}` the
+    gyromagnetic ratio, :math:`M_\text{s}` the saturation magnetisation and
+    :math:`V` the volume of the cell. The magnetisation is renormalised after
+    every step.
+
+    The random numbers are drawn from a ``numpy.random.Generator`` created from
+    ``seed`` when the evolver is used for the first time (or after ``seed`` is
+    changed), so that successive calls of ``evolve`` continue the same random
+    stream. For ensembles, ``spawn`` creates evolvers with statistically
+    independent streams, which can be used in different processes with
+    reproducible results.
+
+    Parameters
+    ----------
+    timestep : numbers.Real, optional
+
+        Maximum time step in seconds. The time between consecutive sampling
+        times is divided into equal steps not longer than ``timestep``.
+        Defaults to ``1e-14``.
+
+    seed : int, numpy.random.SeedSequence, optional
+
+        Seed of the random number generator. If not set, fresh entropy is
+        used and results are not reproducible.
+
+    Examples
+    --------
+    1. Reproducible thermal dynamics of a macrospin.
+
+    >>> import micromagneticmodel as mm
+    ...
+    >>> evolver = mm.StochasticHeunEvolver(timestep=1e-14, seed=42)
+    >>> evolver
+    StochasticHeunEvolver(timestep=1e-14, seed=42)
+    >>> systems = [mm.examples.macrospin() for _ in range(2)]
+    >>> for system in systems:
+    ...     system.T = 300
+    ...     _ = mm.StochasticHeunEvolver(seed=42).evolve(system, t=1e-12)
+    >>> bool((systems[0].m.array == systems[1].m.array).all())
+    True
+
+    2. Independent evolvers for an ensemble of four runs.
+
+    >>> evolvers = evolver.spawn(4)
+    >>> len(evolvers)
+    4
+
+    """
+
+    _allowed_attributes = ["timestep", "seed"]
+    _defaults = {"timestep": 1e-14}
+    _thermal = True
+
+    def spawn(self, n):
+        """Evolvers with independent random streams.
+
+        The seed sequence of the evolver (``numpy.random.SeedSequence(seed)``
+        if ``seed`` is an integer) is spawned into ``n`` child sequences, which
+        are the seeds of the returned evolvers. All other attributes are
+        copied. For an integer ``seed``, the returned evolvers are the same on
+        every call.
+
+        Parameters
+        ----------
+        n : int
+
+            Number of evolvers.
+
+        Returns
+        -------
+        list
+
+            Evolvers (``micromagneticmodel.StochasticHeunEvolver``) with
+            independent random streams.
+
+        Examples
+        --------
+        1. Spawning evolvers for workers.
+
+        >>> import micromagneticmodel as mm
+        ...
+        >>> evolvers = mm.StochasticHeunEvolver(seed=1).spawn(2)
+        >>> evolvers[0].seed.spawn_key
+        (0,)
+        >>> evolvers[1].timestep == evolvers[0].timestep
+        True
+
+        """
+        seed = self._setting("seed")
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        attributes = {
+            attr: value
+            for attr, value in self
+            if not isinstance(value, ts.Descriptor) and attr != "seed"
+        }
+        return [self.__class__(seed=child, **attributes) for child in seed.spawn(n)]
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name == "seed":
+            # Restart the random stream from the new seed.
+            self.__dict__.pop("_random_generator", None)
+
+    def _generator(self):
+        """Random number generator, created from ``seed`` on first use."""
+        if "_random_generator" not in self.__dict__:
+            self._random_generator = np.random.default_rng(self._setting("seed"))
+        return self._random_generator
+
+    def _evolve(self, system, m, Ms, times, callback=None):
+        timestep = self._setting("timestep")
+        sigma = self._thermal_amplitude(system, Ms)
+        generator = self._generator()
+
+        mesh = system.m.mesh
+        energy, dynamics = system.energy, system.dynamics
+        H = np.empty_like(m)
+        Hth = np.zeros_like(m)
+
+        def rhs(t, m, out):
+            energy._effective_field(m, Ms, mesh, t=t, out=H)
+            np.add(H, Hth, out=H)
+            return dynamics._dmdt(m, Ms, mesh, H, t=t, out=out)
+
+        k = [np.empty_like(m) for _ in range(2)]
+        y = np.empty_like(m)
+
+        t = 0.0
+        steps = 0
+        for i, t_sample in enumerate(times):
+            count = max(int(np.ceil((t_sample - t) / timestep * (1 - 1e-9))), 1)
+            step = (t_sample - t) / count
+            for j in range(count):
+                if sigma is not None:
+                    generator.standard_normal(out=Hth)
+                    Hth *= sigma
+                    Hth /= np.sqrt(step)
+
+                # Euler predictor and trapezoidal corrector with the same
+                # thermal field.
+                time = t + j * step
+                rhs(time, m, out=k[0])
+                np.multiply(k[0], step, out=y)
+                y += m
+                rhs(time + step, y, out=k[1])
+                k[0] += k[1]
+                k[0] *= step / 2
+                m += k[0]
+                self._renormalise(m)
+            t = t_sample
+            steps += count
+
+            if callback is not None:
+                callback(i, t, m, Ms)
+
+        return steps
+
+    @staticmethod
+    def _thermal_amplitude(system, Ms):
+        """Thermal field standard deviation for a unit time step.
+
+        Returns ``None`` at zero temperature.
+
+        """
+        if not system.T:
+            return None
+        mesh = system.m.mesh
+        dynamics = system.dynamics
+        precession = next(iter(dynamics.get(type=mm.Precession)), None)
+        damping = next(iter(dynamics.get(type=mm.Damping)), None)
+        if precession is None:
+            msg = f"Cannot evolve {system=} at T > 0 without precession."
+            raise ValueError(msg)
+        alpha = 0 if damping is None else damping._alpha(mesh)
+        gamma0 = precession._gamma0(mesh)
+        variance = (
+            2
+            * alpha
+            * mm.consts.kB
+            * system.T
+            / (mm.consts.mu0 * gamma0 * mesh.dV)
+            * mm.util.inverse(Ms)
+        )
+        return np.sqrt(variance)
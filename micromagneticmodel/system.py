@@ -22,6 +22,20 @@ class System:
     - Temperature (``system.T``)
     - Name (``system.name``)
 
+    In-process drivers store their results in the following attributes, which
+    are ``None`` until the system is driven:
+
+    - Reduced data (``system.records``), a ``numpy`` structured array with one
+      float field for every column, e.g. ``t`` and ``mx`` of
+      ``micromagneticmodel.TimeDriver``. External drivers store their data in
+      ``system.table`` instead.
+    - Magnetisation fields of the images of a minimum energy path
+      (``system.images``, a list of ``discretisedfield.Field`` objects, see
+      ``micromagneticmodel.NEBDriver``).
+    - Complex eigenmode profiles (``system.modes``, a list of
+      ``discretisedfield.Field`` objects, see
+      ``micromagneticmodel.EigenmodeDriver``).
+
     Parameters
     ----------
     energy : micromagneticmodel.Energy, optional
@@ -81,6 +95,11 @@ class System:
         self.drive_number = 0
         self.compute_number = 0
 
+        # Results of in-process drivers.
+        self.records = None
+        self.images = None
+        self.modes = None
+
     @property
     def energy(self):
         """Energy equation of the system.
@@ -16,16 +16,8 @@ def check_term(term):
 
     if isinstance(term, mm.energy.energyterm.EnergyTerm):
         assert isinstance(getattr(mm, term._container_class)(), mm.Energy)
-        with pytest.raises(NotImplementedError):
-            term.effective_field(m=None)
-        with pytest.raises(NotImplementedError):
-            term.energy(m=None)
-        with pytest.raises(NotImplementedError):
-            term.density(m=None)
     else:
         assert isinstance(getattr(mm, term._container_class)(), mm.Dynamics)
-        with pytest.raises(NotImplementedError):
-            term.dmdt(m=None, Heff=None)
 
     assert term == term
     assert term != "5"
@@ -0,0 +1,73 @@
+import os
+
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+from micromagneticmodel.energy import demag
+
+
+class TestKernelCache:
+    def test_get_put(self, tmp_path):
+        cache = mm.KernelCache(tmp_path / "cache")
+        assert cache.get(("a", 1)) is None
+
+        kernel = np.arange(10.0)
+        cache.put(("a", 1), kernel)
+        loaded = cache.get(("a", 1))
+        assert isinstance(loaded, np.memmap)
+        assert np.array_equal(loaded, kernel)
+        assert not loaded.flags.writeable
+        assert cache.get(("a", 2)) is None
+
+        cache.clear()
+        assert cache.get(("a", 1)) is None
+        assert "KernelCache" in repr(cache)
+
+    def test_eviction(self, tmp_path):
+        kernel = np.zeros(100)
+        size = os.path.getsize(self._saved(tmp_path, kernel))
+        cache = mm.KernelCache(tmp_path / "cache", max_size=2 * size)
+
+        cache.put("k1", kernel)
+        cache.put("k2", kernel)
+        os.utime(cache._path("k1"), (0, 0))
+        os.utime(cache._path("k2"), (1, 1))
+        cache.get("k1")  # k1 becomes the most recently used entry
+        cache.put("k3", kernel)
+
+        assert cache.get("k1") is not None
+        assert cache.get("k2") is None
+        assert cache.get("k3") is not None
+
+        # Kernels larger than the budget are not stored.
+        cache.put("k4", np.zeros(1000))
+        assert cache.get("k4") is None
+
+    def test_demag(self, tmp_path, monkeypatch):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(7e-9, 3e-9, 2e-9), n=(7, 3, 2))
+        m = df.Field(mesh, nvdim=3, value=(0, 1, 1), norm=1e6)
+        expected = mm.Demag().effective_field(m).array
+
+        monkeypatch.setattr(mm.Demag, "kernel_cache", mm.KernelCache(tmp_path))
+        demag._kernel.cache_clear()
+        assert np.allclose(mm.Demag().effective_field(m).array, expected)
+        assert len(list(tmp_path.glob("*.npy"))) == 1
+
+        # The kernel is now loaded from disk instead of being computed.
+        def compute_kernel(*args):
+            raise AssertionError("kernel should not be computed")
+
+        monkeypatch.setattr(demag, "_compute_kernel", compute_kernel)
+        demag._kernel.cache_clear()
+        assert np.allclose(mm.Demag().effective_field(m).array, expected)
+
+        with pytest.raises(AssertionError):
+            mm.Demag(asymptotic_radius=3).effective_field(m)
+
+    @staticmethod
+    def _saved(tmp_path, kernel):
+        path = tmp_path / "reference.npy"
+        np.save(path, kernel)
+        return path
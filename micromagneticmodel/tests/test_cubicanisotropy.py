@@ -52,3 +52,51 @@ class TestCubicAnisotropy:
 
         with pytest.raises(AttributeError):
             mm.CubicAnisotropy(wrong=1)
+
+    def test_effective_field(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(4e-9, 1e-9, 1e-9), n=(4, 1, 1))
+        rng = np.random.default_rng(0)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 1, 1, 3)), norm=8e5)
+        K, u1, u2 = 4e4, (1, 1, 0), (-1, 1, 0)
+        term = mm.CubicAnisotropy(K=K, u1=u1, u2=u2)
+        Heff = term.effective_field(m)
+        assert isinstance(Heff, df.Field)
+
+        # Compare with the numerical derivative of the energy density.
+        axes = np.array([u1, u2, (0, 0, 2)]) / np.sqrt(2)
+        axes[2] /= np.sqrt(2)
+
+        def density(m):
+            a2 = (m @ axes.T) ** 2
+            return -K * (a2[0] * a2[1] + a2[1] * a2[2] + a2[2] * a2[0])
+
+        for index in np.ndindex(*mesh.n):
+            mi = m.array[index] / 8e5
+            gradient = np.zeros(3)
+            for i in range(3):
+                dm = np.zeros(3)
+                dm[i] = 1e-6
+                gradient[i] = (density(mi + dm) - density(mi - dm)) / 2e-6
+            expected = -gradient / (mm.consts.mu0 * 8e5)
+            assert np.allclose(Heff.array[index], expected, rtol=1e-6)
+
+    def test_effective_field_out(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(1, 1, 1), norm=1e6)
+        m.array[1] = 0
+        term = mm.CubicAnisotropy(K={"default": 1e5}, u1=(1, 0, 0), u2=(0, 1, 0))
+        out = np.full_like(m.array, np.nan)
+        assert term.effective_field(m, out=out) is out
+        expected = 2 * 1e5 * 2 / 3 / np.sqrt(3) / (mm.consts.mu0 * 1e6)
+        assert np.allclose(out[0, 0, 0], expected)
+        assert np.allclose(out[1, 0, 0], 0)
+
+        # Reassigning an axis recomputes the third axis.
+        term.u2 = (0, 0, 1)
+        assert np.allclose(term.effective_field(m).array[0, 0, 0], expected)
+        term.K = 0
+        assert np.allclose(term.effective_field(m).array, 0)
+
+        term = mm.CubicAnisotropy(K=1e5, u1=(1, 0, 0))
+        with pytest.raises(ValueError):
+            term.effective_field(m)
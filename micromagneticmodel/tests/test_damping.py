@@ -1,6 +1,7 @@
 import re
 
 import discretisedfield as df
+import numpy as np
 import pytest
 
 import micromagneticmodel as mm
@@ -39,3 +40,21 @@ class TestDamping:
 
         with pytest.raises(AttributeError):
             mm.Damping(wrong=1)
+
+    def test_dmdt(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(1, 0, 0), norm=8e5)
+        Heff = df.Field(mesh, nvdim=3, value=(0, 0, 1e5))
+        term = mm.Damping(alpha=0.5)
+
+        dmdt = term.dmdt(m, Heff)
+        assert isinstance(dmdt, df.Field)
+        expected = mm.consts.gamma0 * 0.5 / 1.25 * 1e5
+        assert np.allclose(dmdt.array, (0, 0, expected))
+
+        term.alpha = 1
+        expected = mm.consts.gamma0 / 2 * 1e5
+        assert np.allclose(term.dmdt(m, Heff).array, (0, 0, expected))
+
+        with pytest.raises(ValueError):
+            mm.Damping().dmdt(m, Heff)
@@ -1,9 +1,13 @@
+import itertools
 import re
 
+import discretisedfield as df
+import numpy as np
 import pytest
 
 import micromagneticmodel as mm
 from .checks import check_term
+from micromagneticmodel.energy.demag import _demag_tensor, _kernel
 
 
 class TestDemag:
@@ -16,3 +20,78 @@ class TestDemag:
     def test_init_invalid_args(self):
         with pytest.raises(AttributeError):
             mm.Exchange(wrong=1)
+
+    def test_effective_field_single_cell(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9), n=(1, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(1, 2, 3), norm=1e6)
+        Heff = mm.Demag().effective_field(m)
+        assert isinstance(Heff, df.Field)
+        assert np.allclose(Heff.array, -m.array / 3)
+
+    def test_effective_field_direct_sum(self):
+        cell = (1e-9, 2e-9, 3e-9)
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(4e-9, 6e-9, 6e-9), cell=cell)
+        rng = np.random.default_rng(0)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 3, 2, 3)), norm=1e6)
+
+        indices = np.array(list(itertools.product(*(range(n) for n in mesh.n))))
+        X, Y, Z = ((indices[:, np.newaxis] - indices[np.newaxis, :]) * cell).T
+        for asymptotic_radius in [-1, 1.5]:
+            N = _demag_tensor(X, Y, Z, cell, asymptotic_radius)
+            N = N[[[0, 3, 4], [3, 1, 5], [4, 5, 2]]]
+            M = m.array[tuple(indices.T)]
+            expected = -np.einsum("abji,jb->ia", N, M).reshape(m.array.shape)
+
+            demag = mm.Demag(asymptotic_radius=asymptotic_radius)
+            Heff = demag.effective_field(m)
+            assert np.allclose(Heff.array, expected, rtol=0, atol=1e-8 * 1e6)
+
+    def test_effective_field_asymptotic_radius(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(60e-9, 4e-9, 2e-9), cell=(2e-9, 2e-9, 2e-9))
+        m = df.Field(mesh, nvdim=3, value=(0, 1, 1), norm=1e6)
+        exact = mm.Demag(asymptotic_radius=-1).effective_field(m).array
+        approximate = mm.Demag(asymptotic_radius=5).effective_field(m).array
+        assert np.allclose(approximate, exact, rtol=0, atol=1e-3 * 1e6)
+
+        # Neighbouring cells are never approximated.
+        nearest = mm.Demag(asymptotic_radius=0).effective_field(m).array
+        assert np.all(np.isfinite(nearest))
+        assert np.allclose(nearest, exact, rtol=0, atol=1e-3 * 1e6)
+
+    def test_effective_field_pbc(self):
+        # Thin film periodic in plane: Hz approaches -Ms.
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(20e-9, 20e-9, 2e-9), n=(10, 10, 1), bc="xy")
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=1e6)
+        Heff = mm.Demag().effective_field(m)
+        assert np.allclose(Heff.array[..., 2], -1e6, rtol=0.02)
+        assert np.allclose(Heff.array[..., :2], 0, atol=1e-6)
+        assert np.allclose(Heff.array, Heff.array[0, 0, 0])
+
+    def test_kernel_reused(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(5e-9, 3e-9, 1e-9), n=(5, 3, 1))
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=1e6)
+        mm.Demag().effective_field(m)
+        hits = _kernel.cache_info().hits
+        mm.Demag(name="demag2").effective_field(m)
+        assert _kernel.cache_info().hits == hits + 1
+
+    def test_cell_tensor(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(1e-9, 2e-9, 3e-9), n=(1, 1, 1))
+        N = mm.Demag().cell_tensor(mesh)
+        assert N.shape == (3, 3)
+        assert np.allclose(N, N.T)
+        assert np.isclose(np.trace(N), 1)
+        assert N[0, 0] > N[1, 1] > N[2, 2]
+
+        m = df.Field(mesh, nvdim=3, value=(1, 2, 3), norm=1e6)
+        Heff = mm.Demag().effective_field(m)
+        assert np.allclose(Heff.array, -m.array @ N)
+
+        # A cell of a thin film periodic in plane.
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 2e-9, 2e-9), n=(1, 1, 1), bc="xy")
+        N = mm.Demag().cell_tensor(mesh)
+        assert np.isclose(np.trace(N), 1)
+        assert N[2, 2] > 0.9
+        m = df.Field(mesh, nvdim=3, value=(1, 2, 3), norm=1e6)
+        Heff = mm.Demag().effective_field(m)
+        assert np.allclose(Heff.array, -m.array @ N)
@@ -1,6 +1,7 @@
 import re
 
 import discretisedfield as df
+import numpy as np
 import pytest
 
 import micromagneticmodel as mm
@@ -45,3 +46,84 @@ class TestDMI:
 
         with pytest.raises(AttributeError):
             mm.DMI(wrong=1)
+
+    def test_effective_field_spirals(self):
+        n, dx, D, Ms = 20, 1e-9, 3e-3, 8e5
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(n * dx, dx, dx), n=(n, 1, 1), bc="x")
+        k = 2 * np.pi / (n * dx)
+        factor = 2 * D / (mm.consts.mu0 * Ms) * np.sin(k * dx) / dx
+
+        def helix(point):
+            x, _, _ = point
+            return (0, np.cos(k * x), np.sin(k * x))
+
+        def cycloid(point):
+            x, _, _ = point
+            return (np.sin(k * x), 0, np.cos(k * x))
+
+        for crystalclass, value in [("T", helix), ("Cnv_z", cycloid), ("Cnv", cycloid)]:
+            m = df.Field(mesh, nvdim=3, value=value, norm=Ms)
+            Heff = mm.DMI(D=D, crystalclass=crystalclass).effective_field(m)
+            assert isinstance(Heff, df.Field)
+            assert np.allclose(Heff.array, factor * m.array / Ms)
+
+        # Uniform magnetisation: no field inside the sample.
+        m = df.Field(mesh, nvdim=3, value=(0, 0.6, 0.8), norm=Ms)
+        for crystalclass in self.crystalclasses:
+            Heff = mm.DMI(D=D, crystalclass=crystalclass).effective_field(m)
+            assert np.allclose(Heff.array, 0)
+
+    def test_effective_field_energy_consistency(self):
+        subregions = {"r1": df.Region(p1=(0, 0, 0), p2=(2e-9, 3e-9, 2e-9))}
+        mesh = df.Mesh(
+            p1=(0, 0, 0),
+            p2=(4e-9, 3e-9, 2e-9),
+            cell=(1e-9, 1e-9, 1e-9),
+            subregions=subregions,
+            bc="y",
+        )
+        rng = np.random.default_rng(0)
+        Ms = df.Field(mesh, nvdim=1, value=1e6)
+        Ms.array[3, 2, 1] = 0
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 3, 2, 3)), norm=Ms)
+        D = {"r1": 1e-3, "default": -3e-3}
+
+        for crystalclass in self.crystalclasses:
+            term = mm.DMI(D=D, crystalclass=crystalclass)
+
+            def energy(m_array, term=term):
+                H = term._effective_field(m_array, Ms.array, mesh)
+                return -mm.consts.mu0 / 2 * np.sum(Ms.array * m_array * H)
+
+            m_array, _ = mm.util.magnetisation_arrays(m)
+            H = term._effective_field(m_array, Ms.array, mesh)
+            for index in [(0, 0, 0), (1, 2, 1), (2, 1, 0), (3, 0, 1)]:
+                for a in range(3):
+                    dm = np.zeros_like(m_array)
+                    dm[(*index, a)] = 1e-6
+                    gradient = (energy(m_array + dm) - energy(m_array - dm)) / 2e-6
+                    expected = -gradient / (mm.consts.mu0 * Ms.array[index])
+                    assert np.isclose(H[(*index, a)], expected, rtol=1e-6)
+            assert np.allclose(H[3, 2, 1], 0)
+
+    def test_effective_field_plan(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(3e-9, 3e-9, 1e-9), n=(3, 3, 1))
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=1e6)
+        m.array[1, 1] = (1e6, 0, 0)
+        term = mm.DMI(D=1e-3, crystalclass="Cnv_z")
+        Heff = term.effective_field(m).array
+        _, Ms = mm.util.magnetisation_arrays(m)
+        plan = term._plan(mesh, Ms)
+        assert len(plan) == 2  # no derivatives along z
+        assert term._plan(mesh, Ms) is plan
+        # Arrays with the same values reuse the plan.
+        assert term._plan(mesh, Ms.copy()) is plan
+        assert term._plan(mesh, 2 * Ms) is not plan
+
+        term.D = 2e-3
+        assert term._plan(mesh, Ms) is not plan
+        assert np.allclose(term.effective_field(m).array, 2 * Heff)
+
+        out = np.full_like(m.array, np.nan)
+        assert term.effective_field(m, out=out) is out
+        assert np.allclose(out, 2 * Heff)
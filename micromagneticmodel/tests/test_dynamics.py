@@ -1,3 +1,5 @@
+import discretisedfield as df
+import numpy as np
 import pytest
 
 import micromagneticmodel as mm
@@ -137,3 +139,48 @@ class TestDynamics:
         assert container.get(type=mm.Precession)
         assert self.precession in container.get(type=mm.Precession)
         assert not container.get(type=mm.ZhangLi)
+
+    def test_dmdt(self):
+        subregions = {
+            "r1": df.Region(p1=(0, 0, 0), p2=(2e-9, 3e-9, 1e-9)),
+            "r2": df.Region(p1=(2e-9, 0, 0), p2=(4e-9, 3e-9, 1e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(4e-9, 3e-9, 1e-9), n=(4, 3, 1), subregions=subregions
+        )
+        rng = np.random.default_rng(6)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 3, 1, 3)), norm=8e5)
+        Heff = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 3, 1, 3)) * 1e5)
+        gamma0 = df.Field(mesh, nvdim=1, value=rng.uniform(1e5, 3e5, (4, 3, 1, 1)))
+        precession = mm.Precession(gamma0=gamma0)
+        container = precession + self.damping
+
+        m_array = m.array / 8e5
+        alpha = np.where(np.arange(4) < 2, 1, 0.5)[:, None, None, None]
+        mxH = np.cross(m_array, Heff.array)
+        expected = -gamma0.array / (1 + alpha**2) * mxH
+        expected -= gamma0.array * alpha / (1 + alpha**2) * np.cross(m_array, mxH)
+
+        dmdt = container.dmdt(m, Heff)
+        assert isinstance(dmdt, df.Field)
+        assert np.allclose(dmdt.array, expected)
+        assert np.allclose(np.sum(dmdt.array * m_array, axis=-1), 0, atol=1e-3)
+
+        out = np.full_like(m.array, np.nan)
+        assert container.dmdt(m, Heff.array, out=out) is out
+        assert np.allclose(out, expected)
+
+        # Reassigning alpha is picked up by the fused evaluation.
+        self.damping.alpha = 0
+        assert np.allclose(
+            container.dmdt(m, Heff).array, precession.dmdt(m, Heff).array
+        )
+
+        # Without precession, damping uses the default gyromagnetic ratio.
+        container = mm.Dynamics(terms=[self.damping])
+        self.damping.alpha = 0.5
+        assert np.allclose(
+            container.dmdt(m, Heff).array, self.damping.dmdt(m, Heff).array
+        )
+
+        assert np.all(mm.Dynamics().dmdt(m, Heff).array == 0)
@@ -0,0 +1,132 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+import scipy.sparse.linalg
+
+import micromagneticmodel as mm
+
+
+def spin_chain(n=20, dx=2e-9, A=1e-11, Ms=8e5, H=1e5, alpha=0.02):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(n * dx, dx, dx), n=(n, 1, 1), bc="x")
+    system = mm.System(name="chain")
+    system.energy = mm.Exchange(A=A) + mm.Zeeman(H=(0, 0, H))
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=alpha)
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=Ms)
+    return system
+
+
+class TestEigenmodeDriver:
+    def test_init(self):
+        ed = mm.EigenmodeDriver()
+        assert repr(ed) == "EigenmodeDriver()"
+        assert ed._x == "f"
+        assert ed._setting("tolerance") == 1e-8
+
+        with pytest.raises(ValueError):
+            mm.EigenmodeDriver(tolerance=-1)
+
+    @pytest.mark.parametrize("direction", [(0, 0, 1), (1, 1, 1)])
+    def test_kittel(self, direction):
+        # Macrospin with the field along the easy axis: f = gamma' Heff / 2 pi
+        # with Heff = H + 2 K / (mu0 Ms) and decay rate alpha gamma' Heff.
+        H, K, Ms, alpha = 2e5, 1e5, 1e6, 0.1
+        u = np.array(direction) / np.linalg.norm(direction)
+        system = mm.examples.macrospin()
+        system.energy.zeeman.H = H * u
+        system.energy += mm.UniaxialAnisotropy(K=K, u=u)
+        system.m = df.Field(system.m.mesh, nvdim=3, value=u, norm=Ms)
+        mm.EigenmodeDriver().drive(system, n=1)
+
+        gamma = mm.consts.gamma0 / (1 + alpha**2)
+        Heff = H + 2 * K / (mm.consts.mu0 * Ms)
+        table = system.records
+        assert system.drive_number == 1
+        assert table.dtype.names == ("f", "decay_rate")
+        assert table["f"][0] == pytest.approx(gamma * Heff / (2 * np.pi))
+        assert table["decay_rate"][0] == pytest.approx(alpha * gamma * Heff)
+
+        # Circular precession perpendicular to m.
+        (mode,) = system.modes
+        dm = mode.array[0, 0, 0]
+        assert np.allclose(dm @ u, 0)
+        assert np.linalg.norm(dm) == pytest.approx(1)
+        assert np.allclose(dm.real @ dm.imag, 0)
+        assert np.linalg.norm(dm.real) == pytest.approx(np.linalg.norm(dm.imag))
+        assert np.allclose(system.m.orientation.array, u)
+
+    def test_spin_waves(self):
+        # Spin waves in a periodic chain: omega = gamma' (H + 2 A / (mu0 Ms)
+        # 2 / dx**2 (1 - cos(k dx))), doubly degenerate for k > 0.
+        n, dx, A, Ms, H, alpha = 20, 2e-9, 1e-11, 8e5, 1e5, 0.02
+        system = spin_chain(n, dx, A, Ms, H, alpha)
+        mm.EigenmodeDriver().drive(system, n=5)
+
+        gamma = mm.consts.gamma0 / (1 + alpha**2)
+        k = 2 * np.pi * np.array([0, 1, 1, 2, 2]) / (n * dx)
+        omega = gamma * (
+            H + 2 * A / (mm.consts.mu0 * Ms) * 2 / dx**2 * (1 - np.cos(k * dx))
+        )
+        assert np.allclose(system.records["f"], omega / (2 * np.pi), rtol=1e-6)
+        assert np.allclose(system.records["decay_rate"], alpha * omega, rtol=1e-6)
+        assert np.all(np.diff(system.records["f"]) >= 0)
+
+        # The uniform mode has the same amplitude in every cell.
+        amplitude = np.linalg.norm(system.modes[0].array, axis=-1)
+        assert np.allclose(amplitude, 1)
+        for mode in system.modes:
+            assert mode.array.dtype == complex
+            assert np.allclose(mode.array[..., 2], 0)
+
+    def test_empty_cells(self):
+        system = spin_chain(n=10)
+        system.m.norm = df.Field(
+            system.m.mesh, nvdim=1, value=lambda p: 8e5 if p[0] < 10e-9 else 0
+        )
+        mm.EigenmodeDriver().drive(system, n=2)
+        for mode in system.modes:
+            assert np.allclose(mode.array[5:], 0)
+            assert not np.allclose(mode.array[:5], 0)
+
+    def test_missing_eigenvalues(self, monkeypatch):
+        calls = []
+        eigs = scipy.sparse.linalg.eigs
+
+        def incomplete_eigs(A, k, **kwargs):
+            calls.append(k)
+            values, vectors = eigs(A, k=k, **kwargs)
+            if len(calls) == 1:
+                # Only the negative frequencies of the pairs.
+                keep = values.imag < 0
+                values, vectors = values[keep], vectors[:, keep]
+            return values, vectors
+
+        monkeypatch.setattr(scipy.sparse.linalg, "eigs", incomplete_eigs)
+        system = spin_chain()
+        mm.EigenmodeDriver().drive(system, n=3)
+        assert calls == [6, 8]
+        assert len(system.modes) == 3
+        assert np.all(system.records["f"] > 0)
+
+    def test_unstable(self):
+        # Uniform magnetisation antiparallel to the field, which is an
+        # equilibrium, but not a minimum of the energy.
+        system = spin_chain(H=-1e5)
+        with pytest.raises(RuntimeError, match="stable equilibrium"):
+            mm.EigenmodeDriver().drive(system, n=3)
+
+    def test_invalid(self):
+        ed = mm.EigenmodeDriver()
+        system = mm.examples.macrospin()
+        with pytest.raises(ValueError):
+            ed.drive(system, n=0)
+        with pytest.raises(ValueError):
+            ed.drive(system, n=2)
+
+        system.dynamics = mm.Damping(alpha=0.1)
+        with pytest.raises(ValueError):
+            ed.drive(system, n=1)
+
+        system.m = None
+        with pytest.raises(ValueError):
+            ed.drive(system, n=1)
+        assert system.drive_number == 0
@@ -1,4 +1,9 @@
+import tracemalloc
+
+import discretisedfield as df
+import numpy as np
 import pytest
+import scipy.optimize
 
 import micromagneticmodel as mm
 from .checks import check_container
@@ -191,15 +196,6 @@ class TestEnergy:
         assert term3 in container_diff_name
         assert term1 in container_diff_name
 
-    def test_energy_and_energy_density(self):
-        container = self.dmi + self.zeeman  # single term is not allowed
-
-        with pytest.raises(NotImplementedError):
-            container.energy(None)
-
-        with pytest.raises(NotImplementedError):
-            container.density(None)
-
     def test_get(self):
         custom_zeeman = mm.Zeeman(name="custom", H=(0, 0, 1))
         container = self.dmi + self.zeeman + custom_zeeman
@@ -215,3 +211,306 @@ class TestEnergy:
 
         assert container.get(type=mm.DMI)
         assert not container.get(type=mm.Exchange)
+
+    def test_energy_density(self):
+        subregions = {
+            "r1": df.Region(p1=(0, 0, 0), p2=(3e-9, 2e-9, 1e-9)),
+            "r2": df.Region(p1=(0, 0, 2e-9), p2=(3e-9, 2e-9, 3e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(3e-9, 2e-9, 3e-9), n=(3, 2, 3), subregions=subregions
+        )
+        rng = np.random.default_rng(3)
+        Ms = df.Field(mesh, nvdim=1, value={"r1": 8e5, "r2": 1e6, "default": 0})
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(3, 2, 3, 3)), norm=Ms)
+        terms = [
+            mm.Exchange(A={"r1": 1e-11, "r2": 2e-11, "default": 0}),
+            mm.Demag(),
+            mm.DMI(D=1e-3, crystalclass="Cnv_z"),
+            mm.Zeeman(H=(1e5, 0, 2e5), func="sin", f=1e9, t0=0),
+            mm.UniaxialAnisotropy(K1=1e5, K2=-3e4, u=(1, 1, 0)),
+            mm.CubicAnisotropy(K=-2e4, u1=(1, 0, 0), u2=(0, 1, 0)),
+            mm.MagnetoElastic(
+                B1=1e7, B2=-2e7, e_diag=(1e-3, 0, -1e-3), e_offdiag=(0, 2e-3, 1e-3)
+            ),
+            mm.RKKY(sigma=-1e-4, sigma2=3e-5, subregions=["r1", "r2"]),
+        ]
+        t = 0.2e-9
+        m_array, Ms_array = mm.util.magnetisation_arrays(m)
+
+        for term in terms:
+            # The effective field is minus the energy gradient.
+            def energy(m_array, term=term):
+                H = term._effective_field(m_array, Ms_array, mesh, t=t)
+                w = term._density(m_array, Ms_array, mesh, H, t=t)
+                return np.sum(w) * mesh.dV
+
+            H = term._effective_field(m_array, Ms_array, mesh, t=t)
+            for index in [(0, 0, 0), (2, 1, 0), (1, 1, 2)]:
+                for a in range(3):
+                    dm = np.zeros_like(m_array)
+                    dm[(*index, a)] = 1e-6
+                    gradient = (energy(m_array + dm) - energy(m_array - dm)) / 2e-6
+                    expected = -gradient / (mm.consts.mu0 * Ms_array[index] * mesh.dV)
+                    assert np.isclose(H[(*index, a)], expected, rtol=1e-5, atol=1e-3)
+
+            density = term.density(m, t=t)
+            assert isinstance(density, df.Field)
+            assert density.nvdim == 1
+            assert np.allclose(density.array[:, :, 1], 0)
+            assert np.isclose(term.energy(m, t=t), np.sum(density.array) * mesh.dV)
+
+        container = mm.Energy(terms=terms)
+        energies = container.energy(m, t=t, by_term=True)
+        assert list(energies) == [term.name for term in terms]
+        for term in terms:
+            assert np.isclose(energies[term.name], term.energy(m, t=t))
+        assert np.isclose(container.energy(m, t=t), sum(energies.values()))
+
+        density = container.density(m, t=t)
+        expected = sum(term.density(m, t=t).array for term in terms)
+        assert np.allclose(density.array, expected)
+
+        assert mm.Energy().energy(m) == 0
+        assert np.all(mm.Energy().density(m).array == 0)
+
+    def test_energy_values(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(0, 0.6, 0.8), norm=1e6)
+        V = 2e-27
+
+        term = mm.Zeeman(H=(0, 0, 1e5))
+        assert np.isclose(term.energy(m), -mm.consts.mu0 * 1e6 * 0.8e5 * V)
+        term = mm.UniaxialAnisotropy(K1=1e5, K2=2e4, u=(0, 0, 1))
+        assert np.isclose(term.energy(m), -(1e5 * 0.8**2 + 2e4 * 0.8**4) * V)
+        term = mm.CubicAnisotropy(K=1e5, u1=(1, 0, 0), u2=(0, 1, 0))
+        assert np.isclose(term.energy(m), -1e5 * 0.6**2 * 0.8**2 * V)
+        term = mm.Exchange(A=1e-11)
+        assert term.energy(m) == 0
+
+    def test_effective_field(self):
+        subregions = {
+            "r1": df.Region(p1=(0, 0, 0), p2=(10e-9, 5e-9, 1e-9)),
+            "r2": df.Region(p1=(0, 0, 2e-9), p2=(10e-9, 5e-9, 3e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0),
+            p2=(10e-9, 5e-9, 3e-9),
+            n=(10, 5, 3),
+            subregions=subregions,
+            bc="x",
+        )
+        rng = np.random.default_rng(4)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(10, 5, 3, 3)), norm=8e5)
+        terms = [
+            mm.Exchange(A=1e-11),
+            mm.DMI(D={"r1": 1e-3, "r2": 2e-3, "default": 0}, crystalclass="D2d_z"),
+            mm.Zeeman(H=(0, 0, 1e5), func="sin", f=1e9),
+            mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1)),
+            mm.CubicAnisotropy(K=-1e4, u1=(1, 0, 0), u2=(0, 1, 0)),
+            mm.MagnetoElastic(
+                B1=1e7, B2=1e7, e_diag=(1e-3, 0, 0), e_offdiag=(0, 0, 1e-3)
+            ),
+            mm.RKKY(sigma=-1e-4, subregions=["r1", "r2"]),
+            mm.Demag(),
+        ]
+        t = 0.1e-9
+        expected = sum(term.effective_field(m, t=t).array for term in terms)
+
+        container = mm.Energy(terms=terms)
+        Heff = container.effective_field(m, t=t)
+        assert isinstance(Heff, df.Field)
+        assert np.allclose(Heff.array, expected)
+
+        out = np.full_like(m.array, np.nan)
+        assert container.effective_field(m, t=t, out=out) is out
+        assert np.allclose(out, expected)
+
+        # Every term accumulates into out.
+        out = np.ones_like(m.array)
+        for term in terms:
+            assert term.effective_field(m, t=t, out=out, accumulate=True) is out
+        assert np.allclose(out, expected + 1)
+
+        with pytest.raises(ValueError):
+            terms[0].effective_field(m, accumulate=True)
+
+        assert np.all(mm.Energy().effective_field(m).array == 0)
+
+    def test_effective_field_allocations(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(80e-9, 80e-9, 8e-9), n=(80, 80, 8))
+        m = df.Field(mesh, nvdim=3, value=(0.1, 0.2, 1), norm=8e5)
+        container = mm.Energy(
+            terms=[
+                mm.Exchange(A=1e-11),
+                mm.DMI(D=1e-3, crystalclass="T"),
+                mm.Zeeman(H=(0, 0, 1e5)),
+                mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1)),
+                mm.CubicAnisotropy(K=-1e4, u1=(1, 0, 0), u2=(0, 1, 0)),
+                mm.MagnetoElastic(
+                    B1=1e7, B2=1e7, e_diag=(1e-3, 0, 0), e_offdiag=(0, 0, 1e-3)
+                ),
+            ]
+        )
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        out = np.empty_like(m_array)
+        container._effective_field(m_array, Ms, mesh, out=out)  # warm-up
+
+        # Only small (fixed-size) temporaries are allocated.
+        tracemalloc.start()
+        container._effective_field(m_array, Ms, mesh, out=out)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < m_array.nbytes / 2
+
+        # The public methods only allocate the unit magnetisation and
+        # saturation magnetisation arrays. Precomputed quantities depending on
+        # Ms (e.g. exchange links) are reused although Ms is a new array.
+        container.effective_field(m, out=out)  # warm-up
+        for term in container:
+            term.effective_field(m, out=out, accumulate=True)
+        tracemalloc.start()
+        container.effective_field(m, out=out)
+        for term in container:
+            term.effective_field(m, out=out, accumulate=True)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < 1.5 * m_array.nbytes
+
+    def test_energy_by_region(self):
+        subregions = {
+            "free": df.Region(p1=(0, 0, 0), p2=(4e-9, 3e-9, 2e-9)),
+            "reference": df.Region(p1=(0, 0, 3e-9), p2=(4e-9, 3e-9, 5e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(4e-9, 3e-9, 5e-9), n=(4, 3, 5), subregions=subregions
+        )
+        rng = np.random.default_rng(5)
+        Ms = df.Field(
+            mesh, nvdim=1, value={"free": 8e5, "reference": 1e6, "default": 0}
+        )
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 3, 5, 3)), norm=Ms)
+        terms = [
+            mm.Exchange(A=1e-11),
+            mm.Demag(),
+            mm.Zeeman(H=(0, 0, 1e5)),
+            mm.RKKY(sigma=-1e-4, subregions=["free", "reference"]),
+        ]
+        container = mm.Energy(terms=terms)
+
+        masks = {
+            "free": np.arange(5) < 2,
+            "reference": np.arange(5) >= 3,
+        }
+        for term in terms:
+            energies = term.energy(m, by_region=True)
+            w = term.density(m).array[..., 0]
+            assert set(energies) == {"free", "reference"}
+            for name, mask in masks.items():
+                assert np.isclose(energies[name], np.sum(w[:, :, mask]) * mesh.dV)
+
+        by_both = container.energy(m, by_term=True, by_region=True)
+        by_region = container.energy(m, by_region=True)
+        for name in masks:
+            assert np.isclose(
+                by_region[name], sum(energies[name] for energies in by_both.values())
+            )
+            assert np.isclose(
+                by_both["exchange"][name], terms[0].energy(m, by_region=True)[name]
+            )
+        # The spacer is empty, so the regions add up to the total energy.
+        assert np.isclose(sum(by_region.values()), container.energy(m))
+
+    def test_gradient(self):
+        subregions = {
+            "r1": df.Region(p1=(0, 0, 0), p2=(6e-9, 4e-9, 1e-9)),
+            "r2": df.Region(p1=(0, 0, 2e-9), p2=(6e-9, 4e-9, 3e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(6e-9, 4e-9, 3e-9), n=(6, 4, 3), subregions=subregions
+        )
+        rng = np.random.default_rng(6)
+        Ms = df.Field(mesh, nvdim=1, value={"r1": 8e5, "r2": 1e6, "default": 0})
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(6, 4, 3, 3)), norm=Ms)
+        container = mm.Energy(
+            terms=[
+                mm.Exchange(A=1e-11),
+                mm.DMI(D=3e-3, crystalclass="T"),
+                mm.Zeeman(H=(0, 0, 1e5)),
+                mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1)),
+                mm.CubicAnisotropy(K=-1e4, u1=(1, 0, 0), u2=(0, 1, 0)),
+                mm.RKKY(sigma=-1e-4, subregions=["r1", "r2"]),
+                mm.Demag(),
+            ]
+        )
+        scale = 1 / abs(container.energy(m))
+        x = rng.normal(size=2 * 6 * 4 * 2) * 0.3
+
+        E, gradient = container.energy_and_gradient(x, m, scale=scale)
+        field = container.tangent_field(x, m)
+        assert container.energy(field) * scale == pytest.approx(E)
+        assert np.allclose(field.norm.array, Ms.array)
+        assert np.allclose(container.gradient(x, m, scale=scale), gradient)
+        assert np.allclose(
+            container.tangent_field(np.zeros_like(x), m).array, m.array, rtol=1e-14
+        )
+
+        # Central finite differences of the energy along random directions.
+        for _ in range(3):
+            p = rng.normal(size=x.shape)
+            h = 1e-5
+            forward = container.energy_and_gradient(x + h * p, m, scale=scale)[0]
+            backward = container.energy_and_gradient(x - h * p, m, scale=scale)[0]
+            assert gradient @ p == pytest.approx(
+                (forward - backward) / (2 * h), rel=1e-6
+            )
+
+        with pytest.raises(ValueError):
+            container.gradient(np.zeros(2 * 6 * 4 * 3), m)
+
+    def test_hessp(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(10e-9, 5e-9, 5e-9), n=(10, 5, 1))
+        rng = np.random.default_rng(7)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(10, 5, 1, 3)), norm=8e5)
+        container = mm.Exchange(A=1e-11) + mm.Demag() + mm.Zeeman(H=(1e5, 0, 0))
+        container += mm.CubicAnisotropy(K=1e5, u1=(1, 0, 0), u2=(0, 1, 0))
+        scale = 1e18
+        x = rng.normal(size=100) * 0.1
+        p, q = rng.normal(size=(2, 100))
+
+        Hp = container.hessp(x, p, m, scale=scale)
+        h = 1e-4
+        forward = container.gradient(x + h * p, m, scale=scale)
+        backward = container.gradient(x - h * p, m, scale=scale)
+        assert np.allclose(Hp, (forward - backward) / (2 * h), rtol=1e-5, atol=1e-6)
+        # The Hessian is symmetric.
+        Hq = container.hessp(x, q, m, scale=scale)
+        assert q @ Hp == pytest.approx(p @ Hq, rel=1e-6)
+        assert np.array_equal(container.hessp(x, np.zeros(100), m), np.zeros(100))
+
+    @pytest.mark.parametrize(
+        "method, options",
+        [("L-BFGS-B", {"gtol": 1e-8, "ftol": 1e-15}), ("trust-ncg", {"gtol": 1e-8})],
+    )
+    def test_scipy_optimize(self, method, options):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(20e-9, 10e-9, 2e-9), n=(10, 5, 1))
+        rng = np.random.default_rng(8)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(10, 5, 1, 3)), norm=8e5)
+        container = mm.Exchange(A=1e-11) + mm.Zeeman(H=(0, 0, 1e5))
+        minimum = container.energy(df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5))
+        scale = -1 / minimum
+
+        hessp = container.hessp if method == "trust-ncg" else None
+        result = scipy.optimize.minimize(
+            container.energy_and_gradient,
+            np.zeros(100),
+            args=(m, 0, scale),
+            jac=True,
+            hessp=hessp,
+            method=method,
+            options=options,
+        )
+        assert result.success
+        assert result.fun / scale == pytest.approx(minimum, rel=1e-8)
+        relaxed = container.tangent_field(result.x, m)
+        assert np.allclose(relaxed.orientation.array, (0, 0, 1), atol=1e-4)
@@ -0,0 +1,321 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+
+
+def macrospin_orientation(t, alpha=0.1, H=1e6):
+    """Analytical solution for the macrospin example."""
+    gamma = mm.consts.gamma0 * H / (1 + alpha**2)
+    theta = 2 * np.arctan(np.tan(np.pi / 8) * np.exp(-alpha * gamma * t))
+    phi = np.pi / 2 + gamma * t
+    return np.array(
+        [np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)]
+    )
+
+
+def test_evolver():
+    class MyEvolver(mm.Evolver):
+        _allowed_attributes = ["arg"]
+
+    evolver = MyEvolver(arg=1)
+    assert repr(evolver) == "MyEvolver(arg=1)"
+    with pytest.raises(NotImplementedError):
+        evolver.evolve(mm.examples.macrospin(), t=1e-12)
+
+
+class TestRungeKuttaEvolver:
+    def test_init(self):
+        evolver = mm.RungeKuttaEvolver()
+        assert repr(evolver) == "RungeKuttaEvolver()"
+        assert evolver._setting("tolerance") == 1e-5
+        evolver = mm.RungeKuttaEvolver(tolerance=1e-7, renormalise_every=1)
+        assert evolver._setting("tolerance") == 1e-7
+
+        with pytest.raises(ValueError):
+            mm.RungeKuttaEvolver(tolerance=-1)
+        with pytest.raises(TypeError):
+            mm.RungeKuttaEvolver(renormalise_every=1.5)
+        with pytest.raises(AttributeError):
+            mm.RungeKuttaEvolver(method="rk4")
+
+    def test_macrospin(self):
+        times, orientations = [], []
+
+        def callback(i, t, m, Ms):
+            assert len(times) == i
+            times.append(t)
+            orientations.append(m[0, 0, 0].copy())
+            assert Ms[0, 0, 0, 0] == pytest.approx(1e6)
+
+        for tolerance in [1e-5, 1e-8]:
+            system = mm.examples.macrospin()
+            times.clear()
+            orientations.clear()
+            evolver = mm.RungeKuttaEvolver(tolerance=tolerance)
+            steps = evolver.evolve(system, t=2e-10, n=20, callback=callback)
+            assert steps >= 20
+            assert np.allclose(times, np.linspace(0, 2e-10, 21)[1:], rtol=0)
+            expected = np.array([macrospin_orientation(t) for t in times])
+            assert np.allclose(orientations, expected, atol=100 * tolerance)
+            assert np.allclose(system.m.norm.array, 1e6)
+            assert np.allclose(system.m.orientation.array[0, 0, 0], orientations[-1])
+
+        # Smaller tolerance requires more steps.
+        system = mm.examples.macrospin()
+        assert mm.RungeKuttaEvolver(tolerance=1e-5).evolve(system, t=2e-10) < steps
+
+    def test_first_same_as_last(self, monkeypatch):
+        system = mm.examples.macrospin()
+        calls = []
+        dmdt = system.dynamics._dmdt
+
+        def counting_dmdt(*args, **kwargs):
+            calls.append(1)
+            return dmdt(*args, **kwargs)
+
+        monkeypatch.setattr(system.dynamics, "_dmdt", counting_dmdt)
+        evolver = mm.RungeKuttaEvolver(
+            tolerance=1, initial_timestep=1e-12, max_timestep=1e-12
+        )
+        assert evolver.evolve(system, t=1e-11) == 10
+        assert len(calls) == 1 + 6 * 10
+
+    def test_non_finite(self, monkeypatch):
+        # A non-finite error estimate is never accepted or reduced by smaller
+        # time steps.
+        system = mm.examples.macrospin()
+
+        def nan_dmdt(m, Ms, mesh, Heff, t=0, out=None):
+            out[...] = np.nan
+            return out
+
+        monkeypatch.setattr(system.dynamics, "_dmdt", nan_dmdt)
+        with pytest.raises(RuntimeError):
+            mm.RungeKuttaEvolver().evolve(system, t=1e-11)
+
+    def test_zero_Ms(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(4e-9, 1e-9, 1e-9), n=(4, 1, 1))
+        m = df.Field(
+            mesh, nvdim=3, value=(1, 1, 0), norm={"default": 8e5}, valid="norm"
+        )
+        m.array[2] = 0
+        system = mm.System(name="zero_Ms", m=m)
+        system.energy = mm.Exchange(A=1e-11) + mm.Zeeman(H=(0, 0, 1e5))
+        system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=0.5)
+        mm.RungeKuttaEvolver().evolve(system, t=1e-11)
+        norm = system.m.norm.array[..., 0]
+        assert np.allclose(norm[[0, 1, 3]], 8e5)
+        assert norm[2] == 0
+
+
+class TestStochasticHeunEvolver:
+    def test_init(self):
+        evolver = mm.StochasticHeunEvolver()
+        assert repr(evolver) == "StochasticHeunEvolver()"
+        assert evolver._setting("timestep") == 1e-14
+        evolver = mm.StochasticHeunEvolver(seed=np.random.SeedSequence(1))
+        assert isinstance(evolver.seed, np.random.SeedSequence)
+
+        with pytest.raises(ValueError):
+            mm.StochasticHeunEvolver(timestep=-1)
+        with pytest.raises(TypeError):
+            mm.StochasticHeunEvolver(seed=1.5)
+
+    def test_zero_temperature(self):
+        system = mm.examples.macrospin()
+        evolver = mm.StochasticHeunEvolver(timestep=1e-14)
+        assert evolver.evolve(system, t=2e-11, n=10) == 2000
+        expected = macrospin_orientation(2e-11)
+        assert np.allclose(system.m.orientation.array[0, 0, 0], expected, atol=1e-4)
+
+    def test_boltzmann(self):
+        # Independent macrospins in a field reach the Langevin distribution
+        # <mz> = coth(xi) - 1/xi with xi = mu0 Ms V H / (kB T).
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(20e-9, 20e-9, 2e-9), n=(20, 20, 2))
+        system = mm.System(name="thermal", T=300)
+        system.energy = mm.Zeeman(H=(0, 0, 1e7))
+        system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=1)
+        system.m = df.Field(mesh, nvdim=3, value=(1, 0, 0), norm=1e6)
+
+        evolver = mm.StochasticHeunEvolver(timestep=2e-15, seed=0)
+        evolver.evolve(system, t=5e-12)
+        mz = []
+        evolver.evolve(
+            system,
+            t=1e-11,
+            n=20,
+            callback=lambda i, t, m, Ms: mz.append(m[..., 2].mean()),
+        )
+        xi = mm.consts.mu0 * 1e6 * 1e-27 * 1e7 / (mm.consts.kB * 300)
+        assert np.mean(mz) == pytest.approx(1 / np.tanh(xi) - 1 / xi, abs=0.02)
+        assert np.allclose(system.m.norm.array, 1e6)
+
+    def test_reproducible(self):
+        def run(evolver):
+            system = mm.examples.macrospin()
+            system.T = 300
+            evolver.evolve(system, t=1e-12)
+            return system.m.array
+
+        assert np.array_equal(
+            run(mm.StochasticHeunEvolver(seed=3)), run(mm.StochasticHeunEvolver(seed=3))
+        )
+        assert not np.array_equal(
+            run(mm.StochasticHeunEvolver(seed=3)), run(mm.StochasticHeunEvolver(seed=4))
+        )
+
+        # The random stream continues in successive calls.
+        evolver = mm.StochasticHeunEvolver(seed=3)
+        assert not np.array_equal(run(evolver), run(evolver))
+        evolver.seed = 3
+        assert np.array_equal(run(evolver), run(mm.StochasticHeunEvolver(seed=3)))
+
+        # Spawned evolvers are reproducible and independent.
+        evolver = mm.StochasticHeunEvolver(timestep=5e-15, seed=3)
+        first, second = evolver.spawn(2), evolver.spawn(2)
+        assert [e.timestep for e in first] == [5e-15, 5e-15]
+        assert np.array_equal(run(first[0]), run(second[0]))
+        assert not np.array_equal(run(first[0]), run(first[1]))
+        assert len(mm.StochasticHeunEvolver().spawn(3)) == 3
+
+    def test_invalid(self):
+        system = mm.examples.macrospin()
+        system.T = 300
+        system.dynamics = mm.Damping(alpha=0.1)
+        with pytest.raises(ValueError):
+            mm.StochasticHeunEvolver().evolve(system, t=1e-12)
+
+
+def exchange_chain(cell=0.25e-9, n=32):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(n * cell, cell, cell), n=(n, 1, 1))
+    system = mm.System(name="chain")
+    system.energy = mm.Exchange(A=1e-11) + mm.Zeeman(H=(0, 0, 1e5))
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=0.5)
+    # Smooth initial state, so that fast exchange modes are hardly excited.
+    theta = np.linspace(0, np.pi / 2, n)
+    value = np.stack([np.sin(theta), np.zeros(n), np.cos(theta)], axis=-1)
+    system.m = df.Field(mesh, nvdim=3, value=value.reshape(n, 1, 1, 3), norm=8e5)
+    return system
+
+
+class TestBDFEvolver:
+    def test_init(self):
+        evolver = mm.BDFEvolver()
+        assert repr(evolver) == "BDFEvolver()"
+        assert evolver._setting("max_order") == 5
+        evolver = mm.BDFEvolver(tolerance=1e-7, max_order=2)
+        assert evolver._setting("tolerance") == 1e-7
+
+        with pytest.raises(ValueError):
+            mm.BDFEvolver(tolerance=0)
+        with pytest.raises(TypeError):
+            mm.BDFEvolver(max_order=2.5)
+        with pytest.raises(ValueError):
+            mm.BDFEvolver(max_order=6).evolve(mm.examples.macrospin(), t=1e-12)
+
+    def test_macrospin(self):
+        times, orientations = [], []
+
+        def callback(i, t, m, Ms):
+            times.append(t)
+            orientations.append(m[0, 0, 0].copy())
+
+        for max_order, atol in [(2, 1e-3), (5, 1e-4)]:
+            system = mm.examples.macrospin()
+            times.clear()
+            orientations.clear()
+            evolver = mm.BDFEvolver(tolerance=1e-7, max_order=max_order)
+            evolver.evolve(system, t=2e-10, n=10, callback=callback)
+            assert np.allclose(times, np.linspace(0, 2e-10, 11)[1:], rtol=0)
+            expected = np.array([macrospin_orientation(t) for t in times])
+            assert np.allclose(orientations, expected, atol=atol)
+            assert np.allclose(system.m.norm.array, 1e6)
+
+    def test_dense_sampling(self, monkeypatch):
+        orders = []
+        interpolate = mm.BDFEvolver._interpolate
+
+        def recording_interpolate(D, order, *args, **kwargs):
+            orders.append(order)
+            return interpolate(D, order, *args, **kwargs)
+
+        monkeypatch.setattr(
+            mm.BDFEvolver, "_interpolate", staticmethod(recording_interpolate)
+        )
+        times, orientations = [], []
+
+        def callback(i, t, m, Ms):
+            times.append(t)
+            orientations.append(m[0, 0, 0].copy())
+
+        evolver = mm.BDFEvolver(tolerance=1e-7)
+        system = mm.examples.macrospin()
+        sparse_steps = evolver.evolve(system, t=2e-10)
+        system = mm.examples.macrospin()
+        steps = evolver.evolve(system, t=2e-10, n=1000, callback=callback)
+
+        # Sampling does not change the steps, which are much longer than the
+        # sampling interval and use higher orders.
+        assert steps == sparse_steps
+        assert steps < 500
+        assert max(orders) >= 3
+        assert np.allclose(times, np.linspace(0, 2e-10, 1001)[1:], rtol=0)
+        expected = np.array([macrospin_orientation(t) for t in times])
+        assert np.allclose(orientations, expected, atol=1e-4)
+        assert np.allclose(np.linalg.norm(orientations, axis=-1), 1)
+
+    def test_renormalise_differences(self):
+        rng = np.random.default_rng(0)
+        D = rng.normal(size=(4, 3, 1, 1, 3))
+        D[1, 1] = 0
+        D[0, 1] = 0  # zero magnetisation is not changed
+        previous = D[0] - D[1]
+        higher = D[2:].copy()
+        mm.BDFEvolver._renormalise_differences(D, np.empty_like(D[0]))
+        assert np.allclose(np.linalg.norm(D[0, [0, 2]], axis=-1), 1)
+        assert np.array_equal(D[0, 1], np.zeros((1, 1, 3)))
+        assert np.allclose(D[0] - D[1], previous)
+        assert np.array_equal(D[2:], higher)
+
+    def test_stiff(self):
+        # Explicit methods are limited to time steps of about 3 / lambda, where
+        # lambda is the largest eigenvalue of the exchange-dominated Jacobian.
+        cell, alpha, t = 0.1e-9, 0.5, 1e-11
+        exchange_field = 8 * 1e-11 / (mm.consts.mu0 * 8e5 * cell**2)
+        rate = mm.consts.gamma0 / (1 + alpha**2) * exchange_field
+        explicit_steps = t * rate / 3
+
+        system = exchange_chain(cell=cell, n=16)
+        steps = mm.BDFEvolver().evolve(system, t=t)
+        assert steps < explicit_steps / 10
+
+        expected = exchange_chain(cell=cell, n=16)
+        mm.BDFEvolver(tolerance=1e-6).evolve(expected, t=t)
+        assert np.allclose(system.m.array, expected.m.array, rtol=0, atol=1e-4 * 8e5)
+
+    def test_preconditioner(self):
+        # Without a field, the cell-diagonal block of the Jacobian of the
+        # exchange-only dynamics equation is (I - P) / c.
+        system = exchange_chain(n=4)
+        system.energy = mm.Exchange(A=1e-11)
+        system.m = df.Field(system.m.mesh, nvdim=3, value=(1, 2, 2), norm=8e5)
+        m, Ms = mm.util.magnetisation_arrays(system.m)
+        rhs = mm.Evolver._rhs(system, Ms, np.empty_like(m))
+
+        preconditioner = mm.BDFEvolver._preconditioner(system, Ms)(1e-13, m)
+        block = np.empty((3, 3))
+        jacobian = np.empty((3, 3))
+        f = rhs(0, m, out=np.empty_like(m)).copy()
+        for j in range(3):
+            v = np.zeros_like(m)
+            v[1, 0, 0, j] = 1
+            block[:, j] = preconditioner.matvec(v.ravel()).reshape(m.shape)[1, 0, 0]
+            shifted = rhs(0, m + 1e-6 * v, out=np.empty_like(m))
+            jacobian[:, j] = (shifted - f)[1, 0, 0] / 1e-6
+        jacobian_block = (np.eye(3) - np.linalg.inv(block)) / 1e-13
+        assert np.allclose(jacobian_block, jacobian, rtol=1e-4, atol=1e-4 * 1e13)
+
+        system.energy = mm.Zeeman(H=(0, 0, 1e5))
+        assert mm.BDFEvolver._preconditioner(system, Ms)(1.0, m) is None
@@ -1,6 +1,7 @@
 import re
 
 import discretisedfield as df
+import numpy as np
 import pytest
 
 import micromagneticmodel as mm
@@ -30,3 +31,72 @@ class TestExchange:
 
         with pytest.raises(AttributeError):
             mm.Exchange(wrong=1)
+
+    def test_effective_field_uniform(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(10e-9, 5e-9, 3e-9), cell=(1e-9, 1e-9, 1e-9))
+        m = df.Field(mesh, nvdim=3, value=(0, 1, 1), norm=8e5)
+        for A in [1e-11, df.Field(mesh, nvdim=1, value=2e-11)]:
+            Heff = mm.Exchange(A=A).effective_field(m)
+            assert isinstance(Heff, df.Field)
+            assert Heff.nvdim == 3
+            assert np.allclose(Heff.array, 0)
+
+    def test_effective_field_spiral(self):
+        # Discrete Laplacian of a helix is proportional to the helix itself.
+        n, dx, A, Ms = 20, 1e-9, 1e-11, 8e5
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(n * dx, dx, dx), n=(n, 1, 1), bc="x")
+        k = 2 * np.pi / (n * dx)
+
+        def value(point):
+            x, _, _ = point
+            return (np.cos(k * x), np.sin(k * x), 0)
+
+        m = df.Field(mesh, nvdim=3, value=value, norm=Ms)
+        Heff = mm.Exchange(A=A).effective_field(m)
+        factor = 2 * A / (mm.consts.mu0 * Ms) * (2 * np.cos(k * dx) - 2) / dx**2
+        assert np.allclose(Heff.array, factor * m.array / Ms)
+
+        # Without periodic boundary conditions the ends are not coupled.
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(n * dx, dx, dx), n=(n, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=value, norm=Ms)
+        Heff = mm.Exchange(A=A).effective_field(m)
+        assert np.allclose(Heff.array[1:-1], factor * m.array[1:-1] / Ms)
+        assert not np.allclose(Heff.array[0], factor * m.array[0] / Ms)
+
+    def test_effective_field_regions(self):
+        subregions = {
+            "r1": df.Region(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9)),
+            "r2": df.Region(p1=(2e-9, 0, 0), p2=(4e-9, 1e-9, 1e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(4e-9, 1e-9, 1e-9), n=(4, 1, 1), subregions=subregions
+        )
+        m = df.Field(mesh, nvdim=3, value={"r1": (0, 0, 1), "r2": (1, 0, 0)}, norm=1)
+        A1, A2 = 1e-11, 3e-11
+        Heff = mm.Exchange(A={"r1": A1, "r2": A2}).effective_field(m)
+
+        # Cells at the interface are coupled with the harmonic mean.
+        A12 = 2 * A1 * A2 / (A1 + A2)
+        expected = 2 * A12 / (mm.consts.mu0 * 1e-18)
+        assert np.allclose(Heff.array[1, 0, 0], (expected, 0, -expected))
+        assert np.allclose(Heff.array[2, 0, 0], (-expected, 0, expected))
+        assert np.allclose(Heff.array[0, 0, 0], 0)
+        assert np.allclose(Heff.array[3, 0, 0], 0)
+
+        # Cells with zero saturation magnetisation are not coupled.
+        m = df.Field(mesh, nvdim=3, value={"r1": (0, 0, 1), "r2": (1, 0, 0)})
+        m.array[2:] = 0
+        Heff = mm.Exchange(A=A1).effective_field(m)
+        assert np.allclose(Heff.array, 0)
+
+    def test_cached_links(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(4e-9, 1e-9, 1e-9), n=(4, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+        exchange = mm.Exchange(A=1e-11)
+
+        # Saturation magnetisation arrays with equal values reuse the links.
+        links = exchange._links(mesh, mm.util.magnetisation_arrays(m)[1])
+        assert exchange._links(mesh, mm.util.magnetisation_arrays(m)[1]) is links
+
+        m.norm = 1e6
+        assert exchange._links(mesh, mm.util.magnetisation_arrays(m)[1]) is not links
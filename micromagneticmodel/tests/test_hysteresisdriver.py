@@ -0,0 +1,115 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+from micromagneticmodel.energy import demag
+
+
+def stoner_wohlfarth(K=1e5, Ms=1e6):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9), n=(1, 1, 1))
+    system = mm.System(name="stoner_wohlfarth")
+    system.energy = mm.UniaxialAnisotropy(K=K, u=(0, 0, 1)) + mm.Zeeman(H=(0, 0, 0))
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=Ms)
+    return system
+
+
+class TestHysteresisDriver:
+    def test_init(self):
+        hd = mm.HysteresisDriver(stopping_mxHxm=0.01)
+        assert repr(hd) == "HysteresisDriver(stopping_mxHxm=0.01)"
+        assert hd._x == "H"
+
+    def test_fields(self):
+        fields = mm.HysteresisDriver._fields(Hmin=(0, 0, -1), Hmax=(0, 0, 1), n=3)
+        assert np.array_equal(fields[:, 2], [1, 0, -1, 0, 1])
+        fields = mm.HysteresisDriver._fields(
+            Hsteps=[((0, 0, 0), (0, 0, 2), 3), ((0, 0, 2), (0, 1, 2), 2)]
+        )
+        assert np.array_equal(fields, [[0, 0, 0], [0, 0, 1], [0, 0, 2], [0, 1, 2]])
+
+        with pytest.raises(ValueError):
+            mm.HysteresisDriver._fields(Hmin=(0, 0, -1), n=3)
+        with pytest.raises(ValueError):
+            mm.HysteresisDriver._fields(Hsteps=[((0, 0, 0), (0, 0, 1), 0)])
+
+    def test_switching(self):
+        # Stoner-Wohlfarth switching field for a field at angle psi to the easy
+        # axis in units of the anisotropy field 2K/(mu0 Ms).
+        psi = np.radians(5)
+        h_sw = (np.cos(psi) ** (2 / 3) + np.sin(psi) ** (2 / 3)) ** (-3 / 2)
+        system = stoner_wohlfarth()
+        HK = 2 * 1e5 / (mm.consts.mu0 * 1e6)
+        direction = np.array([0, np.sin(psi), np.cos(psi)])
+        n = 201
+        hd = mm.HysteresisDriver(stopping_mxHxm=1e-3)
+        hd.drive(system, Hmin=-1.5 * HK * direction, Hmax=1.5 * HK * direction, n=n)
+
+        table = system.records
+        assert table.dtype.names[:7] == ("Hx", "Hy", "Hz", "mx", "my", "mz", "E")
+        assert len(table) == 2 * n - 1
+        h = table["Hz"] / (HK * np.cos(psi))
+        down, up = slice(0, n), slice(n - 1, None)
+        switch_down = h[down][np.argmax(table["mz"][down] < 0)]
+        switch_up = h[up][np.argmax(table["mz"][up] > 0)]
+        assert switch_down == pytest.approx(-h_sw, abs=0.02)
+        assert switch_up == pytest.approx(h_sw, abs=0.02)
+        assert np.allclose(system.m.orientation.array, direction, atol=0.1)
+
+        # The field of the Zeeman energy term is restored.
+        assert system.energy.zeeman.H == (0, 0, 0)
+        assert system.drive_number == 1
+
+    def test_warm_start(self, monkeypatch):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(20e-9, 10e-9, 5e-9), cell=(5e-9, 5e-9, 5e-9))
+        system = mm.System(name="film")
+        system.energy = mm.Exchange(A=1e-11) + mm.Demag() + mm.Zeeman(H=(0, 0, 0))
+        system.m = df.Field(mesh, nvdim=3, value=(1, 0, 0), norm=8e5)
+
+        iterations = []
+        minimise = mm.HysteresisDriver._minimise
+
+        def counting_minimise(self, *args, **kwargs):
+            iterations.append(minimise(self, *args, **kwargs))
+            return iterations[-1]
+
+        monkeypatch.setattr(mm.HysteresisDriver, "_minimise", counting_minimise)
+        mm.HysteresisDriver().drive(system, Hsteps=[((1e5, 0, 0), (1e5, 0, 0), 3)])
+        misses = demag._kernel.cache_info().misses
+        mm.HysteresisDriver().drive(system, Hsteps=[((1e5, 0, 0), (1e5, 0, 0), 3)])
+        # The demagnetisation kernel is reused and repeated equilibria are
+        # found without iterations.
+        assert demag._kernel.cache_info().misses == misses
+        assert iterations[1:] == [0] * 5
+        assert len(system.records) == 3
+
+    def test_not_converged(self):
+        system = stoner_wohlfarth()
+        system.m = df.Field(system.m.mesh, nvdim=3, value=(1, 0, 1), norm=1e6)
+        with pytest.warns(RuntimeWarning) as record:
+            mm.HysteresisDriver(max_iterations=1).drive(
+                system, Hsteps=[((0, 0, 0), (0, 0, 0), 1)]
+            )
+        # The warning points to the caller of drive.
+        assert record[0].filename == __file__
+
+    def test_invalid(self):
+        system = mm.examples.macrospin()
+        system.energy = mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1))
+        hd = mm.HysteresisDriver()
+        with pytest.raises(ValueError):
+            hd.drive(system, Hmin=(0, 0, -1), Hmax=(0, 0, 1), n=3)
+        with pytest.raises(ValueError):
+            hd.drive(system)
+
+        # Spatially varying fields cannot be stepped.
+        mesh = system.m.mesh
+        for H in [
+            {"default": (0, 0, 1e5)},
+            df.Field(mesh, nvdim=3, value=(0, 0, 1e5)),
+        ]:
+            system.energy = mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1)) + mm.Zeeman(H=H)
+            with pytest.raises(ValueError):
+                hd.drive(system, Hmin=(0, 0, -1), Hmax=(0, 0, 1), n=3)
+            assert system.energy.zeeman.H is H
+        assert system.drive_number == 0
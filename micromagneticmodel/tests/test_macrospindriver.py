@@ -0,0 +1,170 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+from .test_evolver import macrospin_orientation
+
+
+def macrospins(alphas=(0.01, 0.1, 0.5), Hs=(1e6, 5e5, 2e6)):
+    systems = []
+    for alpha, H in zip(alphas, Hs):
+        system = mm.examples.macrospin()
+        system.energy.zeeman.H = (0, 0, H)
+        system.dynamics.damping.alpha = alpha
+        systems.append(system)
+    return systems
+
+
+class TestMacrospinDriver:
+    def test_init(self):
+        md = mm.MacrospinDriver()
+        assert repr(md) == "MacrospinDriver()"
+        assert md._x == "t"
+
+        with pytest.raises(TypeError):
+            mm.MacrospinDriver(evolver=1)
+
+    def test_analytic(self):
+        alphas, Hs = (0.01, 0.1, 0.5), (1e6, 5e5, 2e6)
+        systems = macrospins(alphas, Hs)
+        md = mm.MacrospinDriver(evolver=mm.RungeKuttaEvolver(tolerance=1e-7))
+        md.drive(systems, t=5e-11, n=20)
+
+        for system, alpha, H in zip(systems, alphas, Hs):
+            assert system.drive_number == 1
+            assert system.m.mesh.n.tolist() == [1, 1, 1]
+            table = system.records
+            assert table.dtype.names == ("t", "mx", "my", "mz")
+            assert np.allclose(table["t"], np.linspace(0, 5e-11, 21)[1:], rtol=0)
+            expected = np.array(
+                [macrospin_orientation(t, alpha=alpha, H=H) for t in table["t"]]
+            )
+            for i, column in enumerate(("mx", "my", "mz")):
+                assert np.allclose(table[column], expected[:, i], atol=1e-5)
+            assert np.allclose(system.m.orientation.mean(), expected[-1], atol=1e-5)
+            assert np.isclose(np.linalg.norm(system.m.mean()), 1e6)
+
+    def test_individual(self):
+        # Macrospins with anisotropy, demagnetisation and spin-transfer torque
+        # agree with driving every system on its own.
+        systems = []
+        for K, J in [(1e5, 1e11), (-2e4, 5e10), (3e5, 0)]:
+            mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(1, 1, 1))
+            system = mm.System(name="macrospin")
+            system.energy = (
+                mm.Zeeman(H=(1e4, 0, 1e5))
+                + mm.UniaxialAnisotropy(K=K, u=(0, 1, 1))
+                + mm.Demag()
+                + mm.Exchange(A=1e-11)
+            )
+            system.dynamics = (
+                mm.Precession(gamma0=mm.consts.gamma0)
+                + mm.Damping(alpha=0.05)
+                + mm.Slonczewski(J=J, mp=(1, 0, 0), P=0.4, Lambda=2)
+            )
+            system.m = df.Field(mesh, nvdim=3, value=(1, 0.3, -1), norm=8e5)
+            systems.append(system)
+
+        expected = []
+        evolver = mm.RungeKuttaEvolver(tolerance=1e-7)
+        for system in systems:
+            single = system.__class__(name=system.name)
+            single.energy = system.energy
+            single.dynamics = system.dynamics
+            single.m = system.m
+            evolver.evolve(single, 2e-11)
+            expected.append(single.m.array)
+
+        mm.MacrospinDriver(evolver=evolver).drive(systems, t=2e-11, n=4)
+        for system, array in zip(systems, expected):
+            assert np.allclose(system.m.array, array, rtol=0, atol=1)
+
+    def test_cell_demag(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9), n=(1, 1, 1))
+        batch = mm.MacrospinDriver()._pack(
+            [
+                mm.System(
+                    name="s", energy=mm.Demag(), m=df.Field(mesh, nvdim=3, value=v)
+                )
+                for v in [(0, 0, 1e6), (1e6, 0, 0)]
+            ]
+        )
+        m, Ms = mm.util.magnetisation_arrays(batch.m)
+        H = batch.energy._effective_field(m, Ms, batch.m.mesh)
+        assert np.allclose(H[:, 0, 0], [[0, 0, -1e6 / 3], [-1e6 / 3, 0, 0]])
+
+    def test_pack(self):
+        systems = macrospins()
+        systems[0].energy += mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1))
+        systems[1].energy += mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1))
+        systems[2].energy += mm.UniaxialAnisotropy(K=2e5, u=(0, 0, 1))
+        batch = mm.MacrospinDriver()._pack(systems)
+
+        assert batch.m.mesh.n.tolist() == [3, 1, 1]
+        assert isinstance(batch.energy.zeeman.H, df.Field)
+        assert batch.energy.zeeman.H.array[:, 0, 0, 2].tolist() == [1e6, 5e5, 2e6]
+        assert batch.energy.uniaxialanisotropy.u == (0, 0, 1)
+        assert batch.energy.uniaxialanisotropy.K.array.ravel().tolist() == [
+            1e5,
+            1e5,
+            2e5,
+        ]
+        assert batch.dynamics.precession.gamma0 == mm.consts.gamma0
+        assert isinstance(batch.dynamics.damping.alpha, df.Field)
+
+    def test_temperature(self):
+        # Identical macrospins get independent thermal fields.
+        systems = macrospins(alphas=(0.1, 0.1), Hs=(1e6, 1e6))
+        for system in systems:
+            system.T = 300
+        evolver = mm.StochasticHeunEvolver(timestep=1e-13, seed=1)
+        assert mm.MacrospinDriver(evolver=evolver)._pack(systems).T == 300
+        mm.MacrospinDriver(evolver=evolver).drive(systems, t=1e-11, n=5)
+        assert not np.allclose(systems[0].records["mx"], systems[1].records["mx"])
+        assert not np.allclose(systems[0].m.array, systems[1].m.array)
+
+        systems[1].T = 200
+        with pytest.raises(ValueError):
+            mm.MacrospinDriver(evolver=evolver).drive(systems, t=1e-11)
+
+        # The default evolver includes the thermal field, deterministic
+        # evolvers are rejected.
+        systems[1].T = 300
+        mm.MacrospinDriver().drive(systems, t=1e-12, n=2)
+        assert not np.allclose(systems[0].m.array, systems[1].m.array)
+        with pytest.raises(ValueError):
+            mm.MacrospinDriver(evolver=mm.RungeKuttaEvolver()).drive(systems, t=1e-12)
+
+    def test_invalid(self):
+        md = mm.MacrospinDriver()
+        with pytest.raises(ValueError):
+            md.drive([], t=1e-12)
+
+        systems = macrospins()
+        with pytest.raises(ValueError):
+            md.drive(systems, t=0)
+
+        systems[0].energy += mm.Demag()
+        with pytest.raises(ValueError):
+            md.drive(systems, t=1e-12)
+
+        systems = macrospins()
+        systems[0].energy.zeeman.func = "sin"
+        systems[0].energy.zeeman.f = 1e9
+        systems[0].energy.zeeman.t0 = 0
+        with pytest.raises(ValueError):
+            md.drive(systems, t=1e-12)
+
+        systems = macrospins()
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        systems[1].m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=1e6)
+        with pytest.raises(ValueError):
+            md.drive(systems, t=1e-12)
+
+        systems = macrospins()
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(1, 1, 1))
+        systems[1].m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=1e6)
+        with pytest.raises(ValueError):
+            md.drive(systems, t=1e-12)
+        assert all(system.drive_number == 0 for system in systems)
@@ -1,6 +1,7 @@
 import re
 
 import discretisedfield as df
+import numpy as np
 import pytest
 
 import micromagneticmodel as mm
@@ -49,3 +50,58 @@ class TestMagnetoElastic:
 
         with pytest.raises(AttributeError):
             mm.MagnetoElastic(wrong=1)
+
+    def test_effective_field(self):
+        subregions = {"r1": df.Region(p1=(0, 0, 0), p2=(2e-9, 2e-9, 1e-9))}
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(4e-9, 2e-9, 1e-9), n=(4, 2, 1), subregions=subregions
+        )
+        rng = np.random.default_rng(1)
+        Ms = df.Field(mesh, nvdim=1, value=8e5)
+        Ms.array[0, 0, 0] = 0
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 2, 1, 3)), norm=Ms)
+        e_diag = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 2, 1, 3)))
+        B1, B2 = {"r1": 2e7, "default": -1e7}, 5e6
+        e_offdiag = (1e-3, -2e-3, 3e-3)
+
+        term = mm.MagnetoElastic(B1=B1, B2=B2, e_diag=e_diag, e_offdiag=e_offdiag)
+        Heff = term.effective_field(m)
+        assert isinstance(Heff, df.Field)
+
+        m_array, Ms_array = mm.util.magnetisation_arrays(m)
+        B1_array = df.Field(mesh, nvdim=1, value=B1).array
+        eps = np.zeros((4, 2, 1, 3, 3))
+        for i in range(3):
+            eps[..., i, i] = B1_array[..., 0] * e_diag.array[..., i]
+        for k, (i, j) in enumerate([(1, 2), (0, 2), (0, 1)]):
+            eps[..., i, j] = eps[..., j, i] = B2 * e_offdiag[k]
+        expected = np.einsum("...ij,...j->...i", eps, m_array)
+        expected *= -2 / (mm.consts.mu0 * np.where(Ms_array > 0, Ms_array, np.inf))
+        assert np.allclose(Heff.array, expected)
+        assert np.allclose(Heff.array[0, 0, 0], 0)
+
+        out = np.full_like(m.array, np.nan)
+        assert term.effective_field(m, out=out) is out
+        assert np.allclose(out, expected)
+
+    def test_effective_field_coefficients(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(0.6, 0, 0.8), norm=1e6)
+        term = mm.MagnetoElastic(B1=1e7, B2=0, e_diag=(1e-3, 0, 0), e_offdiag=(0, 0, 0))
+        coefficients = term._coefficients(mesh)
+        assert term._coefficients(mesh) is coefficients
+        H = term.effective_field(m).array
+        assert np.allclose(H[..., 0], -2 * 1e7 * 1e-3 * 0.6 / (mm.consts.mu0 * 1e6))
+        assert np.allclose(H[..., 1:], 0)
+
+        term.B2 = 1e7
+        term.e_offdiag = (0, 1e-3, 0)  # eps13
+        assert term._coefficients(mesh) is not coefficients
+        H = term.effective_field(m).array
+        factor = -2 * 1e7 * 1e-3 / (mm.consts.mu0 * 1e6)
+        assert np.allclose(H[..., 0], factor * (0.6 + 0.8))
+        assert np.allclose(H[..., 1], 0)
+        assert np.allclose(H[..., 2], factor * 0.6)
+
+        with pytest.raises(ValueError):
+            mm.MagnetoElastic(B1=1e7).effective_field(m)
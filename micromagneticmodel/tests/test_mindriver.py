@@ -0,0 +1,105 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+
+
+def max_torque(system):
+    m, Ms = mm.util.magnetisation_arrays(system.m)
+    H = system.energy.effective_field(system.m).array
+    return np.max(np.linalg.norm(np.cross(m, H), axis=-1))
+
+
+class TestMinDriver:
+    def test_init(self):
+        md = mm.MinDriver()
+        assert repr(md) == "MinDriver()"
+        assert md._x == "iteration"
+        assert md._setting("stopping_mxHxm") == 0.1
+
+        with pytest.raises(ValueError):
+            mm.MinDriver(stopping_mxHxm=0)
+        with pytest.raises(TypeError):
+            mm.MinDriver(max_iterations=1.5)
+        with pytest.raises(AttributeError):
+            mm.MinDriver(evolver=None)
+
+    def test_macrospin(self):
+        system = mm.examples.macrospin()
+        md = mm.MinDriver(stopping_mxHxm=1e-3)
+        md.drive(system)
+        assert np.allclose(system.m.orientation.array, (0, 0, 1), atol=1e-8)
+        assert np.allclose(system.m.norm.array, 1e6)
+        assert system.drive_number == 1
+
+    def test_anisotropy(self):
+        # Equilibrium angle sin(theta) = mu0 Ms H / (2 K) for a field
+        # perpendicular to the easy axis.
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 2e-9, 2e-9), n=(2, 2, 2))
+        system = mm.System(name="anisotropy")
+        K, Ms, H = 1e5, 8e5, 1e5
+        system.energy = mm.UniaxialAnisotropy(K=K, u=(0, 0, 1)) + mm.Zeeman(H=(H, 0, 0))
+        system.m = df.Field(mesh, nvdim=3, value=(0.1, 0.2, 1), norm=Ms)
+        mm.MinDriver(stopping_mxHxm=1e-3).drive(system)
+        sin_theta = mm.consts.mu0 * Ms * H / (2 * K)
+        expected = (sin_theta, 0, np.sqrt(1 - sin_theta**2))
+        assert np.allclose(system.m.orientation.array, expected, atol=1e-6)
+
+    def test_random(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(100e-9, 50e-9, 5e-9), cell=(5e-9, 5e-9, 5e-9))
+        rng = np.random.default_rng(0)
+        system = mm.System(name="random")
+        system.energy = mm.Exchange(A=1.3e-11) + mm.Demag() + mm.Zeeman(H=(1e4, 0, 0))
+        system.m = df.Field(mesh, nvdim=3, value=rng.normal(size=(20, 10, 1, 3)))
+        system.m.norm = 8e5
+        energy = system.energy.energy(system.m)
+
+        mm.MinDriver().drive(system)
+        assert system.energy.energy(system.m) < energy
+        assert max_torque(system) <= 0.1
+        assert np.allclose(system.m.norm.array, 8e5)
+        assert abs(system.m.orientation.mean()[0]) > 0.9  # (meta)stable along x
+
+    def test_weighted_step_size(self):
+        # The energy gradient is proportional to Ms, which weights the cells in
+        # the step sizes.
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(100e-9, 50e-9, 5e-9), cell=(5e-9, 5e-9, 5e-9))
+        system = mm.System(name="two_materials")
+        system.energy = (
+            mm.Exchange(A=1.3e-11)
+            + mm.UniaxialAnisotropy(K=1e4, u=(0, 1, 0))
+            + mm.Zeeman(H=(1e4, 0, 0))
+        )
+        rng = np.random.default_rng(0)
+        system.m = df.Field(
+            mesh,
+            nvdim=3,
+            value=rng.normal(size=(20, 10, 1, 3)),
+            norm=lambda p: 8e5 if p[0] < 50e-9 else 8e3,
+        )
+        md = mm.MinDriver()
+        m, Ms = mm.util.magnetisation_arrays(system.m)
+        H = np.empty_like(m)
+
+        def descent(m, out, scalar):
+            system.energy._effective_field(m, Ms, mesh, out=H)
+            np.einsum("...i,...i->...", m, H, out=scalar[..., 0])
+            np.multiply(scalar, m, out=out)
+            np.subtract(H, out, out=out)
+
+        iterations = {}
+        for name, weights in [("Ms", Ms), ("uniform", np.ones_like(Ms))]:
+            m_relaxed = m.copy()
+            iterations[name] = md._descend(m_relaxed, descent, weights)
+        assert iterations["Ms"] < iterations["uniform"]
+
+    def test_not_converged(self):
+        system = mm.examples.macrospin()
+        with pytest.warns(RuntimeWarning) as record:
+            mm.MinDriver(max_iterations=1).drive(system)
+        # The warning points to the caller of drive.
+        assert record[0].filename == __file__
+
+        with pytest.raises(ValueError):
+            mm.MinDriver().drive(mm.System(name="no_m"))
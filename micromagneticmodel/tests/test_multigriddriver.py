@@ -0,0 +1,134 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+
+
+def random_system(n=(16, 16, 2), seed=1):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(4e-9 * n[0], 4e-9 * n[1], 2e-9 * n[2]), n=n)
+    system = mm.System(name="random")
+    system.energy = (
+        mm.Exchange(A=1e-11)
+        + mm.UniaxialAnisotropy(K=5e4, u=(0, 0, 1))
+        + mm.Zeeman(H=(0, 0, 1e5))
+        + mm.Demag()
+    )
+    rng = np.random.default_rng(seed)
+    system.m = df.Field(mesh, nvdim=3, value=rng.normal(size=(*n, 3)), norm=8e5)
+    return system
+
+
+class TestMultigridDriver:
+    def test_init(self):
+        mgd = mm.MultigridDriver()
+        assert repr(mgd) == "MultigridDriver()"
+        assert mgd._x == "level"
+        assert mgd._setting("levels") == 3
+        mgd = mm.MultigridDriver(levels=1, stopping_mxHxm=0.01)
+        assert mgd._setting("stopping_mxHxm") == 0.01
+
+        with pytest.raises(ValueError):
+            mm.MultigridDriver(levels=0)
+        with pytest.raises(TypeError):
+            mm.MultigridDriver(levels=1.5)
+
+    def test_relax(self):
+        system = random_system()
+        reference = random_system()
+        m, Ms = mm.util.magnetisation_arrays(reference.m)
+        iterations = mm.MinDriver()._minimise(reference, m, Ms)
+        reference.m = mm.util.magnetisation_field(reference.m, m, Ms)
+
+        mm.MultigridDriver(levels=3).drive(system)
+        table = system.records
+        assert system.drive_number == 1
+        assert table.dtype.names == ("level", "cells", "iterations")
+        assert np.array_equal(table["level"], [3, 2, 1, 0])
+        assert np.array_equal(table["cells"], [4, 16, 64, 512])
+        # The same equilibrium with fewer iterations on the original mesh.
+        assert table["iterations"][-1] < iterations / 2
+        assert system.energy.energy(system.m) == pytest.approx(
+            reference.energy.energy(reference.m), rel=1e-6
+        )
+        assert np.allclose(system.m.norm.array, 8e5)
+        assert system.m.mesh == reference.m.mesh
+
+    def test_parameters(self):
+        subregions = {
+            "left": df.Region(p1=(0, 0, 0), p2=(8e-9, 4e-9, 2e-9)),
+            "right": df.Region(p1=(8e-9, 0, 0), p2=(16e-9, 4e-9, 2e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(16e-9, 4e-9, 2e-9), n=(8, 2, 1), subregions=subregions
+        )
+        K = df.Field(mesh, nvdim=1, value=lambda p: 1e5 if p[0] < 2e-9 else 0)
+        system = mm.System(name="parameters")
+        system.energy = (
+            mm.Exchange(A={"left": 1e-11, "right": 2e-11})
+            + mm.UniaxialAnisotropy(K=K, u=(0, 0, 1))
+            + mm.Zeeman(H=(0, 0, 1e5), func="sin", f=1e9)
+        )
+        Ms = df.Field(mesh, nvdim=1, value=lambda p: 8e5 if p[0] < 12e-9 else 0)
+        system.m = df.Field(mesh, nvdim=3, value=(1, 0, 0), norm=Ms)
+
+        mgd = mm.MultigridDriver()
+        coarse, m, coarse_Ms, factors = mgd._coarsen(
+            system, *mm.util.magnetisation_arrays(system.m)
+        )
+        assert factors == (2, 2, 1)
+        assert coarse.m.mesh.n.tolist() == [4, 1, 1]
+        assert coarse.m.mesh.subregions == mesh.subregions
+        assert np.allclose(coarse_Ms[..., 0], [[[8e5]], [[8e5]], [[8e5]], [[0]]])
+        assert np.allclose(m[:3], (1, 0, 0))
+        assert np.allclose(m[3], 0)
+        assert coarse.energy.exchange.A == {"left": 1e-11, "right": 2e-11}
+        assert coarse.energy.zeeman.func == "sin"
+        restricted = coarse.energy.uniaxialanisotropy.K
+        assert restricted.mesh == coarse.m.mesh
+        assert np.allclose(restricted.array[..., 0], [[[5e4]], [[0]], [[0]], [[0]]])
+        # Terms of the system are not changed.
+        assert system.energy.uniaxialanisotropy.K is K
+
+        # Only the x direction can be coarsened further, and subregions are not
+        # aligned with a single cell.
+        coarse, m, coarse_Ms, factors = mgd._coarsen(coarse, m, coarse_Ms)
+        assert factors == (2, 1, 1)
+        assert mgd._coarsen(coarse, m, coarse_Ms) is None
+
+        mgd.drive(system)
+        assert np.array_equal(system.records["cells"], [2, 4, 16])
+        assert np.allclose(system.m.norm.array, Ms.array)
+
+    def test_cancelled(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(4e-9, 2e-9, 2e-9), n=(2, 1, 1))
+        system = mm.System(name="cancelled", energy=mm.Exchange(A=1e-11))
+        system.m = df.Field(
+            mesh,
+            nvdim=3,
+            value=np.array([[[[0, 0, 1e6]]], [[[0, 0, -1e6]]]]),
+        )
+        m, Ms = mm.util.magnetisation_arrays(system.m)
+        _, coarse_m, coarse_Ms, _ = mm.MultigridDriver()._coarsen(system, m, Ms)
+        assert np.allclose(coarse_m, (0, 0, 1))
+        assert np.allclose(coarse_Ms, 1e6)
+
+    def test_uncoarsenable(self):
+        system = mm.examples.macrospin()
+        mm.MultigridDriver().drive(system)
+        assert np.array_equal(system.records["level"], [0])
+        assert np.allclose(system.m.orientation.array, (0, 0, 1), atol=1e-6)
+
+    def test_not_converged(self):
+        system = random_system(n=(4, 4, 1))
+        with pytest.warns(RuntimeWarning) as record:
+            mm.MultigridDriver(max_iterations=1).drive(system)
+        # The warnings point to the caller of drive.
+        assert {warning.filename for warning in record} == {__file__}
+
+    def test_invalid(self):
+        system = mm.examples.macrospin()
+        system.m = None
+        with pytest.raises(ValueError):
+            mm.MultigridDriver().drive(system)
+        assert system.drive_number == 0
@@ -0,0 +1,179 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+from micromagneticmodel.energy import demag
+
+
+def macrospin_states(K=1e5, Ms=1e6, H=0, cell=5e-9):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(cell, cell, cell), n=(1, 1, 1))
+    energy = mm.UniaxialAnisotropy(K=K, u=(0, 0, 1)) + mm.Zeeman(H=(0, 0, H))
+    initial = mm.System(name="initial", energy=energy)
+    initial.m = df.Field(mesh, nvdim=3, value=(0, 0, -1), norm=Ms)
+    final = mm.System(name="final", energy=energy)
+    final.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=Ms)
+    return initial, final
+
+
+class TestNEBDriver:
+    def test_init(self):
+        nebd = mm.NEBDriver()
+        assert repr(nebd) == "NEBDriver()"
+        assert nebd._x == "distance"
+        assert nebd._setting("spring_constant") == 1e5
+        assert nebd._setting("climbing_image") is False
+        nebd = mm.NEBDriver(climbing_image=True, stopping_mxHxm=0.01)
+        assert nebd._setting("stopping_mxHxm") == 0.01
+
+        with pytest.raises(TypeError):
+            mm.NEBDriver(climbing_image=1)
+        with pytest.raises(ValueError):
+            mm.NEBDriver(spring_constant=-1)
+
+    @pytest.mark.parametrize("climbing_image, n", [(False, 5), (True, 4)])
+    def test_macrospin_barrier(self, climbing_image, n):
+        # Barrier of a macrospin with the field along the easy axis, starting
+        # from the metastable state: K V (1 - h)**2 with h = mu0 Ms H / (2 K).
+        # The initial path crosses the hard axis and relaxes to the
+        # perpendicular plane.
+        K, Ms, H, cell = 1e5, 1e6, 4e4, 5e-9
+        initial, final = macrospin_states(K=K, Ms=Ms, H=H, cell=cell)
+        hard_axis = np.array([1, 0.2, 0]) / np.linalg.norm([1, 0.2, 0])
+        initial.energy += mm.UniaxialAnisotropy(K=-2e4, u=hard_axis, name="hard")
+        nebd = mm.NEBDriver(climbing_image=climbing_image, stopping_mxHxm=1e-3)
+        nebd.drive(initial, final, n=n)
+
+        table = initial.records
+        assert initial.drive_number == 1
+        assert table.dtype.names == (
+            "distance",
+            "E",
+            "E_uniaxialanisotropy",
+            "E_zeeman",
+            "E_hard",
+        )
+        assert table.shape == (n + 2,)
+        assert np.allclose(
+            table["E"],
+            table["E_uniaxialanisotropy"] + table["E_zeeman"] + table["E_hard"],
+        )
+        h = mm.consts.mu0 * Ms * H / (2 * K)
+        barrier = table["E"].max() - table["E"][0]
+        expected = K * cell**3 * (1 - h) ** 2
+        if climbing_image:
+            assert barrier == pytest.approx(expected, rel=1e-6)
+        else:
+            # No image is at the saddle point.
+            assert 0.8 * expected < barrier < expected
+
+        # Images along half a great circle perpendicular to the hard axis,
+        # equally spaced without the climbing image.
+        for image in initial.images:
+            assert image.orientation.array[0, 0, 0] @ hard_axis == pytest.approx(
+                0, abs=1e-6
+            )
+        assert table["distance"][-1] == pytest.approx(np.pi)
+        if not climbing_image:
+            assert np.allclose(np.diff(table["distance"]), np.pi / (n + 1))
+
+        # End states are not changed.
+        assert len(initial.images) == n + 2
+        assert np.allclose(initial.images[0].array, initial.m.array)
+        assert np.allclose(initial.images[-1].array, final.m.array)
+        assert np.allclose(initial.m.orientation.array, (0, 0, -1))
+
+    def test_batched_energies(self):
+        # Energies of all images are evaluated together, with a single demag
+        # kernel.
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(20e-9, 5e-9, 5e-9), n=(4, 1, 1))
+        energy = (
+            mm.Exchange(A=1e-11)
+            + mm.UniaxialAnisotropy(K=3e5, u=(1, 0, 0))
+            + mm.Demag()
+        )
+        initial = mm.System(name="initial", energy=energy)
+        initial.m = df.Field(mesh, nvdim=3, value=(1, 0, 0), norm=8e5)
+        final = mm.System(name="final", energy=energy)
+        final.m = df.Field(mesh, nvdim=3, value=(-1, 0, 0), norm=8e5)
+
+        misses = demag._kernel.cache_info().misses
+        mm.NEBDriver(climbing_image=True).drive(initial, final, n=3)
+        assert demag._kernel.cache_info().misses - misses <= 1
+
+        for image, E in zip(initial.images, initial.records["E"]):
+            assert energy.energy(image) == pytest.approx(E, rel=1e-9)
+            assert np.allclose(image.norm.array, 8e5)
+        assert initial.records["E"].max() > initial.records["E"][0]
+
+    def test_discretisation(self):
+        # The same macrospin path on one cell and on a mesh with two identical
+        # and two empty cells.
+        K, Ms, H, cell = 1e5, 1e6, 4e4, 5e-9
+        hard_axis = np.array([1, 0.2, 0]) / np.linalg.norm([1, 0.2, 0])
+        records = []
+        for n, norm in [
+            (1, Ms),
+            (4, lambda p: Ms if p[0] < cell or p[0] > 3 * cell else 0),
+        ]:
+            mesh = df.Mesh(p1=(0, 0, 0), p2=(n * cell, cell, cell), n=(n, 1, 1))
+            energy = (
+                mm.UniaxialAnisotropy(K=K, u=(0, 0, 1))
+                + mm.UniaxialAnisotropy(K=-2e4, u=hard_axis, name="hard")
+                + mm.Zeeman(H=(0, 0, H))
+            )
+            initial = mm.System(name="initial", energy=energy)
+            initial.m = df.Field(mesh, nvdim=3, value=(0, 0, -1), norm=norm)
+            final = mm.System(name="final", energy=energy)
+            final.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=norm)
+            mm.NEBDriver(stopping_mxHxm=1e-3).drive(initial, final, n=4)
+            records.append(initial.records)
+
+        single, mesh = records
+        assert np.allclose(mesh["distance"], single["distance"])
+        assert np.allclose(mesh["E"] / 2, single["E"], rtol=1e-6)
+
+    def test_interpolate(self):
+        a = np.array([[[[0, 0, 1]]], [[[1, 0, 0]]], [[[0, 0, 0]]]], dtype=float)
+        b = np.array([[[[0, 0, -1]]], [[[0, 1, 0]]], [[[0, 0, 0]]]], dtype=float)
+        band = mm.NEBDriver._interpolate(a, b, np.linspace(0, 1, 5))
+        assert band.shape == (5, 3, 1, 1, 3)
+        assert np.array_equal(band[0], a)
+        assert np.array_equal(band[-1], b)
+        assert np.allclose(np.linalg.norm(band[:, :2], axis=-1), 1)
+        assert np.array_equal(band[:, 2], np.zeros((5, 1, 1, 3)))
+        assert np.allclose(band[2, 1, 0, 0], np.array([1, 1, 0]) / np.sqrt(2))
+
+        weights = mm.NEBDriver._weights(np.array([[[[2]]], [[[1]]], [[[0]]]]))
+        distances = mm.NEBDriver._distances(band, weights)
+        angles = np.sqrt(2 / 3 * np.pi**2 + 1 / 3 * (np.pi / 2) ** 2) / 4
+        assert np.allclose(distances, angles)
+
+    def test_not_converged(self):
+        initial, final = macrospin_states()
+        hard_axis = np.array([1, 0.2, 0]) / np.linalg.norm([1, 0.2, 0])
+        initial.energy += mm.UniaxialAnisotropy(K=-2e4, u=hard_axis, name="hard")
+        with pytest.warns(RuntimeWarning) as record:
+            mm.NEBDriver(max_iterations=1).drive(initial, final, n=3)
+        # The warning points to the caller of drive.
+        assert record[0].filename == __file__
+
+    def test_invalid(self):
+        nebd = mm.NEBDriver()
+        initial, final = macrospin_states()
+        with pytest.raises(ValueError):
+            nebd.drive(initial, final, n=0)
+
+        final.m = df.Field(
+            df.Mesh(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9), n=(1, 1, 1)),
+            nvdim=3,
+            value=(0, 0, 1),
+            norm=1e6,
+        )
+        with pytest.raises(ValueError):
+            nebd.drive(initial, final, n=3)
+
+        final.m = None
+        with pytest.raises(ValueError):
+            nebd.drive(initial, final, n=3)
+        assert initial.drive_number == 0
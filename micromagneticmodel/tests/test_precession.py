@@ -1,6 +1,7 @@
 import re
 
 import discretisedfield as df
+import numpy as np
 import pytest
 
 import micromagneticmodel as mm
@@ -39,3 +40,24 @@ class TestPrecession:
 
         with pytest.raises(AttributeError):
             mm.Precession(wrong=1)
+
+    def test_dmdt(self):
+        subregions = {"r1": df.Region(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9))}
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1), subregions=subregions
+        )
+        m = df.Field(mesh, nvdim=3, value=(1, 0, 0), norm=8e5)
+        Heff = df.Field(mesh, nvdim=3, value=(0, 0, 1e5))
+        term = mm.Precession(gamma0={"r1": 2e5, "default": 1e5})
+
+        dmdt = term.dmdt(m, Heff)
+        assert isinstance(dmdt, df.Field)
+        assert np.allclose(dmdt.array[0, 0, 0], (0, 2e10, 0))
+        assert np.allclose(dmdt.array[1, 0, 0], (0, 1e10, 0))
+
+        out = np.full_like(m.array, np.nan)
+        assert term.dmdt(m, Heff.array, out=out) is out
+        assert np.allclose(out, dmdt.array)
+
+        with pytest.raises(ValueError):
+            mm.Precession().dmdt(m, Heff)
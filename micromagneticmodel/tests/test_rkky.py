@@ -1,5 +1,7 @@
 import re
 
+import discretisedfield as df
+import numpy as np
 import pytest
 
 import micromagneticmodel as mm
@@ -27,3 +29,59 @@ class TestRKKY:
 
         with pytest.raises(AttributeError):
             mm.RKKY(wrong=1)
+
+    def test_effective_field(self):
+        subregions = {
+            "bottom": df.Region(p1=(0, 0, 0), p2=(4e-9, 2e-9, 2e-9)),
+            "spacer": df.Region(p1=(0, 0, 2e-9), p2=(4e-9, 2e-9, 3e-9)),
+            "top": df.Region(p1=(1e-9, 0, 3e-9), p2=(4e-9, 2e-9, 5e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(4e-9, 2e-9, 5e-9), n=(4, 2, 5), subregions=subregions
+        )
+        rng = np.random.default_rng(2)
+        Ms = df.Field(mesh, nvdim=1, value={"spacer": 0, "default": 8e5})
+        Ms.array[0, :, 3:] = 0
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 2, 5, 3)), norm=Ms)
+        sigma, sigma2 = -1e-4, 2e-5
+
+        term = mm.RKKY(sigma=sigma, sigma2=sigma2, subregions=["top", "bottom"])
+        Heff = term.effective_field(m)
+        assert isinstance(Heff, df.Field)
+
+        index1, index2, thickness = term._pairs(mesh)
+        assert thickness == 1e-9
+        assert np.all(index1[2] == 3) and np.all(index2[2] == 1)
+        assert len(index1[0]) == 6  # lateral overlap of 3 x 2 cells
+
+        m_array, Ms_array = mm.util.magnetisation_arrays(m)
+        m1, m2 = m_array[..., 1, :], m_array[..., 3, :]
+        dot = np.sum(m1 * m2, axis=-1, keepdims=True)
+        coefficient = (sigma + 2 * sigma2 * dot) / (mm.consts.mu0 * 1e-9 * 8e5)
+        expected = np.zeros_like(m_array)
+        expected[1:, :, 1] = (coefficient * m2)[1:]
+        expected[1:, :, 3] = (coefficient * m1)[1:]
+        assert np.allclose(Heff.array, expected)
+
+        out = np.full_like(m.array, np.nan)
+        assert term.effective_field(m, out=out) is out
+        assert np.allclose(out, expected)
+
+        # Pairs are found once per mesh and subregions.
+        assert term._pairs(mesh) is term._pairs(mesh)
+        term.subregions = ["bottom", "top"]
+        Heff = term.effective_field(m)
+        assert np.allclose(Heff.array, expected)
+
+    def test_effective_field_invalid_subregions(self):
+        subregions = {
+            "r1": df.Region(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9)),
+            "r2": df.Region(p1=(1e-9, 1e-9, 0), p2=(2e-9, 2e-9, 1e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(2e-9, 2e-9, 1e-9), n=(2, 2, 1), subregions=subregions
+        )
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=1e6)
+        for names in [["r1", "r2"], ["r1", "r3"], ["r1"]]:
+            with pytest.raises(ValueError):
+                mm.RKKY(sigma=1e-4, subregions=names).effective_field(m)
@@ -88,3 +88,73 @@ class TestSlonczewski:
             assert hasattr(term, "tcl_strings")
             assert term.name == "slonczewski"
             assert re.search(r"^Slonczewski\(J=.+\)$", repr(term))
+
+    def test_dmdt(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(4e-9, 3e-9, 2e-9), n=(4, 3, 2))
+        rng = np.random.default_rng(3)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(4, 3, 2, 3)), norm=8e5)
+        Heff = df.Field(mesh, nvdim=3, value=(0, 0, 1e5))
+        J = df.Field(mesh, nvdim=1, value=rng.uniform(1e11, 1e12, size=(4, 3, 2, 1)))
+        P, Lambda, eps_prime, alpha, gamma0 = 0.4, 2, 0.3, 0.1, 2e5
+
+        def expected(alpha=0, gamma0=mm.consts.gamma0, eps_prime=0):
+            m_array = m.array / 8e5
+            mp = np.array([0, 0.6, 0.8])
+            beta = abs(mm.consts.hbar / (mm.consts.mu0 * mm.consts.e))
+            beta *= J.array / (2e-9 * 8e5)
+            epsilon = P * Lambda**2 / (Lambda**2 + 1 + (Lambda**2 - 1) * m_array @ mp)
+            epsilon = epsilon[..., np.newaxis]
+            mpxm = np.cross(m_array, np.cross(mp, m_array))
+            mxmp = np.cross(m_array, mp)
+            factor = gamma0 * beta / (1 + alpha**2)
+            return factor * (
+                (epsilon + alpha * eps_prime) * mpxm
+                - (eps_prime - alpha * epsilon) * mxmp
+            )
+
+        term = mm.Slonczewski(J=J, mp=(0, 3, 4), P=P, Lambda=Lambda)
+        dmdt = term.dmdt(m, Heff)
+        assert isinstance(dmdt, df.Field)
+        assert np.allclose(dmdt.array, expected())
+
+        # Damping constant and gyromagnetic ratio from the dynamics container.
+        term.eps_prime = eps_prime
+        llg = mm.Precession(gamma0=gamma0) + mm.Damping(alpha=alpha)
+        result = (llg + term).dmdt(m, Heff).array - llg.dmdt(m, Heff).array
+        assert np.allclose(result, expected(alpha, gamma0, eps_prime))
+        result = (mm.Damping(alpha=alpha) + term).dmdt(m, Heff).array
+        result -= mm.Damping(alpha=alpha).dmdt(m, Heff).array
+        assert np.allclose(result, expected(alpha, eps_prime=eps_prime))
+
+        # Prefactors are computed once and scaled by the time dependence.
+        _, Ms = mm.util.magnetisation_arrays(m)
+        assert term._prefactors(mesh, Ms, 0, 1) is term._prefactors(mesh, Ms, 0, 1)
+        term.func = lambda t: t / 1e-9
+        term.dt = 1e-13
+        out = np.empty_like(m.array)
+        assert term.dmdt(m, Heff, t=0.5e-9, out=out) is out
+        assert np.allclose(out, expected(eps_prime=eps_prime) / 2)
+
+        with pytest.raises(ValueError):
+            mm.Slonczewski(J=1e12, P=0.4, Lambda=2).dmdt(m, Heff)
+
+    def test_dmdt_stack(self):
+        # Free layer (bottom) and a spacer without current in a stack: only
+        # the thickness of the free layer enters the torque.
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 2e-9, 4e-9), n=(2, 2, 4))
+        m = df.Field(mesh, nvdim=3, value=(1, 0, 0), norm=8e5)
+        Heff = df.Field(mesh, nvdim=3, value=(0, 0, 0))
+
+        def J_value(point):
+            return 1e12 if point[2] < 1e-9 else 0
+
+        J = df.Field(mesh, nvdim=1, value=J_value)
+        term = mm.Slonczewski(J=J, mp=(0, 0, 1), P=0.4, Lambda=1)
+        dmdt = term.dmdt(m, Heff).array
+
+        free_mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 2e-9, 1e-9), n=(2, 2, 1))
+        free_m = df.Field(free_mesh, nvdim=3, value=(1, 0, 0), norm=8e5)
+        free = mm.Slonczewski(J=1e12, mp=(0, 0, 1), P=0.4, Lambda=1)
+        expected = free.dmdt(free_m, df.Field(free_mesh, nvdim=3, value=(0, 0, 0)))
+        assert np.allclose(dmdt[..., :1, :], expected.array)
+        assert np.allclose(dmdt[..., 1:, :], 0)
@@ -23,6 +23,9 @@ class TestSystem:
         assert system.m is None
         assert system.T == 0
         assert system.name == "test"
+        assert system.records is None
+        assert system.images is None
+        assert system.modes is None
 
         system.energy = mm.Exchange(A=1e-12) + mm.Demag()
         check_system(system)
@@ -0,0 +1,158 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+from .test_evolver import macrospin_orientation
+
+
+class TestTimeDriver:
+    def test_init(self):
+        td = mm.TimeDriver()
+        assert repr(td) == "TimeDriver()"
+        assert td._x == "t"
+        td = mm.TimeDriver(evolver=mm.RungeKuttaEvolver(tolerance=1e-7))
+        assert td.evolver.tolerance == 1e-7
+
+        with pytest.raises(TypeError):
+            mm.TimeDriver(evolver=1)
+
+    def test_macrospin(self):
+        system = mm.examples.macrospin()
+        td = mm.TimeDriver(evolver=mm.RungeKuttaEvolver(tolerance=1e-7))
+        td.drive(system, t=1e-10, n=50)
+        table = system.records
+        assert system.drive_number == 1
+        assert table.dtype.names == (
+            "t",
+            "mx",
+            "my",
+            "mz",
+            "E",
+            "E_zeeman",
+            "max_mxHxm",
+        )
+        assert table.shape == (50,)
+        assert np.allclose(table["t"], np.linspace(0, 1e-10, 51)[1:], rtol=0)
+
+        expected = np.array([macrospin_orientation(t) for t in table["t"]])
+        assert np.allclose(table["mx"], expected[:, 0], atol=1e-5)
+        assert np.allclose(table["mz"], expected[:, 2], atol=1e-5)
+        # Zeeman energy -mu0 Ms H mz V and torque Ms |m x H|.
+        energy = -mm.consts.mu0 * 1e6 * 1e6 * expected[:, 2] * 1e-27
+        assert np.allclose(table["E"], energy, rtol=1e-5)
+        assert np.allclose(table["E"], table["E_zeeman"])
+        assert np.allclose(
+            table["max_mxHxm"], 1e6 * np.sqrt(1 - expected[:, 2] ** 2), rtol=1e-3
+        )
+        assert np.allclose(system.m.orientation.array[0, 0, 0], expected[-1])
+
+    def test_reducers(self):
+        subregions = {
+            "left": df.Region(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9)),
+            "right": df.Region(p1=(2e-9, 0, 0), p2=(4e-9, 1e-9, 1e-9)),
+        }
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(4e-9, 1e-9, 1e-9), n=(4, 1, 1), subregions=subregions
+        )
+        system = mm.System(name="regions")
+        system.energy = mm.Zeeman(H=(0, 0, 1e5))
+        system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=0.5)
+        value = {"left": (1, 0, 0), "right": (0, 0, 1)}
+        system.m = df.Field(mesh, nvdim=3, value=value, norm=1e6)
+
+        times = []
+
+        def reducer(system, t, m, Ms):
+            times.append(t)
+            return {"Ms": float(Ms.max())}
+
+        mm.TimeDriver().drive(
+            system, t=2e-11, n=4, reducers=["m_by_region", "m", reducer]
+        )
+        table = system.records
+        assert table.dtype.names == (
+            "t",
+            "mx_left",
+            "mx_right",
+            "my_left",
+            "my_right",
+            "mz_left",
+            "mz_right",
+            "mx",
+            "my",
+            "mz",
+            "Ms",
+        )
+        assert np.allclose(times, table["t"])
+        assert np.allclose(table["Ms"], 1e6)
+        assert np.allclose(table["mz_right"], 1)
+        assert np.all(np.diff(table["mz_left"]) > 0)
+        assert np.allclose(table["mz"], (table["mz_left"] + table["mz_right"]) / 2)
+
+    def test_reducers_effective_field(self, monkeypatch):
+        system = mm.examples.macrospin()
+        system.energy += mm.Demag()
+        calls = []
+        effective_field = mm.Energy._effective_field
+
+        def counted(self, *args, **kwargs):
+            calls.append(1)
+            return effective_field(self, *args, **kwargs)
+
+        td = mm.TimeDriver(evolver=mm.RungeKuttaEvolver(tolerance=1e-7))
+        td.drive(system, t=1e-11, n=2, reducers=["max_mxHxm"])
+        expected = system.records["max_mxHxm"]
+
+        # The effective field for the records is not computed again.
+        monkeypatch.setattr(mm.Energy, "_effective_field", counted)
+        system.m = mm.examples.macrospin().m
+        td.drive(system, t=1e-11, n=2, reducers=["E"])
+        steps = len(calls)
+        system.m = mm.examples.macrospin().m
+        calls.clear()
+        td.drive(system, t=1e-11, n=2, reducers=["max_mxHxm", "E"])
+        assert len(calls) == steps
+        assert system.records.dtype.names[:2] == ("t", "max_mxHxm")
+        assert np.allclose(system.records["max_mxHxm"], expected)
+
+    def test_temperature(self):
+        cold, hot = mm.examples.macrospin(), mm.examples.macrospin()
+        hot.T = 300
+        td = mm.TimeDriver()
+        td.drive(cold, t=1e-12, n=2)
+        td.drive(hot, t=1e-12, n=2)
+        # The default evolver at T > 0 includes the thermal field.
+        assert not np.allclose(hot.m.array, cold.m.array)
+        assert np.allclose(hot.m.norm.array, 1e6)
+
+        for evolver in [mm.RungeKuttaEvolver(), mm.BDFEvolver()]:
+            with pytest.raises(ValueError):
+                mm.TimeDriver(evolver=evolver).drive(hot, t=1e-12, n=1)
+        assert hot.drive_number == 1
+
+    def test_invalid(self):
+        system = mm.examples.macrospin()
+        td = mm.TimeDriver()
+        with pytest.raises(ValueError):
+            td.drive(system, t=-1e-12, n=10)
+        with pytest.raises(ValueError):
+            td.drive(system, t=1e-12, n=0)
+        with pytest.raises(ValueError):
+            td.drive(system, t=1e-12, n=1, reducers=["wrong"])
+        with pytest.raises(TypeError):
+            td.drive(system, t=1e-12, n=1, reducers=[1])
+
+        system.dynamics = 0
+        with pytest.raises(ValueError):
+            td.drive(system, t=1e-12, n=1)
+        with pytest.raises(ValueError):
+            td.drive(mm.System(name="no_m"), t=1e-12, n=1)
+
+        # An evolver which does not integrate in process.
+        class MyEvolver(mm.Evolver):
+            _allowed_attributes = []
+
+        system = mm.examples.macrospin()
+        with pytest.raises(NotImplementedError):
+            mm.TimeDriver(evolver=MyEvolver()).drive(system, t=1e-12, n=1)
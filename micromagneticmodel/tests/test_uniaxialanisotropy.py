@@ -54,3 +54,46 @@ class TestUniaxialAnisotropy:
     def test_higher_order_anisotropy(self):
         term = mm.UniaxialAnisotropy(K1=1e5, K2=3e2, u=(0, 0, 1))
         check_term(term)
+
+    def test_effective_field(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(3e-9, 1e-9, 1e-9), n=(3, 1, 1))
+        rng = np.random.default_rng(0)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(3, 1, 1, 3)), norm=8e5)
+        m_array = m.array / 8e5
+        u = np.array([1, 2, 2]) / 3
+
+        for kwargs in [dict(K=1e5), dict(K1=1e5), dict(K1=1e5, K2=-3e4)]:
+            term = mm.UniaxialAnisotropy(u=(1, 2, 2), **kwargs)
+            Heff = term.effective_field(m)
+            assert isinstance(Heff, df.Field)
+            mu = m_array @ u
+            expected = 2 * 1e5 * mu[..., np.newaxis] * u
+            if "K2" in kwargs:
+                expected += 4 * -3e4 * mu[..., np.newaxis] ** 3 * u
+            assert np.allclose(Heff.array, expected / (mm.consts.mu0 * 8e5))
+
+        term = mm.UniaxialAnisotropy(K1=1e5)
+        with pytest.raises(ValueError):
+            term.effective_field(m)
+
+    def test_effective_field_spatially_varying(self):
+        subregions = {"r1": df.Region(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9))}
+        mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(3e-9, 1e-9, 1e-9), n=(3, 1, 1), subregions=subregions
+        )
+        m = df.Field(mesh, nvdim=3, value=(0, 0.6, 0.8), norm=1e6)
+        m.array[2] = 0  # Ms = 0
+
+        u = df.Field(mesh, nvdim=3, value={"r1": (0, 0, 1), "default": (0, 2, 0)})
+        term = mm.UniaxialAnisotropy(K={"r1": 1e5, "default": 2e5}, u=u)
+        out = np.full_like(m.array, np.nan)
+        result = term.effective_field(m, out=out)
+        assert result is out
+        c = 2 / (mm.consts.mu0 * 1e6)
+        assert np.allclose(out[0, 0, 0], (0, 0, c * 1e5 * 0.8))
+        assert np.allclose(out[1, 0, 0], (0, c * 2e5 * 0.6, 0))
+        assert np.allclose(out[2, 0, 0], 0)
+
+        # Reassigning a parameter discards precomputed values.
+        term.u = (1, 0, 0)
+        assert np.allclose(term.effective_field(m).array, 0)
@@ -0,0 +1,77 @@
+import discretisedfield as df
+import numpy as np
+import pytest
+
+import micromagneticmodel as mm
+
+
+class TestUtil:
+    def setup_method(self):
+        subregions = {
+            "r1": df.Region(p1=(0, 0, 0), p2=(1, 1, 1)),
+            "r2": df.Region(p1=(1, 0, 0), p2=(3, 1, 1)),
+        }
+        self.mesh = df.Mesh(
+            p1=(0, 0, 0), p2=(3, 1, 1), n=(3, 1, 1), subregions=subregions, bc="y"
+        )
+
+    def test_parameter_array(self):
+        assert mm.util.parameter_array(5, self.mesh).shape == (1,)
+        assert np.allclose(
+            mm.util.parameter_array((0, 0, 1), self.mesh, nvdim=3), (0, 0, 1)
+        )
+
+        array = mm.util.parameter_array({"r1": 1, "r2": 2}, self.mesh)
+        assert array.shape == (3, 1, 1, 1)
+        assert np.allclose(array[..., 0].flat, [1, 2, 2])
+
+        field = df.Field(self.mesh, nvdim=3, value=(1, 2, 3))
+        array = mm.util.parameter_array(field, self.mesh, nvdim=3)
+        assert array.shape == (3, 1, 1, 3)
+
+        with pytest.raises(ValueError):
+            mm.util.parameter_array(field, self.mesh)
+
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(3, 1, 1), n=(6, 1, 1))
+        with pytest.raises(ValueError):
+            mm.util.parameter_array(df.Field(mesh, nvdim=1), self.mesh)
+
+    def test_magnetisation_arrays(self):
+        m = df.Field(self.mesh, nvdim=3, value={"r1": (0, 0, 0), "r2": (0, 3, 4)})
+        m_array, Ms = mm.util.magnetisation_arrays(m)
+        assert np.allclose(m_array[0], 0)
+        assert np.allclose(m_array[1:], (0, 0.6, 0.8))
+        assert np.allclose(Ms[..., 0].flat, [0, 5, 5])
+
+    def test_periodic(self):
+        assert mm.util.periodic(self.mesh) == (False, True, False)
+
+    def test_roll(self):
+        a = np.random.default_rng(0).random((2, 3, 4, 5, 3))
+        out = np.empty_like(a)
+        for axis in mm.util.spatial_axes:
+            for shift in [-1, 1]:
+                assert mm.util.roll(a, shift, axis, out=out) is out
+                assert np.array_equal(out, np.roll(a, shift, axis=axis))
+
+        with pytest.raises(ValueError):
+            mm.util.roll(a, 2, -4, out=out)
+
+    def test_region_sums(self):
+        subregions = {
+            "r1": df.Region(p1=(0, 0, 0), p2=(2, 1, 1)),
+            "r2": df.Region(p1=(1, 0, 0), p2=(3, 1, 1)),  # overlaps with r1
+            "r3": df.Region(p1=(3, 0, 0), p2=(4, 1, 1)),
+        }
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(5, 1, 1), n=(5, 1, 1), subregions=subregions)
+        names, labels, patterns = mm.util.region_labels(mesh)
+        assert names == ["r1", "r2", "r3"]
+        assert labels.shape == (5, 1, 1)
+        assert len(patterns) == 5  # r1, r1 & r2, r2, r3, none
+        assert mm.util.region_labels(mesh)[1] is labels
+
+        a = np.arange(1.0, 6.0).reshape(5, 1, 1, 1)
+        assert mm.util.region_sums(a, mesh) == {"r1": 3.0, "r2": 5.0, "r3": 4.0}
+
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(5, 1, 1), n=(5, 1, 1))
+        assert mm.util.region_sums(a, mesh) == {}
@@ -91,3 +91,96 @@ class TestZeeman:
 
             term = mm.Zeeman(H=H, tcl_strings=tcl_strings)
             check_term(term)
+
+    def test_effective_field(self):
+        mesh = df.Mesh(
+            p1=(0, 0, 0),
+            p2=(2e-9, 1e-9, 1e-9),
+            n=(2, 1, 1),
+            subregions={"r1": df.Region(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9))},
+        )
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+
+        Heff = mm.Zeeman(H=(0, 0, 1e6)).effective_field(m)
+        assert isinstance(Heff, df.Field)
+        assert np.allclose(Heff.array, (0, 0, 1e6))
+
+        H = {"r1": (1, 2, 3), "default": (0, 0, 1)}
+        Heff = mm.Zeeman(H=H).effective_field(m, t=1e-9)
+        assert np.allclose(Heff.array[0, 0, 0], (1, 2, 3))
+        assert np.allclose(Heff.array[1, 0, 0], (0, 0, 1))
+
+    def test_effective_field_time_dependent(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+        t = np.linspace(0, 2e-9, 11)
+        f, t0 = 1e9, 1e-10
+
+        for term in [
+            mm.Zeeman(H=(0, 0, 1e6), func="sin", f=f, t0=t0),
+            mm.Zeeman(H=(0, 0, 1e6), wave="sin", f=f, t0=t0),
+        ]:
+            Heff = term.effective_field(m, t=t)
+            assert Heff.shape == (11, 2, 1, 1, 3)
+            expected = 1e6 * np.sin(2 * np.pi * f * (t - t0))
+            assert np.allclose(Heff[:, 1, 0, 0, 2], expected)
+            assert np.allclose(
+                term.effective_field(m, t=t[3]).array[..., 2], expected[3]
+            )
+
+        term = mm.Zeeman(H=(0, 0, 1e6), func="sinc", f=f, t0=t0)
+        Heff = term.effective_field(m, t=t)
+        x = 2 * np.pi * f * (t - t0)
+        assert np.allclose(Heff[:, 0, 0, 0, 2], 1e6 * np.sin(x) / x)
+
+        with pytest.raises(ValueError):
+            mm.Zeeman(H=(0, 0, 1e6), func="sin").effective_field(m, t=t)
+
+        # A static field at several times is a new writable array.
+        term = mm.Zeeman(H=(0, 0, 1e6))
+        Heff = term.effective_field(m, t=t)
+        assert Heff.shape == (11, 2, 1, 1, 3)
+        assert Heff.flags.writeable
+        Heff[...] = 0
+        assert np.allclose(term.effective_field(m, t=t), (0, 0, 1e6))
+
+    def test_effective_field_callable(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+        t = np.array([0, 1e-10, 0, 2e-10, 1e-10])
+        calls = []
+
+        def decay(t):
+            calls.append(t)
+            return np.exp(-t / 1e-10)
+
+        term = mm.Zeeman(H=(1e6, 0, 0), func=decay, dt=1e-13)
+        Heff = term.effective_field(m, t=t)
+        assert Heff.shape == (5, 2, 1, 1, 3)
+        assert np.allclose(Heff[:, 0, 0, 0, 0], 1e6 * np.exp(-t / 1e-10))
+        assert len(calls) == 3  # sampled once per unique time
+
+        def rotation(t):
+            c, s = np.cos(2 * np.pi * 1e9 * t), np.sin(2 * np.pi * 1e9 * t)
+            return [c, -s, 0, s, c, 0, 0, 0, 1]
+
+        term = mm.Zeeman(H=(1e6, 0, 0), func=rotation, dt=1e-13)
+        Heff = term.effective_field(m, t=[0, 0.25e-9])
+        assert np.allclose(Heff[0, ..., :], (1e6, 0, 0))
+        assert np.allclose(Heff[1, ..., :], (0, 1e6, 0))
+        Heff = term.effective_field(m, t=0.25e-9)
+        assert np.allclose(Heff.array, (0, 1e6, 0))
+
+    def test_effective_field_tcl_strings(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(2e-9, 1e-9, 1e-9), n=(2, 1, 1))
+        m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+        tcl_strings = {
+            "script": "",
+            "energy": "Oxs_ScriptUZeeman",
+            "type": "uniform",
+            "script_args": "total_time",
+            "script_name": "TimeFunction",
+        }
+        term = mm.Zeeman(H=(0, 0, 1e6), tcl_strings=tcl_strings)
+        with pytest.raises(NotImplementedError):
+            term.effective_field(m, t=1e-9)
@@ -1,5 +1,6 @@
 import re
 
+import discretisedfield as df
 import numpy as np
 import pytest
 
@@ -72,3 +73,72 @@ class TestZhangLi:
             assert hasattr(term, "tcl_strings")
             assert term.name == "zhangli"
             assert re.search(r"^ZhangLi\(u=.+\, beta=.+\)$", repr(term))
+
+    def test_dmdt(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(8e-9, 6e-9, 2e-9), n=(8, 6, 2))
+        rng = np.random.default_rng(7)
+        m = df.Field(mesh, nvdim=3, value=rng.normal(size=(8, 6, 2, 3)), norm=8e5)
+        Heff = df.Field(mesh, nvdim=3, value=(0, 0, 1e5))
+        u, beta, alpha = (300, -200, 100), 0.2, 0.3
+
+        m_array = m.array / 8e5
+        gradient = np.gradient(m_array, *mesh.cell, axis=(0, 1, 2))
+        derivative = sum(ui * gi for ui, gi in zip(u, gradient))
+        mxv = np.cross(m_array, derivative)
+
+        term = mm.ZhangLi(u=u, beta=beta)
+        expected = -(1 + 0) * np.cross(m_array, mxv) - beta * mxv
+        dmdt = term.dmdt(m, Heff)
+        assert isinstance(dmdt, df.Field)
+        assert np.allclose(dmdt.array, expected)
+
+        # The damping constant is taken from the dynamics container.
+        container = mm.Precession(gamma0=0) + mm.Damping(alpha=alpha) + term
+        expected = -(1 + alpha * beta) / (1 + alpha**2) * np.cross(m_array, mxv)
+        expected -= (beta - alpha) / (1 + alpha**2) * mxv
+        assert np.allclose(container.dmdt(m, Heff).array, expected)
+
+        # The stencil is computed once and scaled by the time dependence.
+        _, Ms = mm.util.magnetisation_arrays(m)
+        assert term._stencil(mesh, Ms) is term._stencil(mesh, Ms)
+        term.func = lambda t: t / 1e-9
+        term.dt = 1e-13
+        out = np.empty_like(m.array)
+        assert container.dmdt(m, Heff, t=0.5e-9, out=out) is out
+        assert np.allclose(out, expected / 2)
+
+    def test_dmdt_boundaries(self):
+        mesh = df.Mesh(p1=(0, 0, 0), p2=(6e-9, 1e-9, 1e-9), n=(6, 1, 1), bc="x")
+        x = np.arange(6)
+        value = np.stack([np.cos(x), np.sin(x), np.zeros(6)], axis=-1)
+        m = df.Field(mesh, nvdim=3, value=value.reshape(6, 1, 1, 3), norm=1e6)
+        m.array[3] = 0
+        Heff = np.zeros_like(m.array)
+        term = mm.ZhangLi(u={"default": 1e-9}, beta=1)
+
+        # With u = dx per second, v = (u . grad) m is the difference per cell.
+        m_array = m.array / 1e6
+        v = np.zeros_like(m_array)
+        v[1:3] = (m_array[2:4] - m_array[0:2]) / 2  # central differences
+        v[0] = (m_array[1] - m_array[5]) / 2  # periodic
+        v[2] = m_array[2] - m_array[1]  # one-sided next to the empty cell
+        v[4] = m_array[5] - m_array[4]
+        v[5] = (m_array[0] - m_array[4]) / 2
+        expected = -np.cross(m_array, np.cross(m_array, v)) - np.cross(m_array, v)
+        assert np.allclose(term.dmdt(m, Heff).array, expected)
+        assert np.allclose(term.dmdt(m, Heff).array[3], 0)
+
+        with pytest.raises(ValueError):
+            mm.ZhangLi(beta=0.1).dmdt(m, Heff)
+
+        term = mm.ZhangLi(
+            u=1,
+            beta=0.1,
+            tcl_strings={
+                "script": "s",
+                "script_args": "total_time",
+                "script_name": "n",
+            },
+        )
+        with pytest.raises(NotImplementedError):
+            term.dmdt(m, Heff)
@@ -0,0 +1,403 @@
+"""Helper functions for evaluating terms on discretised fields.
+
+Arrays passed between these functions follow the ``discretisedfield.Field``
+layout, i.e. they have the shape ``(..., nx, ny, nz, nvdim)``. Optional leading
+dimensions can be used to evaluate several magnetisation configurations at
+once, and spatial axes are therefore always addressed from the end of the
+array.
+
+"""
+
+import collections
+import numbers
+
+import discretisedfield as df
+import numpy as np
+
+spatial_axes = (-4, -3, -2)
+"""Axes of an array in ``discretisedfield.Field`` layout that are spatial."""
+
+
+def parameter_array(value, mesh, nvdim=1):
+    """Convert a term parameter to an array that broadcasts against a field.
+
+    Scalar and vector parameters are returned as arrays of shape ``(nvdim,)``
+    so that no per-cell memory is allocated for spatially constant values.
+    Parameters defined per region (``dict``) or as ``discretisedfield.Field``
+    are returned as arrays of shape ``(nx, ny, nz, nvdim)``.
+
+    Parameters
+    ----------
+    value : numbers.Real, array_like, dict, discretisedfield.Field
+
+        Parameter value as accepted by the typesystem of the term.
+
+    mesh : discretisedfield.Mesh
+
+        Mesh on which the parameter is evaluated.
+
+    nvdim : int, optional
+
+        Number of value dimensions of the parameter. Defaults to 1.
+
+    Returns
+    -------
+    numpy.ndarray
+
+        Parameter array.
+
+    Raises
+    ------
+    ValueError
+
+        If a ``discretisedfield.Field`` parameter is defined on a different mesh
+        or has a wrong number of value dimensions.
+
+    Examples
+    --------
+    1. Converting parameters.
+
+    >>> import discretisedfield as df
+    >>> import micromagneticmodel as mm
+    ...
+    >>> subregions = {'r1': df.Region(p1=(0, 0, 0), p2=(1, 1, 1)),
+    ...               'r2': df.Region(p1=(1, 0, 0), p2=(2, 1, 1))}
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(2, 1, 1), n=(2, 1, 1),
+    ...                subregions=subregions)
+    >>> mm.util.parameter_array(1e-12, mesh).shape
+    (1,)
+    >>> mm.util.parameter_array({'r1': 1, 'r2': 2}, mesh).shape
+    (2, 1, 1, 1)
+
+    """
+    if isinstance(value, df.Field):
+        if value.mesh != mesh or not np.array_equal(value.mesh.n, mesh.n):
+            msg = f"Parameter {value=} is not defined on {mesh=}."
+            raise ValueError(msg)
+        if value.nvdim != nvdim:
+            msg = f"Cannot use parameter with {value.nvdim=}, expected {nvdim=}."
+            raise ValueError(msg)
+        return np.asarray(value.array, dtype=float)
+    elif isinstance(value, dict):
+        return df.Field(mesh, nvdim=nvdim, value=value).array
+    elif isinstance(value, numbers.Real):
+        return np.full(nvdim, value, dtype=float)
+    else:
+        return np.asarray(value, dtype=float).reshape(nvdim)
+
+
+def magnetisation_arrays(m):
+    """Split magnetisation into a unit-vector array and saturation magnetisation.
+
+    Cells with zero saturation magnetisation get a zero unit vector so that
+    they do not contribute to any term.
+
+    Parameters
+    ----------
+    m : discretisedfield.Field
+
+        Magnetisation field with norm equal to the saturation magnetisation.
+
+    Returns
+    -------
+    tuple
+
+        Unit-vector array of shape ``(nx, ny, nz, 3)`` and saturation
+        magnetisation array of shape ``(nx, ny, nz, 1)``.
+
+    Examples
+    --------
+    1. Splitting magnetisation.
+
+    >>> import discretisedfield as df
+    >>> import micromagneticmodel as mm
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(2, 1, 1), n=(2, 1, 1))
+    >>> m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+    >>> m_array, Ms = mm.util.magnetisation_arrays(m)
+    >>> m_array[0, 0, 0]
+    array([0., 0., 1.])
+    >>> float(Ms[0, 0, 0, 0])
+    800000.0
+
+    """
+    array = m.array
+    Ms = np.empty(array.shape[:-1] + (1,))
+    np.einsum("...i,...i->...", array, array, out=Ms[..., 0])
+    np.sqrt(Ms, out=Ms)
+    m_array = np.zeros_like(array, dtype=float)
+    np.divide(array, Ms, out=m_array, where=Ms > 0)
+    return m_array, Ms
+
+
+def magnetisation_field(m, m_array, Ms):
+    """Magnetisation field from unit-vector and saturation magnetisation arrays.
+
+    This is the inverse of ``magnetisation_arrays``. The mesh, value dimension
+    names and unit are taken from ``m``.
+
+    Parameters
+    ----------
+    m : discretisedfield.Field
+
+        Magnetisation field defining the mesh.
+
+    m_array : numpy.ndarray
+
+        Unit-vector array of shape ``(nx, ny, nz, 3)``.
+
+    Ms : numpy.ndarray
+
+        Saturation magnetisation array of shape ``(nx, ny, nz, 1)``.
+
+    Returns
+    -------
+    discretisedfield.Field
+
+        Magnetisation field.
+
+    """
+    return df.Field(m.mesh, nvdim=3, value=m_array * Ms, vdims=m.vdims, unit=m.unit)
+
+
+def assign(out, a):
+    """Write ``a`` into ``out`` if it is passed and return the result."""
+    if out is None:
+        return a
+    out[...] = a
+    return out
+
+
+def inverse(a):
+    """Elementwise inverse of ``a`` with zero where ``a`` is zero."""
+    a = np.asarray(a, dtype=float)
+    return np.divide(1.0, a, out=np.zeros_like(a), where=a != 0)
+
+
+def roll(a, shift, axis, out):
+    """``numpy.roll`` by ``shift = -1`` or ``1`` writing into ``out``.
+
+    Unlike ``numpy.roll``, no new array is allocated.
+
+    Examples
+    --------
+    1. Rolling an array.
+
+    >>> import numpy as np
+    >>> import micromagneticmodel as mm
+    ...
+    >>> out = np.empty(4)
+    >>> mm.util.roll(np.arange(4.0), -1, axis=0, out=out)
+    array([1., 2., 3., 0.])
+
+    """
+    first, rest, last, init = [[slice(None)] * a.ndim for _ in range(4)]
+    first[axis], rest[axis] = slice(0, 1), slice(1, None)
+    last[axis], init[axis] = slice(-1, None), slice(None, -1)
+    first, rest, last, init = tuple(first), tuple(rest), tuple(last), tuple(init)
+    if shift == -1:
+        out[init] = a[rest]
+        out[last] = a[first]
+    elif shift == 1:
+        out[rest] = a[init]
+        out[first] = a[last]
+    else:
+        msg = f"Cannot roll by {shift=}, expected -1 or 1."
+        raise ValueError(msg)
+    return out
+
+
+def cross(a, b, out):
+    """Cross product of vectors along the last axis written into ``out``.
+
+    ``out`` must not share memory with ``a`` or ``b``. Only one component-sized
+    temporary array is allocated.
+
+    Examples
+    --------
+    1. Cross product.
+
+    >>> import numpy as np
+    >>> import micromagneticmodel as mm
+    ...
+    >>> mm.util.cross(np.array([1.0, 0, 0]), np.array([0, 1.0, 0]), np.empty(3))
+    array([0., 0., 1.])
+
+    """
+    work = np.empty(out.shape[:-1])
+    for i, j, k in [(0, 1, 2), (1, 2, 0), (2, 0, 1)]:
+        np.multiply(a[..., j], b[..., k], out=out[..., i])
+        np.multiply(a[..., k], b[..., j], out=work)
+        out[..., i] -= work
+    return out
+
+
+def periodic(mesh):
+    """Periodicity of the mesh along each spatial direction.
+
+    Returns
+    -------
+    tuple
+
+        Three booleans, ``True`` for a periodic direction.
+
+    """
+    return tuple(dim in mesh.bc for dim in mesh.region.dims)
+
+
+def normalise(a):
+    """Normalise vectors along the last axis, leaving zero vectors unchanged."""
+    norm = np.linalg.norm(a, axis=-1, keepdims=True)
+    return np.divide(a, norm, out=np.zeros_like(a, dtype=float), where=norm > 0)
+
+
+def tangent_basis(m):
+    """Orthonormal vectors perpendicular to unit vectors ``m``.
+
+    For every vector, ``e1`` is perpendicular to ``m`` and to the coordinate
+    axis least aligned with ``m``, and ``e2 = m x e1``, so that ``(e1, e2, m)``
+    is a right-handed basis. Zero vectors get zero basis vectors.
+
+    Parameters
+    ----------
+    m : numpy.ndarray
+
+        Unit vectors along the last axis.
+
+    Returns
+    -------
+    tuple
+
+        Arrays ``e1`` and ``e2`` with the shape of ``m``.
+
+    Examples
+    --------
+    1. Tangent basis of a vector along the z axis.
+
+    >>> import numpy as np
+    >>> import micromagneticmodel as mm
+    ...
+    >>> e1, e2 = mm.util.tangent_basis(np.array([0.0, 0, 1]))
+    >>> e1, e2
+    (array([0., 1., 0.]), array([-1.,  0.,  0.]))
+
+    """
+    m = np.asarray(m, dtype=float)
+    helper = np.eye(3)[np.argmin(np.abs(m), axis=-1)]
+    e1 = normalise(cross(m, helper, out=np.empty_like(m)))
+    e2 = cross(m, e1, out=np.empty_like(m))
+    return e1, e2
+
+
+def mesh_key(mesh):
+    """Hashable key describing the geometry of the mesh.
+
+    Two meshes with the same key have the same cells, boundary conditions and
+    subregions, so that quantities precomputed for one of them can be reused
+    for the other.
+
+    """
+    subregions = tuple(
+        (name, tuple(region.pmin), tuple(region.pmax))
+        for name, region in sorted(mesh.subregions.items())
+    )
+    return (
+        tuple(mesh.region.pmin),
+        tuple(mesh.cell),
+        tuple(int(n) for n in mesh.n),
+        periodic(mesh),
+        subregions,
+    )
+
+
+_region_labels_cache = collections.OrderedDict()
+
+
+def region_labels(mesh):
+    """Integer labels of the combinations of subregions cells belong to.
+
+    Every cell gets the label of the (unique) combination of subregions that
+    contain it, so that overlapping subregions are supported. Labels are
+    computed once for each mesh geometry (see ``mesh_key``).
+
+    Parameters
+    ----------
+    mesh : discretisedfield.Mesh
+
+        Mesh with subregions.
+
+    Returns
+    -------
+    tuple
+
+        Names of the subregions, an integer array of labels of shape ``(nx,
+        ny, nz)``, and a boolean matrix of shape ``(nlabels, nsubregions)``
+        specifying which subregions each label belongs to.
+
+    """
+    key = mesh_key(mesh)
+    if key in _region_labels_cache:
+        _region_labels_cache.move_to_end(key)
+        return _region_labels_cache[key]
+
+    names = sorted(mesh.subregions)
+    membership = np.zeros((*(int(n) for n in mesh.n), len(names)), dtype=bool)
+    for i, name in enumerate(names):
+        membership[(*mesh.region2slices(mesh.subregions[name]), i)] = True
+    if names:
+        patterns, labels = np.unique(
+            membership.reshape(-1, len(names)), axis=0, return_inverse=True
+        )
+        labels = labels.reshape(membership.shape[:-1])
+    else:
+        patterns = np.zeros((1, 0), dtype=bool)
+        labels = np.zeros(membership.shape[:-1], dtype=int)
+    labels.flags.writeable = False
+    result = (names, labels, patterns)
+
+    _region_labels_cache[key] = result
+    if len(_region_labels_cache) > 8:
+        _region_labels_cache.popitem(last=False)
+    return result
+
+
+def region_sums(a, mesh):
+    """Sums of a scalar array over all subregions of the mesh.
+
+    Parameters
+    ----------
+    a : numpy.ndarray
+
+        Array of shape ``(nx, ny, nz)`` or ``(nx, ny, nz, 1)``.
+
+    mesh : discretisedfield.Mesh
+
+        Mesh with subregions.
+
+    Returns
+    -------
+    dict
+
+        Sums with subregion names as keys.
+
+    Examples
+    --------
+    1. Summing over subregions.
+
+    >>> import discretisedfield as df
+    >>> import numpy as np
+    >>> import micromagneticmodel as mm
+    ...
+    >>> subregions = {'r1': df.Region(p1=(0, 0, 0), p2=(1, 1, 1)),
+    ...               'r2': df.Region(p1=(1, 0, 0), p2=(3, 1, 1))}
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(3, 1, 1), n=(3, 1, 1),
+    ...                subregions=subregions)
+    >>> mm.util.region_sums(np.array([1.0, 2.0, 3.0]).reshape(3, 1, 1), mesh)
+    {'r1': 1.0, 'r2': 5.0}
+
+    """
+    names, labels, patterns = region_labels(mesh)
+    sums = np.bincount(
+        labels.reshape(-1), weights=np.reshape(a, -1), minlength=len(patterns)
+    )
+    return dict(zip(names, (float(total) for total in sums @ patterns)))